@@ -0,0 +1,81 @@
+"""Compares per-row Pydantic models against the batch `RowPlan` path, per 10k Pals.
+
+Usage:
+    python benchmarks/bench_batch_validation.py [--rows 10000 100000] [--repeat 3]
+
+The model path is what `generate` used to do: `Pal(**row)` for every row,
+`model_dump()` into a dict and a Core insert of the dicts. The batch path
+extracts tuples with `PAL_PLAN` and hands them to the driver as they are.
+Both write into a fresh database without fingerprints (`DatabaseWriter.replace`).
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from itertools import islice
+
+from sqlalchemy import delete, insert
+from synthetic import write_dataset
+
+from palgen.constants import PAL_INFO
+from palgen.db.sql import DatabaseWriter
+from palgen.logger import setup_logging
+from palgen.models.pal_model import PAL_COLUMNS, Pal, PalTable
+from palgen.readers.localization_reader import LocalizationReader
+from palgen.readers.pal_reader import PalReader
+from palgen.readers.plan import PAL_PLAN
+from palgen.readers.stream import iter_rows
+
+def model_path(rows: list[dict], reader: PalReader, writer: DatabaseWriter) -> int:
+    candidates = [Pal(**row, internal_index=0) for row in rows if PalReader.is_candidate(row)]
+    pals = reader.read(candidates)
+    writer.connection.execute(delete(PalTable))
+    dumped = (pal.model_dump() for pal in pals)
+    while batch := list(islice(dumped, writer.batch_size)):
+        writer.connection.execute(insert(PalTable), batch)
+    return len(pals)
+
+def batch_path(rows: list[dict], reader: PalReader, writer: DatabaseWriter) -> int:
+    candidates = [PAL_PLAN.extract(row) for row in rows if PalReader.is_candidate(row)]
+    return writer.replace(PalTable, reader.iter_pal_rows(candidates), PAL_COLUMNS)
+
+def measure(path, rows: list[dict], reader: PalReader, writer: DatabaseWriter, repeat: int) -> tuple[float, int, int]:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = path(rows, reader, writer)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    path(rows, reader, writer)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, count, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000], help='Numbers of Pals to generate.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per path (the best is kept).')
+    args = parser.parse_args()
+    setup_logging('WARNING')
+
+    for size in args.rows:
+        with tempfile.TemporaryDirectory() as directory:
+            write_dataset(directory, size)
+            rows = [row for _, row in iter_rows(os.path.join(directory, PAL_INFO))]
+            reader = PalReader(directory, names=LocalizationReader(directory).read())
+
+            print(f'{size} Pals:')
+            with DatabaseWriter(directory, full=True) as writer:
+                results = {name: measure(path, rows, reader, writer, args.repeat)
+                           for name, path in (('models', model_path), ('batch', batch_path))}
+
+            for name, (seconds, count, peak) in results.items():
+                print(f'  {name:<7} {seconds / count * 10_000 * 1000:8.1f} ms per 10k rows  '
+                      f'peak {peak / 1024 / 1024:7.2f} MiB')
+            print(f"  speedup {results['models'][0] / results['batch'][0]:.2f}x\n")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Compares the in-memory `PalQuery` layer against the equivalent SQLite queries.
+
+Usage:
+    python benchmarks/bench_query.py [path/to/pals.db] [--repeat N]
+"""
+import argparse
+import sqlite3
+import time
+
+from palgen.query import PalQuery
+
+# (description, PalQuery.filter keyword arguments, equivalent SQL)
+QUERIES = (
+    ('Fire Pals with mining >= 2', {'element': 'Fire', 'mining': 2},
+     "SELECT * FROM pals WHERE (element1 = 'EPalElementType::Fire' OR element2 = 'EPalElementType::Fire') "
+     "AND mining >= 2 ORDER BY internal_index"),
+    ('Kindling >= 3 and transport >= 2', {'kindling': 3, 'transport': 2},
+     'SELECT * FROM pals WHERE kindling >= 3 AND transport >= 2 ORDER BY internal_index'),
+    ('Large Water Pals', {'element': 'Water', 'size': 'L'},
+     "SELECT * FROM pals WHERE (element1 = 'EPalElementType::Water' OR element2 = 'EPalElementType::Water') "
+     "AND size = 'EPalSizeType::L' ORDER BY internal_index"),
+    ('Humanoids with handiwork >= 1', {'genus': 'Humanoid', 'handiwork': 1},
+     "SELECT * FROM pals WHERE genus = 'EPalGenusType::Humanoid' AND handiwork >= 1 ORDER BY internal_index"),
+)
+
+def timed(func, repeat: int) -> tuple[float, object]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('database', nargs='?', default='output/pals.db', help='Generated pals.db file.')
+    parser.add_argument('--repeat', type=int, default=200, help='Repetitions per query.')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    query = PalQuery.from_database(args.database)
+    print(f'Loaded {len(query)} Pals into memory in {(time.perf_counter() - start) * 1000:.1f} ms\n')
+
+    # Same indexes with the LRU cache disabled, to time the set intersections themselves.
+    uncached = PalQuery(query.pals.values(), query.combinations, cache_size=0)
+
+    connection = sqlite3.connect(f'file:{args.database}?mode=ro', uri=True)
+    print(f"{'query':<34} {'rows':>5} {'sqlite':>11} {'cold':>11} {'cached':>11}")
+    for name, predicates, sql in QUERIES:
+        sqlite_time, rows = timed(lambda: connection.execute(sql).fetchall(), args.repeat)
+
+        cold_time, _ = timed(lambda: uncached.filter(**predicates), args.repeat)
+        cached_time, records = timed(lambda: query.filter(**predicates), args.repeat)
+
+        assert [record.internal_index for record in records] == [row[0] for row in rows], name
+        print(f'{name:<34} {len(rows):>5} {sqlite_time * 1e6:>9.1f}us {cold_time * 1e6:>9.1f}us {cached_time * 1e6:>9.1f}us')
+    connection.close()
+
+if __name__ == '__main__':
+    main()
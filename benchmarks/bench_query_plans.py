@@ -0,0 +1,125 @@
+"""Checks that the breeding lookups are answered through indexes, and times them against the old JSON layout.
+
+Usage:
+    python benchmarks/bench_query_plans.py [--pals 5000] [--combinations 50000] [--lookups 500]
+
+Builds a database with synthetic `pals` and `combi_unique` rows, runs
+`EXPLAIN QUERY PLAN` for every lookup and exits with status 1 if one of
+them does not read through its expected index. The same "is (A, B) a
+unique pair" and "which combinations involve tribe X" lookups are then
+timed against a copy of `combi_unique` in the old layout, with the parents
+in a JSON column (`json_extract` on every row).
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+
+from synthetic import GENDERS, pal_parameter
+
+from palgen.breeding.matrix import UniqueCombination
+from palgen.db.schema import query_plan, uses_index
+from palgen.db.sql import DatabaseWriter
+from palgen.logger import setup_logging
+from palgen.models.combiunique_model import pair_key
+from palgen.readers.plan import PAL_PLAN
+
+# (name, query, expected index (or indexes), parameters drawn from the context)
+LOOKUPS = (
+    ('unique pair', 'SELECT child_id FROM combi_unique WHERE pair_key = ?', 'ix_combi_unique_pair',
+     lambda ctx: (pair_key(*ctx['rng'].sample(ctx['tribes'], 2)),)),
+    ('combinations of tribe', 'SELECT child_id FROM combi_unique WHERE parent_a_tribe = ? OR parent_b_tribe = ?',
+     ('ix_combi_unique_parent_a', 'ix_combi_unique_parent_b'), lambda ctx: (ctx['rng'].choice(ctx['tribes']),) * 2),
+    ('combinations for child', 'SELECT id FROM combi_unique WHERE child_id = ?', 'ix_combi_unique_child',
+     lambda ctx: (ctx['rng'].choice(ctx['bp_classes']),)),
+    ('pal by bp_class', 'SELECT * FROM pals WHERE bp_class = ?', 'ix_pals_bp_class',
+     lambda ctx: (ctx['rng'].choice(ctx['bp_classes']),)),
+    ('pal by tribe', 'SELECT bp_class FROM pals WHERE tribe = ?', 'ix_pals_tribe',
+     lambda ctx: (ctx['rng'].choice(ctx['tribes']),)),
+    ('pals by combirank', 'SELECT bp_class FROM pals WHERE combirank BETWEEN ? AND ? ORDER BY combirank',
+     'ix_pals_combirank', lambda ctx: (lambda rank: (rank, rank + 10))(ctx['rng'].randint(10, 1500))),
+)
+
+# Lookups of the old layout, with the parents stored as `[{"tribe", "gender"}, {"tribe", "gender"}]`.
+LEGACY_LOOKUPS = {
+    'unique pair': (
+        "SELECT child_id FROM combi_unique_legacy WHERE "
+        "(json_extract(parents, '$[0].tribe') = ? AND json_extract(parents, '$[1].tribe') = ?) OR "
+        "(json_extract(parents, '$[0].tribe') = ? AND json_extract(parents, '$[1].tribe') = ?)",
+        lambda key: (*key.split('|'), *reversed(key.split('|')))
+    ),
+    'combinations of tribe': (
+        "SELECT child_id FROM combi_unique_legacy WHERE "
+        "json_extract(parents, '$[0].tribe') = ? OR json_extract(parents, '$[1].tribe') = ?",
+        lambda tribe: (tribe, tribe)
+    ),
+}
+
+def build(output_path: str, pals: int, combinations: int, rng: random.Random) -> dict:
+    rows = [(idx + 1, f'Synthetic Pal {idx}', *PAL_PLAN.extract(pal_parameter(rng, idx))) for idx in range(pals)]
+    bp_classes = [row[2] for row in rows]
+    tribes = [row[3] for row in rows]
+    combis = []
+    for _ in range(combinations):
+        parent_a, parent_b = rng.sample(tribes, 2)
+        combis.append(UniqueCombination(parent_a, rng.choice(GENDERS), parent_b, rng.choice(GENDERS), rng.choice(bp_classes)))
+
+    with DatabaseWriter(output_path, full=True) as writer:
+        writer.write_pals(rows)
+        writer.write_unique_combinations(combis)
+        connection = writer.connection
+        connection.exec_driver_sql('CREATE TABLE combi_unique_legacy (id INTEGER PRIMARY KEY, parents JSON, child_id VARCHAR)')
+        connection.exec_driver_sql('INSERT INTO combi_unique_legacy VALUES (?, ?, ?)', [
+            (idx, json.dumps([{'tribe': tribe_a, 'gender': gender_a}, {'tribe': tribe_b, 'gender': gender_b}]), child_id)
+            for idx, (tribe_a, gender_a, tribe_b, gender_b, child_id) in enumerate(combis, start=1)
+        ])
+        connection.exec_driver_sql('ANALYZE')
+    return {'rng': rng, 'bp_classes': bp_classes, 'tribes': tribes}
+
+def timed(connection, sql: str, params: list[tuple]) -> float:
+    start = time.perf_counter()
+    for values in params:
+        connection.exec_driver_sql(sql, values).fetchall()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pals', type=int, default=5000, help='Number of Pals.')
+    parser.add_argument('--combinations', type=int, default=50_000, help='Number of unique combinations.')
+    parser.add_argument('--lookups', type=int, default=500, help='Timed lookups per query.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    args = parser.parse_args()
+    setup_logging('WARNING')
+
+    failures = []
+    with tempfile.TemporaryDirectory() as output_path:
+        context = build(output_path, args.pals, args.combinations, random.Random(args.seed))
+        with DatabaseWriter(output_path) as writer:
+            connection = writer.connection
+
+            print(f"{'lookup':<24} {'index':<28} {'per lookup':>12} {'json layout':>12} {'speedup':>8}")
+            for name, sql, index, make_params in LOOKUPS:
+                params = [make_params(context) for _ in range(args.lookups)]
+                indexes = (index,) if isinstance(index, str) else index
+                plan = query_plan(connection, sql, params[0])
+                if not all(uses_index(plan, index) for index in indexes):
+                    failures.append(f"{name}: expected {', '.join(indexes)}, got {' / '.join(plan)}")
+
+                elapsed = timed(connection, sql, params) / args.lookups
+                line = f'{name:<24} {indexes[-1]:<28} {elapsed * 1e6:10.1f}us'
+                if name in LEGACY_LOOKUPS:
+                    legacy_sql, to_legacy = LEGACY_LOOKUPS[name]
+                    # Every legacy lookup scans the table, so a tenth of the lookups is enough.
+                    legacy_params = [to_legacy(values[0]) for values in params[:max(1, args.lookups // 10)]]
+                    legacy = timed(connection, legacy_sql, legacy_params) / len(legacy_params)
+                    line += f' {legacy * 1e6:10.1f}us {legacy / elapsed:7.0f}x'
+                print(line)
+
+    for failure in failures:
+        print(f'NOT INDEXED {failure}')
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Compares parsing every registered DataTable against loading it from the parsed-row cache.
+
+Usage:
+    python benchmarks/bench_row_cache.py [--rows 20000] [--repeat 3]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from synthetic import write_dataset
+
+from palgen.logger import setup_logging
+from palgen.readers.cache import RowCache
+from palgen.registry import DATA_TABLES
+
+def best_of(func, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20_000, help='Number of Pals to generate.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per table (the best is kept).')
+    args = parser.parse_args()
+    setup_logging('WARNING')
+
+    with tempfile.TemporaryDirectory() as input_path, tempfile.TemporaryDirectory() as cache_dir:
+        write_dataset(input_path, args.rows, extra=True)
+        cache = RowCache(cache_dir)
+
+        print(f"{'table':<16} {'size':>10} {'parse':>10} {'cached':>10} {'speedup':>8}")
+        for name, datatable in DATA_TABLES.items():
+            size = os.path.getsize(os.path.join(input_path, datatable.file))
+            parse = best_of(lambda: datatable.read(input_path), args.repeat)
+            datatable.read(input_path, cache) # Fills the cache.
+            cached = best_of(lambda: datatable.read(input_path, cache), args.repeat)
+            print(f'{name:<16} {size / 1024 / 1024:8.2f}MB {parse * 1000:8.1f}ms {cached * 1000:8.1f}ms {parse / cached:7.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Measures the import time of `palgen` invocations and fails when one exceeds its budget.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--scale 1.0]
+
+Every scenario runs `palgen.cli.main` under `python -X importtime`
+`--runs` times. The median time spent importing modules beyond a bare
+interpreter is compared against the scenario's budget. Budgets are in
+milliseconds, multiplied by `--scale` for slower machines. Each scenario
+also lists modules it must not import at all, which catches an eager
+import regardless of timing, and the modules it has to import, so a CLI
+that fails to load cannot pass. Exits with status 1 if any scenario fails
+a check or exits with an unexpected status, so it can run in CI.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import NamedTuple
+
+# Dependencies no scenario may import: every command imports them in its `run`.
+HEAVY = ('sqlalchemy', 'pydantic', 'loguru', 'asyncio', 'palgen.pipeline', 'palgen.registry', 'palgen.server',
+         'palgen.team', 'palgen.breeding', 'palgen.db', 'palgen.readers', 'palgen.models')
+
+# Runs the CLI the way the `palgen` script does, so `palgen.cli` shows up as an import.
+MAIN = 'import sys; from palgen.cli import main; main(sys.argv[1:])'
+
+class Scenario(NamedTuple):
+    name: str
+    args: tuple[str, ...]
+    budget: float # Milliseconds of imports.
+    required: tuple[str, ...] # Modules that have to be imported.
+    status: int = 0 # Expected exit status.
+
+SCENARIOS = (
+    Scenario('palgen -h', ('-h',), 100, ('palgen.cli',)),
+    Scenario('palgen', (), 100, ('palgen.cli',), status=1),
+    Scenario('generate -h', ('generate', '-h'), 100, ('palgen.cli', 'palgen.commands.generate')),
+    Scenario('breed-path -h', ('breed-path', '-h'), 100, ('palgen.cli', 'palgen.commands.breed_path')),
+    Scenario('diff -h', ('diff', '-h'), 100, ('palgen.cli', 'palgen.commands.diff')),
+    Scenario('optimize-team -h', ('optimize-team', '-h'), 100, ('palgen.cli', 'palgen.commands.optimize_team')),
+    Scenario('serve -h', ('serve', '-h'), 100, ('palgen.cli', 'palgen.commands.serve')),
+    Scenario('usage error', ('diff',), 100, ('palgen.cli', 'palgen.commands.diff'), status=2),
+)
+
+def import_times(args: tuple[str, ...]) -> tuple[dict[str, tuple[int, int]], int]:
+    """Runs the interpreter with `-X importtime`. Returns `{module: (cumulative us, depth)}` and the exit status."""
+    process = subprocess.run([sys.executable, '-X', 'importtime', *args], capture_output=True, text=True)
+    modules = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(cumulative), (len(name) - len(name.lstrip()) - 1) // 2)
+    return modules, process.returncode
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='Runs per scenario, the median is compared.')
+    parser.add_argument('--scale', type=float, default=1.0, help='Factor applied to every budget.')
+    args = parser.parse_args()
+
+    # Modules every interpreter imports at startup are not counted.
+    baseline = set(import_times(('-c', 'pass'))[0])
+
+    failures = []
+    print(f"{'scenario':<20} {'imports':>10} {'budget':>10}  slowest top-level imports")
+    for scenario in SCENARIOS:
+        totals, modules, statuses = [], {}, set()
+        for _ in range(args.runs):
+            modules, status = import_times(('-c', MAIN, *scenario.args))
+            statuses.add(status)
+            totals.append(sum(
+                cumulative for name, (cumulative, depth) in modules.items() if depth == 0 and name not in baseline
+            ) / 1000)
+        elapsed, budget = statistics.median(totals), scenario.budget * args.scale
+
+        slowest = sorted(
+            ((cumulative, name) for name, (cumulative, depth) in modules.items() if depth == 0 and name not in baseline),
+            reverse=True
+        )[:3]
+        print(f"{scenario.name:<20} {elapsed:8.1f}ms {budget:8.0f}ms  "
+              f"{', '.join(f'{name} {cumulative / 1000:.1f}ms' for cumulative, name in slowest)}")
+
+        if statuses != {scenario.status}:
+            failures.append(f"{scenario.name}: exited with {', '.join(map(str, sorted(statuses)))}, expected {scenario.status}")
+        missing = [module for module in scenario.required if module not in modules]
+        if missing:
+            failures.append(f"{scenario.name}: never imported {', '.join(missing)}")
+        if elapsed > budget:
+            failures.append(f"{scenario.name}: {elapsed:.1f}ms of imports, budget {budget:.0f}ms")
+        imported = [
+            name for name in modules
+            if any(name == module or name.startswith(f'{module}.') for module in HEAVY)
+        ]
+        if imported:
+            failures.append(f"{scenario.name}: imports {', '.join(sorted(imported)[:5])}")
+
+    for failure in failures:
+        print(f'FAILED {failure}')
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Compares peak memory of `json.load` against the streaming row reader.
+
+Usage:
+    python benchmarks/bench_stream_memory.py [path/to/DT_PalMonsterParameter.json]
+
+When no file is given a synthetic `DT_PalMonsterParameter` export with
+`--rows` Pals is written to a temporary directory and used instead.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from synthetic import write_dataset
+
+from palgen.constants import PAL_INFO
+from palgen.readers.stream import iter_rows
+
+
+def load_whole_file(path: str) -> int:
+    with open(path, 'r', encoding='utf-8') as file:
+        return sum(1 for _ in json.load(file)[0]['Rows'].items())
+
+
+def load_streaming(path: str) -> int:
+    return sum(1 for _ in iter_rows(path))
+
+
+def measure(func, path: str) -> tuple[int, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', nargs='?', help='DataTable JSON export to read.')
+    parser.add_argument('--rows', type=int, default=50_000, help='Rows in the synthetic export.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path
+        if path is None:
+            write_dataset(tmp, args.rows)
+            path = os.path.join(tmp, PAL_INFO)
+
+        size = os.path.getsize(path)
+        print(f'File: {path} ({size / 1024 / 1024:.1f} MiB)')
+        for name, func in (('json.load', load_whole_file), ('iter_rows', load_streaming)):
+            count, elapsed, peak = measure(func, path)
+            print(f'{name:>10}: {count} rows in {elapsed:.3f}s, peak {peak / 1024 / 1024:.2f} MiB')
+
+
+if __name__ == '__main__':
+    main()
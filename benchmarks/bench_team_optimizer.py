@@ -0,0 +1,79 @@
+"""Times the team optimizer on requirement profiles met by teams of 5 to 20 Pals.
+
+Usage:
+    python benchmarks/bench_team_optimizer.py [--pals 300] [--works 4] [--profiles 3] [--time_budget 10]
+
+For every team size, a profile is drawn by adding up the levels of that
+many random synthetic Pals on `--works` random work suitabilities, so a
+team of at most that size exists. Each profile is solved with and without
+dominance pruning, and in `max` mode on the same works. Reports the size
+of the team found against the greedy one, the candidates and nodes
+searched, and whether the result was proven optimal within the budget.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from synthetic import pal_parameter
+
+from palgen.models.pal_model import PAL_FIELDS, WORK_SUITABILITIES
+from palgen.readers.plan import PAL_PLAN
+from palgen.team import MAX, SUM, TeamOptimizer, TeamPal, greedy_team
+
+TEAM_SIZES = (5, 8, 10, 12, 15, 20)
+
+def synthetic_pals(count: int, rng: random.Random) -> list[TeamPal]:
+    positions = [PAL_FIELDS.index(name) for name in WORK_SUITABILITIES]
+    pals = []
+    for idx in range(count):
+        row = PAL_PLAN.extract(pal_parameter(rng, idx))
+        pals.append(TeamPal(row[0], f'Synthetic Pal {idx}', tuple(row[position] for position in positions)))
+    return pals
+
+def greedy_size(pals: list[TeamPal], requirements: dict[str, int]) -> int:
+    works = [WORK_SUITABILITIES.index(name) for name in requirements]
+    required = tuple(requirements.values())
+    vectors = [tuple(min(pal.levels[w], level) for w, level in zip(works, required)) for pal in pals]
+    return len(greedy_team(vectors, required))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pals', type=int, default=300, help='Number of candidate Pals.')
+    parser.add_argument('--works', type=int, default=4, help='Work suitabilities per requirement profile.')
+    parser.add_argument('--profiles', type=int, default=3, help='Profiles per team size.')
+    parser.add_argument('--time_budget', type=float, default=10.0, help='Seconds per search.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pals = synthetic_pals(args.pals, rng)
+    optimizer = TeamOptimizer(pals)
+
+    print(f"{'team':>4} {'run':<10} {'size':>9} {'greedy':>9} {'optimal':>8} {'candidates':>10} {'nodes':>9} {'median':>9} {'max':>9}")
+    for team_size in TEAM_SIZES:
+        profiles = []
+        for _ in range(args.profiles):
+            team = rng.sample(pals, team_size)
+            works = rng.sample(range(len(WORK_SUITABILITIES)), args.works)
+            profiles.append({WORK_SUITABILITIES[w]: max(1, sum(pal.levels[w] for pal in team)) for w in works})
+        greedy = [greedy_size(pals, requirements) for requirements in profiles]
+
+        for run, mode, prune in (('sum', SUM, True), ('sum/all', SUM, False), ('max', MAX, True)):
+            results, seconds = [], []
+            for requirements in profiles:
+                if mode == MAX:
+                    requirements = {name: min(level, 4) for name, level in requirements.items()}
+                start = time.perf_counter()
+                results.append(optimizer.solve(requirements, mode, max_size=20, time_budget=args.time_budget, prune=prune))
+                seconds.append(time.perf_counter() - start)
+
+            sizes = '/'.join(str(result.size) for result in results)
+            print(f"{team_size:>4} {run:<10} {sizes:>9} {'/'.join(map(str, greedy)) if mode == SUM else '':>9} "
+                  f"{sum(result.optimal for result in results)}/{len(results):<6} "
+                  f"{round(statistics.mean(result.candidates for result in results)):>10} "
+                  f"{sum(result.nodes for result in results):>9} "
+                  f"{statistics.median(seconds) * 1e3:7.1f}ms {max(seconds) * 1e3:7.1f}ms")
+
+if __name__ == '__main__':
+    main()
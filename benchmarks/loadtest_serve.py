@@ -0,0 +1,136 @@
+"""Load test for `palgen serve`, reporting p50/p99 latency.
+
+Usage:
+    python benchmarks/loadtest_serve.py --spawn output/pals.db
+    python benchmarks/loadtest_serve.py --port 8000 --clients 64 --requests 20000
+
+With `--spawn`, a server is started on the given database for the duration
+of the test. Every client keeps one HTTP/1.1 keep-alive connection open and
+cycles through a mix of lookup, filter and breeding requests.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+MIXED_PATHS = (
+    '/pals/{a}',
+    '/pals?element=Fire&mining=1',
+    '/pals?kindling=2&transport=1&limit=50',
+    '/breeding?parent_a={a}&parent_b={b}',
+)
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str, path: str,
+                  etag: str | None = None) -> tuple[int, dict]:
+    lines = [f'GET {path} HTTP/1.1', f'Host: {host}']
+    if etag:
+        lines.append(f'If-None-Match: {etag}')
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers
+
+async def client(host: str, port: int, paths, count: int, revalidate: bool, latencies: list, statuses: dict) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    try:
+        for path in itertools.islice(paths, count):
+            start = time.perf_counter()
+            status, headers = await request(reader, writer, host, path, etags.get(path) if revalidate else None)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if 'etag' in headers:
+                etags[path] = headers['etag']
+    finally:
+        writer.close()
+
+async def run(args, bp_classes: list[str]) -> None:
+    paths = [
+        template.format(a=a, b=b)
+        for template in MIXED_PATHS
+        for a, b in zip(bp_classes, reversed(bp_classes))
+    ]
+    per_client = args.requests // args.clients
+    latencies, statuses = [], {}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(args.host, args.port, itertools.islice(itertools.cycle(paths), idx, None), per_client,
+               args.revalidate, latencies, statuses)
+        for idx in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f'{len(latencies)} requests over {args.clients} connections in {elapsed:.2f}s '
+          f'({len(latencies) / elapsed:,.0f} req/s)')
+    print(f'p50 {quantiles[49] * 1000:.2f} ms | p99 {quantiles[98] * 1000:.2f} ms | max {latencies[-1] * 1000:.2f} ms')
+    print(f'statuses: {json.dumps(statuses)}')
+
+async def fetch_bp_classes(host: str, port: int) -> list[str]:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f'GET /pals?limit=64 HTTP/1.1\r\nHost: {host}\r\n\r\n'.encode('latin-1'))
+        await writer.drain()
+        await reader.readline()
+        length = 0
+        while (line := await reader.readline()) not in (b'\r\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        return [pal['bp_class'] for pal in json.loads(await reader.readexactly(length))]
+    finally:
+        writer.close()
+
+async def wait_for_server(host: str, port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--clients', type=int, default=32, help='Concurrent keep-alive connections.')
+    parser.add_argument('--requests', type=int, default=10_000, help='Total number of requests.')
+    parser.add_argument('--revalidate', action='store_true', help='Send If-None-Match with the last seen ETag.')
+    parser.add_argument('--spawn', metavar='DATABASE', help='Start `palgen serve` on this database for the test.')
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([
+            sys.executable, '-m', 'palgen.cli', 'serve',
+            '-d', args.spawn, '--host', args.host, '--port', str(args.port)
+        ])
+    try:
+        asyncio.run(wait_for_server(args.host, args.port))
+        bp_classes = asyncio.run(fetch_bp_classes(args.host, args.port))
+        if not bp_classes:
+            sys.exit('The database does not contain any Pals.')
+        asyncio.run(run(args, bp_classes))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+if __name__ == '__main__':
+    main()
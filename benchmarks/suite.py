@@ -0,0 +1,175 @@
+"""Benchmark suite timing every `palgen generate` stage on synthetic data.
+
+Usage:
+    python benchmarks/suite.py [--scales 200 1000 10000 100000] [--repeat 3]
+                               [--output results.json]
+                               [--baseline baseline.json] [--threshold 0.25]
+                               [--save_baseline baseline.json]
+
+For every scale a synthetic dataset is written (see `synthetic.py`), then
+each stage is run `--repeat` times and timed (best run), plus once more
+under `tracemalloc` for its peak memory. The results are written as JSON.
+
+With `--baseline`, every stage is compared against a previous results file
+and the suite exits with status 1 if any stage got slower (or used more
+memory) than the baseline by more than `--threshold`.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from synthetic import write_dataset
+
+from palgen.breeding.matrix import BreedingMatrix, BreedingPal, UniqueCombination
+from palgen.constants import PAL_INFO, PAL_NAME, UNIQUE_BREEDING
+from palgen.db.sql import DatabaseWriter
+from palgen.logger import setup_logging
+from palgen.models.pal_model import PAL_COLUMNS
+from palgen.readers.localization_reader import LocalizationReader
+from palgen.readers.pal_reader import PalReader
+from palgen.readers.plan import COMBI_PLAN, PAL_PLAN
+from palgen.readers.stream import iter_rows
+
+# Differences below this many seconds are treated as noise by the regression check.
+MIN_SECONDS_DELTA = 0.005
+
+def stage_json_decode(context: dict) -> int:
+    """Streams and decodes every row of the three exports."""
+    decoded = {
+        name: list(iter_rows(os.path.join(context['input'], name)))
+        for name in (PAL_INFO, PAL_NAME, UNIQUE_BREEDING)
+    }
+    context['decoded'] = decoded
+    return sum(len(rows) for rows in decoded.values())
+
+def stage_validation(context: dict) -> int:
+    """Validates the decoded rows into the tuples the writer consumes."""
+    decoded = context['decoded']
+    candidates = [PAL_PLAN.extract(row) for _, row in decoded[PAL_INFO] if PalReader.is_candidate(row)]
+    combinations = [UniqueCombination._make(COMBI_PLAN.extract(row)) for _, row in decoded[UNIQUE_BREEDING]]
+    context['candidates'], context['combinations'] = candidates, combinations
+    return len(candidates) + len(combinations)
+
+def stage_localization_join(context: dict) -> int:
+    """Applies the localized names to the candidates and drops unnamed Pals."""
+    reader = PalReader(context['input'], names=context['names'])
+    context['pals'] = reader.read_rows(context['candidates'])
+    return len(context['pals'])
+
+def stage_db_write(context: dict) -> int:
+    """Writes the Pals and unique combinations to a fresh database."""
+    with tempfile.TemporaryDirectory() as output:
+        with DatabaseWriter(output, full=True) as writer:
+            count = writer.write_pals(context['pals'])
+            count += writer.write_unique_combinations(context['combinations'])
+    return count
+
+def stage_breeding(context: dict) -> int:
+    """Computes the breeding matrix."""
+    columns = [PAL_COLUMNS.index(name) for name in BreedingPal._fields]
+    matrix = BreedingMatrix.build(
+        (BreedingPal(*(row[idx] for idx in columns)) for row in context['pals']),
+        context['combinations']
+    )
+    return len(matrix) ** 2
+
+STAGES = (
+    ('json_decode', stage_json_decode),
+    ('validation', stage_validation),
+    ('localization_join', stage_localization_join),
+    ('db_write', stage_db_write),
+    ('breeding', stage_breeding),
+)
+
+def measure(stage, context: dict, repeat: int) -> dict:
+    best, rows = None, 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = stage(context)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    stage(context)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'rows': rows,
+        'seconds': best,
+        'rows_per_second': rows / best if best else None,
+        'peak_bytes': peak,
+    }
+
+def run_scale(rows: int, repeat: int, breeding_max_rows: int) -> dict:
+    with tempfile.TemporaryDirectory() as input_path:
+        write_dataset(input_path, rows)
+        context = {'input': input_path, 'names': LocalizationReader(input_path).read()}
+
+        results = {}
+        for name, stage in STAGES:
+            if name == 'breeding' and rows > breeding_max_rows:
+                continue
+            results[name] = measure(stage, context, repeat)
+            result = results[name]
+            print(f"  {name:<18} {result['seconds']:9.4f}s  {result['rows_per_second'] or 0:>12,.0f} rows/s  "
+                  f"peak {result['peak_bytes'] / 1024 / 1024:8.2f} MiB")
+        return results
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for scale, stages in results['scales'].items():
+        for name, current in stages.items():
+            previous = baseline.get('scales', {}).get(scale, {}).get(name)
+            if previous is None:
+                continue
+            if (current['seconds'] > previous['seconds'] * (1 + threshold)
+                    and current['seconds'] - previous['seconds'] > MIN_SECONDS_DELTA):
+                regressions.append(f"{scale} rows / {name}: {previous['seconds']:.4f}s -> {current['seconds']:.4f}s")
+            if current['peak_bytes'] > previous['peak_bytes'] * (1 + threshold):
+                regressions.append(f"{scale} rows / {name}: peak {previous['peak_bytes']} -> {current['peak_bytes']} bytes")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[200, 1000, 10_000, 100_000], help='Numbers of Pals to generate.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage (the best is kept).')
+    parser.add_argument('--breeding_max_rows', type=int, default=2000, help='Largest scale the N*N breeding stage runs at.')
+    parser.add_argument('--output', default='benchmark_results.json', help='File to write the results to.')
+    parser.add_argument('--baseline', help='Results file to compare against.')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown against the baseline (0.25 = 25%%).')
+    parser.add_argument('--save_baseline', help='Also write the results to this baseline file.')
+    args = parser.parse_args()
+    setup_logging('WARNING')
+
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scales': {},
+    }
+    for rows in args.scales:
+        print(f'{rows} rows:')
+        results['scales'][str(rows)] = run_scale(rows, args.repeat, args.breeding_max_rows)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f'Results written to {path}')
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            regressions = find_regressions(results, json.load(file), args.threshold)
+        if regressions:
+            print(f'{len(regressions)} regression(s) against {args.baseline}:')
+            for regression in regressions:
+                print(f'  {regression}')
+            sys.exit(1)
+        print(f'No regressions against {args.baseline}.')
+
+if __name__ == '__main__':
+    main()
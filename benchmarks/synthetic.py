@@ -0,0 +1,146 @@
+"""Writes synthetic FModel DataTable exports for benchmarking.
+
+Usage:
+    python benchmarks/synthetic.py OUTPUT_DIR [--rows N] [--seed N]
+
+Writes `DT_PalMonsterParameter.json`, `DT_PalNameText_Common.json` and
+`DT_PalCombiUnique.json` shaped like the real game exports. Every Pal also
+gets a boss variant (filtered out by `PalReader`) and roughly 2% of the
+names are left as the `en_text` placeholder. With `--extra`, the skill,
+passive skill, drop and item DataTables of the registry are written too.
+"""
+import argparse
+import json
+import os
+import random
+
+from palgen.constants import ITEM_INFO, PAL_DROP, PAL_INFO, PAL_NAME, PASSIVE_SKILL_INFO, SKILL_INFO, UNIQUE_BREEDING
+
+ELEMENTS = ('Normal', 'Fire', 'Water', 'Leaf', 'Electricity', 'Ice', 'Earth', 'Dark', 'Dragon')
+GENERA = ('Humanoid', 'FourLegged', 'Bird', 'Dragon', 'Fish', 'Other')
+SIZES = ('XS', 'S', 'M', 'L', 'XL')
+WORK_SUITABILITIES = (
+    'EmitFlame', 'Watering', 'Seeding', 'GenerateElectricity', 'Handcraft', 'Collection', 'Deforest',
+    'Mining', 'OilExtraction', 'ProductMedicine', 'Cool', 'Transport', 'MonsterFarm',
+)
+GENDERS = ('EPalGenderType::None', 'EPalGenderType::Male', 'EPalGenderType::Female')
+
+def pal_parameter(rng: random.Random, idx: int) -> dict:
+    """Returns a `DT_PalMonsterParameter` row for the synthetic Pal `idx`."""
+    bp_class = f'SynthPal{idx:06d}'
+    return {
+        'OverrideNameTextID': 'None',
+        'BPClass': bp_class,
+        'Tribe': f'EPalTribeID::{bp_class}',
+        'GenusCategory': f'EPalGenusType::{rng.choice(GENERA)}',
+        'ZukanIndex': idx + 1,
+        'ZukanIndexSuffix': rng.choice(('', '', '', 'B')),
+        'Size': f'EPalSizeType::{rng.choice(SIZES)}',
+        'Rarity': rng.randint(1, 20),
+        'ElementType1': f'EPalElementType::{rng.choice(ELEMENTS)}',
+        'ElementType2': f'EPalElementType::{rng.choice(ELEMENTS + ("None",) * 4)}',
+        'CombiRank': rng.randint(10, 1500),
+        'IsPal': True,
+        'IsBoss': False,
+        'IsTowerBoss': False,
+        'Hp': rng.randint(50, 150),
+        'MeleeAttack': rng.randint(50, 150),
+        'ShotAttack': rng.randint(50, 150),
+        'Defense': rng.randint(50, 150),
+        'Price': rng.randint(100, 10_000),
+        **{f'WorkSuitability_{name}': rng.choice((0, 0, 0, 0, 1, 1, 2, 3, 4)) for name in WORK_SUITABILITIES},
+    }
+
+def write_extra_tables(directory: str, rng: random.Random, bp_classes: list[str], rows: int) -> None:
+    """Writes the skill, passive skill, drop and item exports."""
+    items = {
+        f'SynthItem{idx:05d}': {
+            'OverrideName': 'None', 'TypeA': 'EPalItemTypeA::Material', 'TypeB': 'EPalItemTypeB::MaterialOre',
+            'Rank': rng.randint(1, 5), 'Rarity': rng.randint(0, 4), 'Price': rng.randint(1, 5000),
+            'MaxStackCount': 9999, 'Weight': round(rng.uniform(0.1, 10.0), 1),
+        }
+        for idx in range(max(1, rows // 2))
+    }
+    skills = {
+        str(idx): {
+            'WazaType': f'EPalWazaID::SynthSkill{idx}', 'Element': f'EPalElementType::{rng.choice(ELEMENTS)}',
+            'Category': rng.choice(('EPalWazaCategory::Melee', 'EPalWazaCategory::Shot')),
+            'Power': rng.randint(10, 200), 'CoolTime': float(rng.randint(1, 60)), 'MinRange': 0, 'MaxRange': 1500,
+        }
+        for idx in range(max(1, rows // 2))
+    }
+    passives = {
+        f'SynthPassive{idx}': {
+            'Rank': rng.randint(-3, 4),
+            **{key: value for n in (1, 2, 3) for key, value in (
+                (f'EffectType{n}', f'EPalPassiveSkillEffectType::{rng.choice(("ShotAttack", "Defense", "None"))}'),
+                (f'EffectValue{n}', float(rng.randint(-30, 30))),
+            )},
+        }
+        for idx in range(max(1, rows // 20))
+    }
+    item_ids = list(items)
+    drops = {}
+    for bp_class in bp_classes:
+        row = {'CharacterID': bp_class, 'Level': 0}
+        for n in range(1, 11):
+            used = n <= rng.randint(1, 4)
+            row.update({
+                f'ItemId{n}': rng.choice(item_ids) if used else 'None', f'Rate{n}': 50.0 if used else 0.0,
+                f'min{n}': 1 if used else 0, f'Max{n}': rng.randint(1, 3) if used else 0,
+            })
+        drops[f'{bp_class}000'] = row
+
+    for file, table in ((SKILL_INFO, skills), (PASSIVE_SKILL_INFO, passives), (PAL_DROP, drops), (ITEM_INFO, items)):
+        write_export(os.path.join(directory, file), file.removesuffix('.json'), table)
+
+def write_export(path: str, name: str, rows: dict) -> None:
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump([{'Type': 'DataTable', 'Name': name, 'Class': "UScriptClass'DataTable'", 'Rows': rows}], file, indent=2)
+
+def write_dataset(directory: str, rows: int, seed: int = 0, extra: bool = False) -> None:
+    """Writes the three synthetic exports for `rows` Pals to `directory` (and the extra DataTables if asked)."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    parameters, names = {}, {}
+    for idx in range(rows):
+        row = pal_parameter(rng, idx)
+        parameters[row['BPClass']] = row
+        parameters[f"BOSS_{row['BPClass']}"] = {**row, 'BPClass': f"BOSS_{row['BPClass']}", 'IsBoss': True}
+
+        text = 'en_text' if rng.random() < 0.02 else f'Synthetic Pal {idx}'
+        names[f"PAL_NAME_{row['BPClass']}"] = {
+            'TextData': {'Namespace': '', 'Key': f"PAL_NAME_{row['BPClass']}", 'SourceString': text, 'LocalizedString': text}
+        }
+        names[f"PAL_SHORT_DESC_{row['BPClass']}"] = {'TextData': {'LocalizedString': 'Lorem ipsum dolor sit amet.'}}
+
+    bp_classes = list(parameters)[::2]
+    combinations = {}
+    for idx in range(max(1, rows // 10)):
+        parent_a, parent_b, child = rng.sample(bp_classes, 3) if len(bp_classes) >= 3 else (bp_classes * 3)[:3]
+        combinations[f'{child}_{idx}'] = {
+            'ParentTribeA': f'EPalTribeID::{parent_a}',
+            'ParentGenderA': rng.choice(GENDERS[:1] * 4 + GENDERS[1:]),
+            'ParentTribeB': f'EPalTribeID::{parent_b}',
+            'ParentGenderB': rng.choice(GENDERS[:1] * 4 + GENDERS[1:]),
+            'ChildCharacterID': child,
+        }
+
+    write_export(os.path.join(directory, PAL_INFO), PAL_INFO.removesuffix('.json'), parameters)
+    write_export(os.path.join(directory, PAL_NAME), PAL_NAME.removesuffix('.json'), names)
+    write_export(os.path.join(directory, UNIQUE_BREEDING), UNIQUE_BREEDING.removesuffix('.json'), combinations)
+    if extra:
+        write_extra_tables(directory, rng, bp_classes, rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output', help='Directory to write the exports to.')
+    parser.add_argument('--rows', type=int, default=1000, help='Number of Pals.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed.')
+    parser.add_argument('--extra', action='store_true', help='Also write the skill, passive skill, drop and item DataTables.')
+    args = parser.parse_args()
+    write_dataset(args.output, args.rows, args.seed, args.extra)
+
+if __name__ == '__main__':
+    main()
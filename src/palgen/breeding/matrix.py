@@ -0,0 +1,199 @@
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, NamedTuple
+from sqlalchemy import Connection, select
+from palgen.models.breeding_model import BreedingTable
+from palgen.models.combiunique_model import CombiUniqueTable
+from palgen.models.pal_model import PalTable
+
+GENDER_ANY = 'EPalGenderType::None'
+
+class BreedingPal(NamedTuple):
+    """The subset of Pal data needed to compute breeding results."""
+    bp_class: str
+    tribe: str
+    combirank: int
+
+class UniqueCombination(NamedTuple):
+    """A `combi_unique` override, with parents given by tribe."""
+    tribe_a: str
+    gender_a: str
+    tribe_b: str
+    gender_b: str
+    child_id: str
+
+class BreedingResult(NamedTuple):
+    """A single row of the `breeding` table."""
+    parent_a: str
+    parent_b: str
+    parent_a_gender: str
+    parent_b_gender: str
+    child: str
+
+class BreedingMatrix:
+    """Precomputed N×N table of parent pair → child for every Pal.
+
+    The child of a regular pair is the Pal whose `combirank` is closest to
+    `(rank_a + rank_b + 1) // 2`, with ties going to the lower `combirank`.
+    Pals that are the child of a unique combination can only be bred through
+    that combination and are left out of the regular pool. Breeding a Pal
+    with itself always yields the same Pal.
+
+    Because every `combirank` is a small integer, the nearest-rank search is
+    resolved once for every possible target rank into a lookup table, which
+    turns each pair into plain integer arithmetic and a list index.
+    """
+
+    def __init__(self, classes: list[str], matrix: list[array], gendered: dict[tuple[int, int], list[tuple[str, str, int]]]):
+        self.classes = classes
+        self.index = {bp_class: idx for idx, bp_class in enumerate(classes)}
+        self.matrix = matrix
+        self.gendered = gendered
+
+    @classmethod
+    def build(cls, pals: Iterable[BreedingPal], combinations: Iterable[UniqueCombination]) -> 'BreedingMatrix':
+        """Computes the breeding matrix from Pal ranks and the unique combinations."""
+        pals = list(pals)
+        classes = [pal.bp_class for pal in pals]
+        index = {bp_class: idx for idx, bp_class in enumerate(classes)}
+        by_tribe = {}
+        for idx, pal in enumerate(pals):
+            by_tribe.setdefault(pal.tribe, idx)
+
+        # Resolve unique combinations to Pal indices, skipping any that
+        # reference Pals which were filtered out of the table.
+        overrides = []
+        for combi in combinations:
+            a, b = by_tribe.get(combi.tribe_a), by_tribe.get(combi.tribe_b)
+            child = index.get(combi.child_id)
+            if a is not None and b is not None and child is not None:
+                overrides.append((a, combi.gender_a, b, combi.gender_b, child))
+
+        unique_children = {child for *_, child in overrides}
+        pool = sorted((pal.combirank, idx) for idx, pal in enumerate(pals) if idx not in unique_children)
+        lookup = cls._rank_lookup(pool, max((pal.combirank for pal in pals), default=0))
+
+        ranks = [pal.combirank for pal in pals]
+        matrix = []
+        for i, rank_a in enumerate(ranks):
+            row = array('i', (lookup[(rank_a + rank_b + 1) // 2] for rank_b in ranks))
+            row[i] = i
+            matrix.append(row)
+
+        gendered = {}
+        for a, gender_a, b, gender_b, child in overrides:
+            cls._set_child(matrix, gendered, a, gender_a, b, gender_b, child)
+
+        return cls(classes, matrix, gendered)
+
+    @staticmethod
+    def _set_child(matrix: list[array], gendered: dict, a: int, gender_a: str, b: int, gender_b: str, child: int) -> None:
+        """Records the child of a pair in both parent orders."""
+        if gender_a == GENDER_ANY and gender_b == GENDER_ANY:
+            matrix[a][b] = child
+            matrix[b][a] = child
+            return
+
+        gendered.setdefault((a, b), []).append((gender_a, gender_b, child))
+        if a != b:
+            gendered.setdefault((b, a), []).append((gender_b, gender_a, child))
+
+    @staticmethod
+    def _rank_lookup(pool: list[tuple[int, int]], max_rank: int) -> list[int]:
+        """Maps every target rank in `[0, max_rank]` to the index of the nearest Pal in `pool`."""
+        if not pool:
+            return [-1] * (max_rank + 1)
+
+        ranks = [rank for rank, _ in pool]
+        lookup = []
+        for target in range(max_rank + 1):
+            pos = bisect_left(ranks, target)
+            if pos == len(ranks):
+                pos -= 1
+            elif pos > 0 and target - ranks[pos - 1] <= ranks[pos] - target:
+                # Ties go to the lower rank, and within a rank to the first Pal.
+                pos -= 1
+                while pos > 0 and ranks[pos - 1] == ranks[pos]:
+                    pos -= 1
+            lookup.append(pool[pos][1])
+        return lookup
+
+    @classmethod
+    def from_connection(cls, connection: Connection) -> 'BreedingMatrix':
+        """Computes the breeding matrix from the `pals` and `combi_unique` tables."""
+        pals = connection.execute(
+            select(PalTable.bp_class, PalTable.tribe, PalTable.combirank).order_by(PalTable.internal_index)
+        )
+        combinations = connection.execute(
+            select(CombiUniqueTable.parent_a_tribe, CombiUniqueTable.parent_a_gender, CombiUniqueTable.parent_b_tribe,
+                   CombiUniqueTable.parent_b_gender, CombiUniqueTable.child_id).order_by(CombiUniqueTable.id)
+        )
+        return cls.build((BreedingPal(*row) for row in pals), (UniqueCombination(*row) for row in combinations))
+
+    @classmethod
+    def load(cls, connection: Connection) -> 'BreedingMatrix':
+        """Loads a breeding matrix previously persisted to the `breeding` table."""
+        rows = connection.execute(
+            select(BreedingTable.parent_a, BreedingTable.parent_b, BreedingTable.parent_a_gender,
+                   BreedingTable.parent_b_gender, BreedingTable.child).order_by(BreedingTable.id)
+        ).all()
+
+        classes = list(dict.fromkeys(row.parent_a for row in rows))
+        index = {bp_class: idx for idx, bp_class in enumerate(classes)}
+        matrix = [array('i', [-1]) * len(classes) for _ in classes]
+        gendered = {}
+
+        for parent_a, parent_b, gender_a, gender_b, child in rows:
+            a, b = index[parent_a], index[parent_b]
+            if child in index:
+                cls._set_child(matrix, gendered, a, gender_a, b, gender_b, index[child])
+
+        return cls(classes, matrix, gendered)
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    def child(self, parent_a: str, parent_b: str, gender_a: str | None = None, gender_b: str | None = None) -> str | None:
+        """Returns what `parent_a` and `parent_b` produce.
+
+        Gender-constrained unique combinations only apply when both genders
+        are given (as `EPalGenderType::Male`/`EPalGenderType::Female`).
+        Returns None if either parent is unknown.
+        """
+        a, b = self.index.get(parent_a), self.index.get(parent_b)
+        if a is None or b is None:
+            return None
+
+        if gender_a is not None and gender_b is not None:
+            for required_a, required_b, child in self.gendered.get((a, b), ()):
+                if required_a in (GENDER_ANY, gender_a) and required_b in (GENDER_ANY, gender_b):
+                    return self.classes[child]
+
+        child = self.matrix[a][b]
+        return self.classes[child] if child >= 0 else None
+
+    def children(self, parent_a: str, parent_b: str) -> list[BreedingResult]:
+        """Returns every possible outcome of a pair, including the gender-constrained ones."""
+        a, b = self.index.get(parent_a), self.index.get(parent_b)
+        if a is None or b is None:
+            return []
+
+        results = [
+            BreedingResult(parent_a, parent_b, gender_a, gender_b, self.classes[child])
+            for gender_a, gender_b, child in self.gendered.get((a, b), ())
+        ]
+        if self.matrix[a][b] >= 0:
+            results.append(BreedingResult(parent_a, parent_b, GENDER_ANY, GENDER_ANY, self.classes[self.matrix[a][b]]))
+        return results
+
+    def results(self) -> Iterator[BreedingResult]:
+        """Yields every unordered parent pair once, followed by the gender-constrained overrides."""
+        for a, row in enumerate(self.matrix):
+            for b in range(a, len(row)):
+                if row[b] >= 0:
+                    yield BreedingResult(self.classes[a], self.classes[b], GENDER_ANY, GENDER_ANY, self.classes[row[b]])
+
+        for (a, b), overrides in self.gendered.items():
+            if a <= b:
+                for gender_a, gender_b, child in overrides:
+                    yield BreedingResult(self.classes[a], self.classes[b], gender_a, gender_b, self.classes[child])
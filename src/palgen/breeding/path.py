@@ -0,0 +1,165 @@
+import heapq
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+from palgen.breeding.matrix import GENDER_ANY, BreedingMatrix
+from palgen.constants import BREEDS, GENERATIONS, OBJECTIVES
+
+class BreedingStep(NamedTuple):
+    """A single breeding operation in a path."""
+    parent_a: str
+    parent_b: str
+    parent_a_gender: str
+    parent_b_gender: str
+    child: str
+
+class BreedingPath(NamedTuple):
+    """A breeding chain from the owned Pals to a target, in breeding order."""
+    target: str
+    steps: tuple[BreedingStep, ...]
+    generations: int
+
+    @property
+    def breeds(self) -> int:
+        return len(self.steps)
+
+class BreedingPathFinder:
+    """Finds the shortest or cheapest breeding chain from a set of owned Pals to a target.
+
+    Breeding is an AND-OR graph: a child is reachable only once *both* of its
+    parents are. The search is Knuth's generalization of Dijkstra's algorithm
+    to such graphs. Pals are settled in order of cost, each newly settled Pal
+    is paired with every Pal settled before it through the precomputed
+    matrix, and the search stops as soon as the target is settled. The
+    reverse index (child → parent pairs) answers targets that are owned or
+    one breed away without searching at all.
+
+    `GENERATIONS` costs a Pal the depth of its breeding tree, which the
+    search minimizes exactly. `BREEDS` costs it the size of the tree, so a
+    Pal bred on two branches counts twice even though the path breeds it
+    once. It is a heuristic: the returned path may have fewer steps than
+    its cost, and a path sharing more intermediates may have fewer still
+    (minimizing the distinct steps is NP-hard).
+
+    Results are memoized per `(owned set, target, objective)` in a bounded
+    LRU cache.
+    """
+
+    def __init__(self, matrix: BreedingMatrix, cache_size: int = 1024):
+        self.matrix = matrix
+        self.parents = self._reverse_index(matrix)
+        self._search = lru_cache(maxsize=cache_size)(self._search_uncached)
+
+    @staticmethod
+    def _reverse_index(matrix: BreedingMatrix) -> dict[int, list[tuple[int, int, str, str]]]:
+        """Maps every child to the parent pairs (and required genders) that produce it."""
+        parents = {}
+        for a, row in enumerate(matrix.matrix):
+            for b in range(a, len(row)):
+                if row[b] >= 0 and row[b] not in (a, b):
+                    parents.setdefault(row[b], []).append((a, b, GENDER_ANY, GENDER_ANY))
+
+        for (a, b), overrides in matrix.gendered.items():
+            if a <= b:
+                for gender_a, gender_b, child in overrides:
+                    parents.setdefault(child, []).append((a, b, gender_a, gender_b))
+        return parents
+
+    def parents_of(self, child: str) -> list[BreedingStep]:
+        """Returns every parent pair that produces `child`."""
+        idx = self.matrix.index.get(child)
+        classes = self.matrix.classes
+        return [
+            BreedingStep(classes[a], classes[b], gender_a, gender_b, child)
+            for a, b, gender_a, gender_b in self.parents.get(idx, ())
+        ]
+
+    def find(self, owned: Iterable[str], target: str, objective: str = GENERATIONS) -> BreedingPath | None:
+        """Returns the best breeding path to `target`, or None if it cannot be reached."""
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective '{objective}', expected one of {', '.join(OBJECTIVES)}.")
+
+        index = self.matrix.index
+        if target not in index:
+            raise KeyError(f"Unknown Pal '{target}'.")
+        owned = list(owned) # Read twice below, so a generator is not used up by the check.
+        unknown = [bp_class for bp_class in owned if bp_class not in index]
+        if unknown:
+            raise KeyError(f"Unknown Pal(s): {', '.join(unknown)}.")
+
+        return self._search(frozenset(index[bp_class] for bp_class in owned), index[target], objective)
+
+    def cache_info(self):
+        return self._search.cache_info()
+
+    def _search_uncached(self, owned: frozenset[int], target: int, objective: str) -> BreedingPath | None:
+        classes = self.matrix.classes
+
+        if target in owned:
+            return BreedingPath(classes[target], (), 0)
+        for a, b, gender_a, gender_b in self.parents.get(target, ()):
+            if a in owned and b in owned:
+                step = BreedingStep(classes[a], classes[b], gender_a, gender_b, classes[target])
+                return BreedingPath(classes[target], (step,), 1)
+
+        recipes = self._settle(owned, target, objective)
+        if target not in recipes:
+            return None
+        return self._build_path(recipes, target)
+
+    def _settle(self, owned: frozenset[int], target: int, objective: str) -> dict[int, tuple | None]:
+        """Runs the search and returns the recipe of every settled Pal (None for owned Pals)."""
+        matrix, gendered = self.matrix.matrix, self.matrix.gendered
+        # Tree depth, or tree size (intermediates shared by both parents are counted for each).
+        combine = max if objective == GENERATIONS else (lambda x, y: x + y)
+
+        best = {idx: 0 for idx in owned}
+        recipes = {}
+        pending = {idx: None for idx in owned}
+        heap = [(0, idx) for idx in owned]
+        settled = []
+
+        while heap:
+            cost, x = heapq.heappop(heap)
+            if x in recipes or cost > best[x]:
+                continue
+            recipes[x] = pending[x]
+            settled.append(x)
+            if x == target:
+                break
+
+            row = matrix[x]
+            for y in settled:
+                new_cost = combine(cost, best[y]) + 1
+                outcomes = [(row[y], GENDER_ANY, GENDER_ANY)]
+                outcomes.extend((child, gender_a, gender_b) for gender_a, gender_b, child in gendered.get((x, y), ()))
+
+                for child, gender_a, gender_b in outcomes:
+                    if child < 0 or child in recipes:
+                        continue
+                    if new_cost < best.get(child, new_cost + 1):
+                        best[child] = new_cost
+                        pending[child] = (x, y, gender_a, gender_b)
+                        heapq.heappush(heap, (new_cost, child))
+
+        return recipes
+
+    def _build_path(self, recipes: dict[int, tuple | None], target: int) -> BreedingPath:
+        """Expands the recipes into breeding steps, parents before children, each Pal bred once."""
+        classes = self.matrix.classes
+        steps, depth = [], {}
+
+        def visit(idx: int) -> int:
+            if idx in depth:
+                return depth[idx]
+            recipe = recipes[idx]
+            if recipe is None:
+                depth[idx] = 0
+                return 0
+
+            a, b, gender_a, gender_b = recipe
+            depth[idx] = max(visit(a), visit(b)) + 1
+            steps.append(BreedingStep(classes[a], classes[b], gender_a, gender_b, classes[idx]))
+            return depth[idx]
+
+        generations = visit(target)
+        return BreedingPath(classes[target], tuple(steps), generations)
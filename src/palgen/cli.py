@@ -1,12 +1,7 @@
 import sys
 import argparse
-from pathlib import Path
+from typing import NamedTuple
 from colorama import Fore, Style
-from loguru import logger
-from palgen.readers.pal_reader import PalReader
-from palgen.readers.combiunique_reader import CombiUniqueReader
-from palgen.db.sql import save_pals_to_db, save_unique_combinations_to_db
-from palgen.logger import setup_logging
 
 class CustomHelpFormatter(argparse.HelpFormatter):
     """Custom help formatter to adjust the layout of the help message.
@@ -95,52 +90,31 @@ class CustomHelpFormatter(argparse.HelpFormatter):
 
         return help_text
 
-def generate_command(args):
-    """Generate Pal database from game data files."""
-    try:
-        # Input path handling.
-        input_path = Path(args.input_path) if args.input_path else Path('.data')
-        if not input_path.exists():
-            logger.error(f"Input path '{input_path}' does not exist.")
-            sys.exit(1)
-
-        # Output path handling.
-        output_path = Path(args.output_path) if args.output_path else Path('output')
-        output_path.mkdir(parents=True, exist_ok=True)
-
-        readers = list([])
-
-        if args.pal or args.all:
-            readers.append('pals')
-        if args.combi_unique or args.all:
-            readers.append('combi_unique')
-        if not readers:
-            readers = ['pals', 'combi_unique']
-
-        logger.info(f"Generating Pal database with readers {', '.join(readers)}...")
-
-        if 'pals' in readers:
-            pal_reader = PalReader(str(input_path))
-            pals = pal_reader.read()
-            logger.info(f"Read {len(pals)} Pal objects from '{input_path}'")
-
-            save_pals_to_db(pals, str(output_path))
-            logger.info(f"Pal database generated successfully at '{output_path}/pals.db'")
-
-        if 'combi_unique' in readers:
-            reader = CombiUniqueReader(str(input_path))
-            data = reader.read()
-            logger.info(f"Read {len(data)} unique combinations from '{input_path}'")
-
-            save_unique_combinations_to_db(data, str(output_path))
-            logger.info(f"Combi Unique database generated successfully at '{output_path}/pals.db'")
-
-    except Exception as e:
-        logger.error(f"An error occurred while generating the Pal database: {e}")
-        sys.exit(1)
-
-
-def main():
+class Command(NamedTuple):
+    """A subcommand whose module is only imported when the command is run or its help is shown."""
+    module: str # Module defining `add_arguments(parser)` and `run(args)`.
+    description: str
+
+# Subcommands, in the order they are listed by `palgen -h`. A command
+# module only imports `palgen.constants` at the top, for its choice lists.
+# SQLAlchemy, Pydantic, loguru and the readers are imported in its `run`,
+# so none of them is loaded for `palgen <command> -h` or a usage error.
+COMMANDS = {
+    'generate': Command('palgen.commands.generate', 'Generate a Pal database from game data files.'),
+    'breed-path': Command('palgen.commands.breed_path', 'Find a breeding chain from owned Pals to a target Pal.'),
+    'diff': Command(
+        'palgen.commands.diff',
+        'List the Pals and unique combinations added, removed and changed between two versions.'
+    ),
+    'optimize-team': Command(
+        'palgen.commands.optimize_team',
+        'Find the smallest teams of Pals covering the required work-suitability levels.'
+    ),
+    'serve': Command('palgen.commands.serve', 'Serve Pal lookups from a generated database over HTTP.'),
+}
+
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
     parser = argparse.ArgumentParser(
         prog='palgen',
         description='PalGen CLI - Generate Pal databases from game data files.',
@@ -156,51 +130,31 @@ def main():
     """Subparsers"""
     subparsers = parser.add_subparsers(title='Commands', dest='command', metavar='')
 
-    generate_parser = subparsers.add_parser(
-        name='generate',
-        description='Generate a Pal database from game data files.',
-        formatter_class=CustomHelpFormatter
-    )
-    generate_parser.add_argument(
-        '-i', '--input_path',
-        help='Path to the input data files.'
-    )
-    generate_parser.add_argument(
-        '-o', '--output_path',
-        help='Path to the output database file.'
-    )
-
-    generate_parser.add_argument(
-        '-p', '--pal',
-        action='store_true',
-        help='Generate Pal database.'
-    )
-    generate_parser.add_argument(
-        '-c', '--combi_unique',
-        action='store_true',
-        help='Generate Combi Unique database.'
-    )
-    generate_parser.add_argument(
-        '-a', '--all',
-        action='store_true',
-        help='Generate both Pal and Combi Unique databases.'
-    )
-
-    generate_parser.set_defaults(func=generate_command)
+    # The global options take no value, so the first positional argument is the command.
+    name = next((arg for arg in argv if not arg.startswith('-')), None)
+    for command_name, command in COMMANDS.items():
+        command_parser = subparsers.add_parser(
+            name=command_name,
+            description=command.description,
+            formatter_class=CustomHelpFormatter
+        )
+        if command_name == name:
+            # `__import__` rather than `importlib.import_module`, which `-X importtime` does not see.
+            module = __import__(command.module, fromlist=('run',))
+            module.add_arguments(command_parser)
+            command_parser.set_defaults(func=module.run)
+
+    args = parser.parse_args(argv)
+    if not hasattr(args, 'func'):
+        parser.print_help()
+        sys.exit(1)
 
-    args = parser.parse_args()
+    # Imported here as loguru is only needed once a command runs.
+    from palgen.logger import setup_logging
     log_level = "DEBUG" if args.verbose else "INFO"
     setup_logging(log_level)
 
-    if not args.command:
-        parser.print_help()
-        sys.exit(1)
-
-    if hasattr(args, 'func'):
-        args.func(args)
-    else:
-        parser.print_help()
-        sys.exit(1)
+    args.func(args)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,65 @@
+import sys
+import argparse
+from pathlib import Path
+from palgen.constants import OBJECTIVES
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '-d', '--database',
+        help='Path to the generated pals.db file.'
+    )
+    parser.add_argument(
+        '-o', '--owned',
+        nargs='+',
+        required=True,
+        help='Blueprint classes of the owned Pals.'
+    )
+    parser.add_argument(
+        '-t', '--target',
+        required=True,
+        help='Blueprint class of the Pal to breed.'
+    )
+    parser.add_argument(
+        '--objective',
+        default=OBJECTIVES[0],
+        choices=OBJECTIVES,
+        help='Minimize the number of generations, or the size of the breeding tree (approximates the fewest breeds).'
+    )
+
+def run(args):
+    """Find the breeding chain from owned Pals to a target Pal."""
+    from loguru import logger
+    from palgen.breeding.matrix import BreedingMatrix
+    from palgen.breeding.path import BreedingPathFinder
+    from palgen.db.schema import check_schema, open_readonly
+
+    try:
+        database_path = Path(args.database) if args.database else Path('output/pals.db')
+        if not database_path.exists():
+            logger.error(f"Database '{database_path}' does not exist. Run 'palgen generate' first.")
+            sys.exit(1)
+
+        engine = open_readonly(database_path)
+        with engine.connect() as connection:
+            check_schema(connection)
+            matrix = BreedingMatrix.load(connection)
+            if not len(matrix):
+                matrix = BreedingMatrix.from_connection(connection)
+        engine.dispose()
+
+        path = BreedingPathFinder(matrix).find(args.owned, args.target, args.objective)
+        if path is None:
+            logger.error(f"'{args.target}' cannot be bred from the owned Pals.")
+            sys.exit(1)
+
+        if not path.steps:
+            logger.info(f"'{args.target}' is already owned.")
+            return
+
+        logger.info(f"Found a path to '{path.target}' in {path.breeds} breed(s) over {path.generations} generation(s):")
+        for number, step in enumerate(path.steps, start=1):
+            logger.info(f"{number}. {step.parent_a} + {step.parent_b} -> {step.child}")
+
+    except (KeyError, ValueError) as e:
+        logger.error(e.args[0] if e.args else e)
+        sys.exit(1)
@@ -0,0 +1,64 @@
+import sys
+import argparse
+from pathlib import Path
+from palgen.constants import VERSIONED_TABLE_NAMES
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        'old',
+        help='Label of the older version.'
+    )
+    parser.add_argument(
+        'new',
+        help='Label of the newer version.'
+    )
+    parser.add_argument(
+        '-d', '--database',
+        help='Path to the generated pals.db file.'
+    )
+    parser.add_argument(
+        '-t', '--tables',
+        nargs='+',
+        choices=VERSIONED_TABLE_NAMES,
+        help='Only compare these tables.'
+    )
+
+def describe_row(table: str, key: str, row: dict | None = None) -> str:
+    """Formats a versioned row for the diff output."""
+    if table == 'combi_unique':
+        if row is None:
+            return key.replace('|', ' + ')
+        return f"{row['parent_a_tribe']} + {row['parent_b_tribe']} -> {row['child_id']}"
+    return f"{key} ({row['text_name']})" if row else key
+
+def run(args):
+    """List what changed between two stored versions of the dataset."""
+    from loguru import logger
+    from palgen.db.schema import check_schema, open_readonly
+    from palgen.db.versions import diff_versions
+
+    try:
+        database_path = Path(args.database) if args.database else Path('output/pals.db')
+        if not database_path.exists():
+            logger.error(f"Database '{database_path}' does not exist. Run 'palgen generate --version' first.")
+            sys.exit(1)
+
+        engine = open_readonly(database_path)
+        with engine.connect() as connection:
+            check_schema(connection)
+            diffs = diff_versions(connection, args.old, args.new, args.tables)
+        engine.dispose()
+
+        for table, diff in diffs.items():
+            logger.info(f"{table}: {len(diff.added)} added, {len(diff.removed)} removed, {len(diff.changed)} changed")
+            for key, row in diff.added:
+                logger.info(f"  + {describe_row(table, key, row)}")
+            for key, row in diff.removed:
+                logger.info(f"  - {describe_row(table, key, row)}")
+            for key, changes in diff.changed:
+                fields = ', '.join(f'{column} {old} -> {new}' for column, (old, new) in changes.items())
+                logger.info(f"  ~ {describe_row(table, key)}: {fields}")
+
+    except (KeyError, ValueError) as e:
+        logger.error(e.args[0] if e.args else e)
+        sys.exit(1)
@@ -0,0 +1,202 @@
+import sys
+import argparse
+from pathlib import Path
+from palgen.constants import DEFAULT_CACHE_SIZE, EXTRA_TABLES
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '-i', '--input_path',
+        help='Path to the input data files (a directory, or a .zip/.tar/.tar.gz/.tar.bz2/.tar.xz archive of them).'
+    )
+    parser.add_argument(
+        '-o', '--output_path',
+        help='Path to the output database file.'
+    )
+
+    parser.add_argument(
+        '-l', '--l10n_path',
+        help='Path to the L10N folder (or an archive of it) holding every locale, to generate the pal_names table.'
+    )
+
+    parser.add_argument(
+        '-p', '--pal',
+        action='store_true',
+        help='Generate Pal database.'
+    )
+    parser.add_argument(
+        '-c', '--combi_unique',
+        action='store_true',
+        help='Generate Combi Unique database.'
+    )
+    parser.add_argument(
+        '-b', '--breeding',
+        action='store_true',
+        help='Generate the breeding results table.'
+    )
+    parser.add_argument(
+        '-t', '--tables',
+        nargs='+',
+        choices=EXTRA_TABLES,
+        help='Also generate these DataTables (skills, passive skills, drops, items).'
+    )
+    parser.add_argument(
+        '-a', '--all',
+        action='store_true',
+        help='Generate the Pal, Combi Unique and breeding databases, and every other DataTable found.'
+    )
+
+    parser.add_argument(
+        '--version',
+        metavar='LABEL',
+        help="Also store the Pals and unique combinations as this version of the dataset (see 'palgen diff')."
+    )
+    parser.add_argument(
+        '-s', '--snapshot',
+        action='store_true',
+        help='Also write a memory-mappable pals.snap file for read-only consumers.'
+    )
+    parser.add_argument(
+        '-f', '--full',
+        action='store_true',
+        help='Rebuild every table even if its source files are unchanged.'
+    )
+    parser.add_argument(
+        '--in_place',
+        action='store_true',
+        help='Write into pals.db directly instead of building a copy and swapping it in when complete.'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Number of processes parsing the source files (0 = one per CPU core).'
+    )
+    parser.add_argument(
+        '--journal_mode',
+        default='WAL',
+        choices=['DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'],
+        help='SQLite journal mode used while writing the database.'
+    )
+    parser.add_argument(
+        '--synchronous',
+        default='NORMAL',
+        choices=['OFF', 'NORMAL', 'FULL', 'EXTRA'],
+        help='SQLite synchronous level used while writing the database.'
+    )
+    parser.add_argument(
+        '--cache_size',
+        type=int,
+        default=-64000,
+        help='SQLite page cache size (negative values are in KiB).'
+    )
+    parser.add_argument(
+        '--row_cache_dir',
+        help='Directory of the parsed-row cache (defaults to ~/.cache/palgen/rows).'
+    )
+    parser.add_argument(
+        '--row_cache_size',
+        type=int,
+        default=DEFAULT_CACHE_SIZE // (1024 * 1024),
+        help='Size cap of the parsed-row cache in MiB, least recently used entries are evicted first.'
+    )
+    parser.add_argument(
+        '--no_cache',
+        action='store_true',
+        help='Parse every source file without the parsed-row cache.'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Measure the time, rows and peak memory of every stage and write a JSON report.'
+    )
+    parser.add_argument(
+        '--profile_report',
+        help='Path of the profile report (defaults to profile.json in the output path).'
+    )
+    parser.add_argument(
+        '--profile_stats',
+        help='Also write cProfile stats of the run to this file (implies --profile).'
+    )
+
+def run(args):
+    """Generate Pal database from game data files."""
+    from loguru import logger
+    from palgen.db.sql import SQLitePragmas
+    from palgen.pipeline import GeneratePipeline
+    from palgen.readers.cache import RowCache
+    from palgen.readers.source import InputSource
+    from palgen.registry import DATA_TABLES
+
+    try:
+        # Input path handling.
+        input_path = Path(args.input_path) if args.input_path else Path('.data')
+        if not input_path.exists():
+            logger.error(f"Input path '{input_path}' does not exist.")
+            sys.exit(1)
+
+        # Output path handling.
+        output_path = Path(args.output_path) if args.output_path else Path('output')
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        readers = list([])
+
+        if args.pal or args.all:
+            readers.append('pals')
+        if args.combi_unique or args.all:
+            readers.append('combi_unique')
+        if args.breeding or args.all:
+            readers.append('breeding')
+        for table in args.tables or []:
+            if table not in readers:
+                readers.append(table)
+        if args.all:
+            with InputSource.from_path(input_path) as source:
+                for table in EXTRA_TABLES:
+                    if table in readers:
+                        continue
+                    if source.exists(DATA_TABLES[table].file):
+                        readers.append(table)
+                    else:
+                        logger.warning(f"Skipping '{table}', {DATA_TABLES[table].file} was not found in '{input_path}'.")
+        if args.l10n_path:
+            if not Path(args.l10n_path).exists():
+                logger.error(f"Localization path '{args.l10n_path}' does not exist.")
+                sys.exit(1)
+            readers.append('pal_names')
+        if readers == ['pal_names']:
+            readers = ['pals', 'combi_unique', 'breeding', 'pal_names']
+        if not readers:
+            readers = ['pals', 'combi_unique', 'breeding']
+
+        logger.info(f"Generating Pal database with readers {', '.join(readers)}...")
+
+        pragmas = SQLitePragmas(
+            journal_mode=args.journal_mode,
+            synchronous=args.synchronous,
+            cache_size=args.cache_size
+        )
+
+        cache = None if args.no_cache else RowCache(args.row_cache_dir, args.row_cache_size * 1024 * 1024)
+
+        pipeline = GeneratePipeline(
+            str(input_path),
+            str(output_path),
+            stages=readers,
+            jobs=args.jobs,
+            pragmas=pragmas,
+            full=args.full,
+            log_level="DEBUG" if args.verbose else "INFO",
+            l10n_path=args.l10n_path,
+            snapshot=args.snapshot,
+            profile=args.profile,
+            profile_report=args.profile_report,
+            profile_stats=args.profile_stats,
+            cache=cache,
+            version=args.version,
+            atomic=not args.in_place
+        )
+        pipeline.run()
+
+    except Exception as e:
+        logger.error(f"An error occurred while generating the Pal database: {e}")
+        sys.exit(1)
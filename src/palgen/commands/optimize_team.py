@@ -0,0 +1,95 @@
+import sys
+import argparse
+from pathlib import Path
+from palgen.constants import MODES
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '-d', '--database',
+        help='Path to the generated pals.db file.'
+    )
+    parser.add_argument(
+        '-r', '--require',
+        nargs='+',
+        required=True,
+        metavar='WORK=LEVEL',
+        help='Required work-suitability levels (e.g. mining=6 kindling=4).'
+    )
+    parser.add_argument(
+        '--mode',
+        default=MODES[0],
+        choices=MODES,
+        help='Add up the levels of the team, or require one Pal reaching each level.'
+    )
+    parser.add_argument(
+        '--max_size',
+        type=int,
+        default=20,
+        help='Largest team size to consider.'
+    )
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=1,
+        help='Number of optimal teams to list.'
+    )
+    parser.add_argument(
+        '--time_budget',
+        type=float,
+        help='Seconds to search before returning the best team found so far.'
+    )
+    parser.add_argument(
+        '-p', '--pals',
+        nargs='+',
+        help='Blueprint classes of the Pals to pick from (e.g. the ones owned). Defaults to all Pals.'
+    )
+
+def parse_requirements(values: list[str]) -> dict[str, int]:
+    """Parses `work=level` arguments into a requirement profile."""
+    requirements = {}
+    for value in values:
+        name, separator, level = value.partition('=')
+        if not separator or not level.isdigit():
+            raise ValueError(f"Invalid requirement '{value}', expected work=level (e.g. mining=4).")
+        requirements[name] = int(level)
+    return requirements
+
+def run(args):
+    """Find the smallest teams of Pals covering a work-suitability requirement profile."""
+    from loguru import logger
+    from palgen.db.schema import check_schema, open_readonly
+    from palgen.team import TeamOptimizer
+
+    try:
+        database_path = Path(args.database) if args.database else Path('output/pals.db')
+        if not database_path.exists():
+            logger.error(f"Database '{database_path}' does not exist. Run 'palgen generate' first.")
+            sys.exit(1)
+
+        requirements = parse_requirements(args.require)
+        engine = open_readonly(database_path)
+        with engine.connect() as connection:
+            check_schema(connection)
+            optimizer = TeamOptimizer.from_connection(connection)
+        engine.dispose()
+
+        result = optimizer.solve(requirements, args.mode, args.max_size, args.limit, args.time_budget, args.pals)
+        stats = f"{result.candidates} candidates, {result.nodes} nodes, {result.seconds:.2f}s"
+        if not result.teams:
+            logger.error(f"No team of at most {args.max_size} Pals meets the requirements ({stats}).")
+            sys.exit(1)
+
+        if result.optimal:
+            logger.info(f"Found {len(result.teams)} optimal team(s) of {result.size} Pal(s) ({stats}):")
+        else:
+            logger.warning(f"Time budget exhausted, the best team found has {result.size} Pal(s) "
+                           f"but one of {result.lower_bound} may exist ({stats}):")
+        for number, team in enumerate(result.teams, start=1):
+            names = ', '.join(f"{bp_class} ({optimizer.by_bp_class[bp_class].text_name})" for bp_class in team)
+            logger.info(f"{number}. {names}")
+            coverage = optimizer.coverage(team, requirements, args.mode)
+            logger.info(f"   {', '.join(f'{name} {coverage[name]}/{level}' for name, level in requirements.items())}")
+
+    except (KeyError, ValueError) as e:
+        logger.error(e.args[0] if e.args else e)
+        sys.exit(1)
@@ -0,0 +1,43 @@
+import sys
+import argparse
+from pathlib import Path
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        '-d', '--database',
+        help='Path to the generated pals.db file.'
+    )
+    parser.add_argument(
+        '--host',
+        default='127.0.0.1',
+        help='Address to listen on.'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8000,
+        help='Port to listen on.'
+    )
+    parser.add_argument(
+        '--pool_size',
+        type=int,
+        default=4,
+        help='Number of pooled read-only database connections.'
+    )
+
+def run(args):
+    """Serve Pal lookups from a generated database over HTTP."""
+    import asyncio
+    from loguru import logger
+    from palgen.server import PalServer
+
+    database_path = Path(args.database) if args.database else Path('output/pals.db')
+    if not database_path.exists():
+        logger.error(f"Database '{database_path}' does not exist. Run 'palgen generate' first.")
+        sys.exit(1)
+
+    server = PalServer(str(database_path), pool_size=args.pool_size)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        logger.info("Server stopped.")
@@ -10,4 +10,39 @@ PAL_NAME = "DT_PalNameText_Common.json"
 PAL_INFO = "DT_PalMonsterParameter.json"
 
 """Pal/Content/Pal/DataTable/Character/DT_PalCombiUnique.uasset"""
-UNIQUE_BREEDING = "DT_PalCombiUnique.json"
\ No newline at end of file
+UNIQUE_BREEDING = "DT_PalCombiUnique.json"
+
+"""Pal/Content/Pal/DataTable/Waza/DT_WazaDataTable.uasset"""
+SKILL_INFO = "DT_WazaDataTable.json"
+
+"""Pal/Content/Pal/DataTable/PassiveSkill/DT_PassiveSkill_Main.uasset"""
+PASSIVE_SKILL_INFO = "DT_PassiveSkill_Main.json"
+
+"""Pal/Content/Pal/DataTable/Character/DT_PalDropItem.uasset"""
+PAL_DROP = "DT_PalDropItem.json"
+
+"""Pal/Content/Pal/DataTable/Item/DT_ItemDataTable.uasset"""
+ITEM_INFO = "DT_ItemDataTable.json"
+
+# Option values of the commands. They are kept here, in a module importing
+# nothing, so the CLI can build its argument parsers without loading
+# SQLAlchemy, Pydantic or loguru.
+
+"""Search objectives of `palgen.breeding.path.BreedingPathFinder`"""
+GENERATIONS = 'generations' # Fewest generations (depth of the breeding tree).
+BREEDS = 'breeds' # Smallest breeding tree (a heuristic for fewest breeding operations, see `BreedingPathFinder`).
+OBJECTIVES = (GENERATIONS, BREEDS)
+
+"""How `palgen.team.TeamOptimizer` counts the levels of a team against a requirement"""
+SUM = 'sum' # Levels add up (two Pals with mining 2 cover mining 4).
+MAX = 'max' # One Pal of the team has to reach the level on its own.
+MODES = (SUM, MAX)
+
+"""DataTables of `palgen.registry.DATA_TABLES` written as they are, without a dedicated stage"""
+EXTRA_TABLES = ('skills', 'passive_skills', 'pal_drops', 'items')
+
+"""Tables stored with every version of the dataset (`palgen.db.versions.VERSIONED_TABLES`)"""
+VERSIONED_TABLE_NAMES = ('pals', 'combi_unique')
+
+"""Default size cap of the parsed-row cache (`palgen.readers.cache.RowCache`), in bytes"""
+DEFAULT_CACHE_SIZE = 512 * 1024 * 1024
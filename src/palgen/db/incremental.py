@@ -0,0 +1,172 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Sequence
+from sqlalchemy import Connection, delete, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from palgen.models.meta_model import RowFingerprintTable, SourceFileTable
+
+@dataclass
+class SyncResult:
+    """Summary of the row-level diff applied to a table."""
+    inserted: int = 0
+    updated: int = 0
+    moved: int = 0 # Rows whose content is unchanged but whose position changed.
+    deleted: int = 0
+    unchanged: int = 0
+
+    @property
+    def written(self) -> int:
+        return self.inserted + self.updated + self.moved + self.deleted
+
+def fingerprint_row(row: tuple) -> str:
+    """Returns a stable fingerprint for a row tuple."""
+    payload = json.dumps(row, separators=(',', ':'), default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+def load_source_hashes(connection: Connection, table_name: str) -> dict[str, str]:
+    """Returns the stored `{source: content_hash}` mapping for a table."""
+    rows = connection.execute(
+        select(SourceFileTable.source, SourceFileTable.content_hash)
+        .where(SourceFileTable.table_name == table_name)
+    )
+    return dict(rows.all())
+
+def store_source_hashes(connection: Connection, table_name: str, hashes: dict[str, str]) -> None:
+    """Replaces the stored source hashes of a table."""
+    connection.execute(delete(SourceFileTable).where(SourceFileTable.table_name == table_name))
+    if hashes:
+        connection.execute(insert(SourceFileTable), [
+            {'table_name': table_name, 'source': source, 'content_hash': content_hash}
+            for source, content_hash in hashes.items()
+        ])
+
+def load_fingerprints(connection: Connection, table_name: str) -> dict[str, str]:
+    """Returns the stored `{row_key: fingerprint}` mapping for a table."""
+    rows = connection.execute(
+        select(RowFingerprintTable.row_key, RowFingerprintTable.fingerprint)
+        .where(RowFingerprintTable.table_name == table_name)
+    )
+    return dict(rows.all())
+
+def insert_sql(table, columns: Sequence[str]) -> str:
+    """Returns a DB-API `INSERT` statement taking the values of `columns` as a tuple."""
+    names = ', '.join(f'"{column}"' for column in columns)
+    return f'INSERT INTO "{table.__tablename__}" ({names}) VALUES ({", ".join("?" * len(columns))})'
+
+def update_sql(table, columns: Sequence[str], keys: Sequence[str]) -> str:
+    """Returns a DB-API `UPDATE` statement taking the values of `columns` followed by the values of `keys`."""
+    assignments = ', '.join(f'"{column}" = ?' for column in columns)
+    return f'UPDATE "{table.__tablename__}" SET {assignments} WHERE {_where(keys)}'
+
+def delete_sql(table, keys: Sequence[str]) -> str:
+    """Returns a DB-API `DELETE` statement taking the values of `keys`."""
+    return f'DELETE FROM "{table.__tablename__}" WHERE {_where(keys)}'
+
+def _where(keys: Sequence[str]) -> str:
+    return ' AND '.join(f'"{key}" = ?' for key in keys)
+
+def _batched(items: Iterable, size: int):
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+def sync_table(connection: Connection, table, rows: Iterable[tuple], columns: Sequence[str], key: str | Sequence[str],
+               position: str | None = None, full: bool = False, batch_size: int = 5000) -> SyncResult:
+    """Brings `table` in line with `rows` by applying a row-level diff.
+
+    Rows are tuples holding the values of `columns`, and are passed to the
+    driver as they are. They are matched on the `key` column (or columns)
+    and compared through their stored fingerprints, so only new, changed
+    and removed rows touch the table. A `position` column holds the order
+    of the rows rather than their content: it is left out of the fingerprint,
+    and a row that only moved gets its position updated alone.
+
+    When `full` is set, no fingerprints were recorded yet (e.g. a database
+    built by an older version), or the key does not tell the rows apart, the
+    table is cleared and rewritten instead.
+    """
+    table_name = table.__tablename__
+    result = SyncResult()
+    keys = (key,) if isinstance(key, str) else tuple(key)
+    key_idx = [columns.index(name) for name in keys]
+    position_idx = columns.index(position) if position else None
+
+    rows = [(row, '|'.join(str(row[idx]) for idx in key_idx)) for row in rows]
+    unique = len({row_key for _, row_key in rows}) == len(rows)
+
+    stored = {} if full or not unique else load_fingerprints(connection, table_name)
+    if not stored:
+        connection.execute(delete(table))
+        connection.execute(delete(RowFingerprintTable).where(RowFingerprintTable.table_name == table_name))
+        current = {}
+    else:
+        # Key values and position of every row in the table, by row key.
+        selected = ', '.join(f'"{name}"' for name in (*keys, position or keys[0]))
+        current = {
+            '|'.join(map(str, values[:-1])): (values[:-1], values[-1])
+            for values in connection.exec_driver_sql(f'SELECT {selected} FROM "{table_name}"')
+        }
+
+    inserts, updates, moves, parked, fingerprints = [], [], [], [], {}
+    for row, row_key in rows:
+        key_values = tuple(row[idx] for idx in key_idx)
+        content = row if position_idx is None else row[:position_idx] + row[position_idx + 1:]
+        fingerprint = fingerprint_row(content)
+        fingerprints[row_key] = fingerprint
+
+        previous = stored.get(row_key)
+        moved = position_idx is not None and row_key in current and current[row_key][1] != row[position_idx]
+        if moved:
+            parked.append(key_values)
+        if previous is None:
+            inserts.append(row)
+        elif previous != fingerprint:
+            updates.append((*row, *key_values))
+        elif moved:
+            moves.append((row[position_idx], *key_values))
+        else:
+            result.unchanged += 1
+
+    deletes = [row_key for row_key in stored if row_key not in fingerprints]
+    removed = [current[row_key][0] for row_key in deletes if row_key in current]
+
+    for batch in _batched(removed, batch_size):
+        connection.exec_driver_sql(delete_sql(table, keys), batch)
+    for batch in _batched(deletes, batch_size):
+        connection.execute(delete(RowFingerprintTable).where(
+            RowFingerprintTable.table_name == table_name,
+            RowFingerprintTable.row_key.in_(batch)
+        ))
+    # Positions are unique, so the rows that move are first parked on negative
+    # positions, where they cannot collide with the ones they take over.
+    for batch in _batched(parked, batch_size):
+        connection.exec_driver_sql(
+            f'UPDATE "{table_name}" SET "{position}" = -"{position}" WHERE {_where(keys)}', batch
+        )
+    for batch in _batched(updates, batch_size):
+        connection.exec_driver_sql(update_sql(table, columns, keys), batch)
+    for batch in _batched(moves, batch_size):
+        connection.exec_driver_sql(update_sql(table, (position,), keys), batch)
+    for batch in _batched(inserts, batch_size):
+        connection.exec_driver_sql(insert_sql(table, columns), batch)
+
+    changed = [
+        {'table_name': table_name, 'row_key': row_key, 'fingerprint': fingerprint}
+        for row_key, fingerprint in fingerprints.items()
+        if unique and stored.get(row_key) != fingerprint
+    ]
+    statement = sqlite_insert(RowFingerprintTable)
+    statement = statement.on_conflict_do_update(
+        index_elements=[RowFingerprintTable.table_name, RowFingerprintTable.row_key],
+        set_={'fingerprint': statement.excluded.fingerprint}
+    )
+    for batch in _batched(changed, batch_size):
+        connection.execute(statement, batch)
+
+    result.inserted = len(inserts)
+    result.updated = len(updates)
+    result.moved = len(moves)
+    result.deleted = len(deletes)
+    return result
@@ -0,0 +1,105 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Callable
+from urllib.parse import quote
+from loguru import logger
+from sqlalchemy import Connection, Engine, create_engine, delete
+from palgen.db.incremental import insert_sql
+from palgen.models.base import Base
+from palgen.models.combiunique_model import COMBI_COLUMNS, CombiUniqueTable, pair_key
+from palgen.models.meta_model import RowFingerprintTable
+from palgen.models.pal_model import PalTable
+
+def table_columns(connection: Connection, table_name: str) -> list[str]:
+    """Returns the column names of a table as it exists in the database."""
+    return [row[1] for row in connection.exec_driver_sql(f'PRAGMA table_info("{table_name}")')]
+
+def normalize_combi_unique(connection: Connection) -> None:
+    """Replaces the JSON `parents` column of `combi_unique` by typed parent columns and a pair key."""
+    if 'parents' not in table_columns(connection, CombiUniqueTable.__tablename__):
+        return
+
+    rows = []
+    for id, parents, child_id in connection.exec_driver_sql('SELECT id, parents, child_id FROM combi_unique ORDER BY id'):
+        parent_a, parent_b = json.loads(parents)
+        rows.append((id, parent_a['tribe'], parent_a['gender'], parent_b['tribe'], parent_b['gender'],
+                     pair_key(parent_a['tribe'], parent_b['tribe']), child_id))
+
+    connection.exec_driver_sql('DROP TABLE combi_unique')
+    CombiUniqueTable.__table__.create(connection)
+    if rows:
+        connection.exec_driver_sql(insert_sql(CombiUniqueTable, COMBI_COLUMNS), rows)
+    # The stored fingerprints were taken over the old layout, so the next sync rewrites the table once.
+    connection.execute(delete(RowFingerprintTable).where(RowFingerprintTable.table_name == CombiUniqueTable.__tablename__))
+    logger.info(f"Migrated {len(rows)} unique combinations to the normalized combi_unique table")
+
+def rekey_fingerprints(connection: Connection) -> None:
+    """Drops the row fingerprints of `pals` and `combi_unique`, which were keyed on row positions."""
+    connection.execute(delete(RowFingerprintTable).where(
+        RowFingerprintTable.table_name.in_((PalTable.__tablename__, CombiUniqueTable.__tablename__))
+    ))
+
+# Migrations applied to a database in order; the one at index `n` upgrades
+# schema version `n` to `n + 1`. The version is kept in `PRAGMA user_version`.
+MIGRATIONS: tuple[Callable[[Connection], None], ...] = (
+    normalize_combi_unique,
+    rekey_fingerprints,
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+def migrate(connection: Connection) -> None:
+    """Upgrades a database built by an older version to the current schema, in place.
+
+    Missing tables are created first. `create_all` only creates the indexes
+    of new tables, so the ones declared on tables that already existed are
+    created here as well. The upgrade runs in the caller's transaction, and
+    a failure leaves the database as it was. Only `generate` upgrades a
+    database (see `create_db_engine`), read paths go through
+    `open_readonly` and `check_schema`.
+    """
+    version = connection.exec_driver_sql('PRAGMA user_version').scalar()
+    if version >= SCHEMA_VERSION:
+        return
+
+    # pysqlite only opens a transaction before DML, so the DDL of a migration
+    # would be committed on its own. With an explicit BEGIN the whole upgrade
+    # commits or rolls back with the caller's transaction.
+    if not connection.connection.driver_connection.in_transaction:
+        connection.exec_driver_sql('BEGIN')
+    # Databases built by older versions may miss tables added since (e.g. `row_fingerprints`).
+    Base.metadata.create_all(connection)
+    for migration in MIGRATIONS[version:]:
+        migration(connection)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+    connection.exec_driver_sql(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    logger.debug(f"Upgraded database schema from version {version} to {SCHEMA_VERSION}")
+
+def open_readonly(database_path: str | Path) -> Engine:
+    """Creates an engine opening a generated database read-only, so reading it can never modify it."""
+    uri = f'file:{quote(str(Path(database_path).resolve()))}?mode=ro'
+    return create_engine('sqlite://', creator=lambda: sqlite3.connect(uri, uri=True))
+
+def check_schema(connection: Connection) -> None:
+    """Raises a ValueError if the database was not built with the current schema.
+
+    Read paths do not upgrade a database in place: other readers (e.g.
+    `palgen serve`) rely on the file not changing under them.
+    """
+    version = connection.exec_driver_sql('PRAGMA user_version').scalar()
+    if version < SCHEMA_VERSION:
+        raise ValueError(f"The database was built by an older version of palgen (schema {version}, "
+                         f"expected {SCHEMA_VERSION}). Run 'palgen generate' to upgrade the database.")
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"The database was built by a newer version of palgen (schema {version}, "
+                         f"expected {SCHEMA_VERSION}).")
+
+def query_plan(connection: Connection, sql: str, params: tuple = ()) -> list[str]:
+    """Returns the steps SQLite takes to run a query (the `detail` column of `EXPLAIN QUERY PLAN`)."""
+    return [row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+def uses_index(plan: list[str], index: str) -> bool:
+    """Checks whether a query plan reads through `index` instead of scanning the table."""
+    return any(f'INDEX {index}' in step for step in plan)
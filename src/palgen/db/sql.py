@@ -1,18 +1,115 @@
 import os
+import sqlite3
+import time
 from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Sequence
 from loguru import logger
-from sqlalchemy import create_engine, delete
+from sqlalchemy import Engine, create_engine, delete, event, select
 from sqlalchemy.orm import sessionmaker
+from palgen.db.incremental import insert_sql, load_source_hashes, store_source_hashes, sync_table
+from palgen.db.schema import SCHEMA_VERSION, migrate
+from palgen.db.versions import store_version
+from palgen.breeding.matrix import BreedingMatrix, BreedingResult, UniqueCombination
 from palgen.models.base import Base
-from palgen.models.pal_model import Pal, PalTable
-from palgen.models.combiunique_model import CombiUniqueModel, CombiUniqueTable
+from palgen.models.breeding_model import BreedingTable
+from palgen.models.meta_model import RowFingerprintTable
+from palgen.models.pal_name_model import PalNameTable
+from palgen.models.pal_model import PAL_COLUMNS, Pal, PalTable
+from palgen.models.combiunique_model import COMBI_COLUMNS, COMBI_KEY, CombiUniqueModel, CombiUniqueTable, pair_key
+from palgen.readers.plan import COMBI_PLAN
+from palgen.readers.source import InputSource
+from palgen.registry import DataTable
+
+@dataclass
+class SQLitePragmas:
+    """SQLite pragmas applied to every connection opened for build-time writes."""
+    journal_mode: str = 'WAL'
+    synchronous: str = 'NORMAL'
+    cache_size: int = -64000 # Negative values are in KiB (-64000 = ~64MB of page cache).
+
+    def apply(self, dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'PRAGMA journal_mode={self.journal_mode}')
+        cursor.execute(f'PRAGMA synchronous={self.synchronous}')
+        cursor.execute(f'PRAGMA cache_size={int(self.cache_size)}')
+        cursor.close()
+
+DATABASE_FILE = 'pals.db'
+
+class BuildCheckError(Exception):
+    """Raised when a database built off to the side fails its integrity check."""
+
+def create_db_engine(output_path: str, pragmas: SQLitePragmas | None = None, file_name: str = DATABASE_FILE) -> Engine:
+    """Creates the engine for `pals.db` and makes sure every table exists with the current schema."""
+    engine = create_engine(f'sqlite:///{output_path}/{file_name}')
+    if pragmas is not None:
+        event.listen(engine, 'connect', pragmas.apply)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        migrate(connection)
+    logger.debug(f"Database created at {output_path}/{file_name}")
+    return engine
+
+def copy_database(source_path: str, target_path: str) -> None:
+    """Copies a database with the SQLite backup API, which reads a consistent snapshot even while it is in use."""
+    source = sqlite3.connect(f'file:{source_path}?mode=ro', uri=True)
+    try:
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
+
+def database_version(path: str) -> int:
+    """Returns the schema version (`PRAGMA user_version`) of a database file."""
+    connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        return connection.execute('PRAGMA user_version').fetchone()[0]
+    finally:
+        connection.close()
+
+def finalize_database(path: str) -> None:
+    """Checks a freshly built database and compacts it into a single self-contained file.
+
+    The journal mode is set back to DELETE, so no `-wal` file belongs to
+    the database and readers opening it with `immutable=1` see every page.
+    """
+    connection = sqlite3.connect(path, isolation_level=None)
+    try:
+        problems = [row[0] for row in connection.execute('PRAGMA integrity_check')]
+        if problems != ['ok']:
+            raise BuildCheckError(f"Integrity check of '{path}' failed: {'; '.join(problems[:5])}")
+        connection.execute('ANALYZE')
+        connection.execute('PRAGMA journal_mode=DELETE')
+        connection.execute('VACUUM')
+    finally:
+        connection.close()
+
+def remove_database(path: str) -> None:
+    """Deletes a database file together with its journal files."""
+    for suffix in ('', '-journal', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+def swap_database(build_path: str, target_path: str) -> None:
+    """Moves a finished database over `target_path` in one atomic rename, durably."""
+    with open(build_path, 'rb') as file:
+        os.fsync(file.fileno())
+    os.replace(build_path, target_path)
+    if hasattr(os, 'O_DIRECTORY'):
+        directory = os.open(os.path.dirname(target_path) or '.', os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
 
 def get_sessionmaker(output_path: str) -> sessionmaker:
     """Creates a new SQLAlchemy sessionmaker."""
-    engine = create_engine(f'sqlite:///{output_path}/pals.db')
-    Base.metadata.create_all(engine)
-    logger.debug(f"Database created at {output_path}/pals.db")
-    return sessionmaker(bind=engine)
+    return sessionmaker(bind=create_db_engine(output_path))
 
 @contextmanager
 def get_db_session(output_path: str):
@@ -35,23 +132,217 @@ def clear_content(session, table):
         session.commit()
         logger.debug(f"Cleared content from table {table.__tablename__}")
 
-def save_pals_to_db(pals: list[Pal], output_path: str) -> None:
-    """Saves a list of Pal objects to the database."""
-    with get_db_session(output_path) as session:
+class DatabaseWriter:
+    """Bulk writer that keeps a single engine and transaction for a whole run.
+
+    Rows are tuples that are handed to the driver in executemany batches,
+    without building an ORM object or a dict per row. Unless `full` is set,
+    tables are synced incrementally: rows are diffed against the fingerprints
+    stored by the previous run and only the differences are written.
+
+    With `atomic` set, the run writes to a copy of `pals.db` next to it
+    instead. Once committed, the copy goes through `finalize_database`
+    (integrity check, ANALYZE, VACUUM) and is renamed over `pals.db`.
+    Readers keep the old file, and never wait on the build's locks, until
+    they reopen it. A failed run only deletes the copy, and so does a run
+    that did not change anything (every stage up to date), so `pals.db`
+    keeps its inode and readers keep their caches.
+    """
 
-        clear_content(session, PalTable)
+    def __init__(self, output_path: str, pragmas: SQLitePragmas | None = None,
+                 batch_size: int = 5000, full: bool = False, atomic: bool = False):
+        self.output_path = output_path
+        self.pragmas = pragmas or SQLitePragmas()
+        self.batch_size = batch_size
+        self.full = full
+        self.atomic = atomic
+        self.database_path = os.path.join(output_path, DATABASE_FILE)
+        self.build_path = self.database_path
+        self.hashes = {}
+        self.engine = None
+        self.connection = None
+        self.transaction = None
+        self.total_rows = 0
+        self.total_seconds = 0.0
+        self.swap_seconds = None
+        self.changed = False # Set once anything is written, migrations included.
 
-        for pal in pals:
-            pal_table = PalTable(**pal.model_dump())
-            session.add(pal_table)
-            logger.debug(f"Saved Pal to DB: {pal.text_name} (Internal Index: {pal.internal_index})")
+    def __enter__(self) -> 'DatabaseWriter':
+        self.changed = not os.path.exists(self.database_path) or database_version(self.database_path) < SCHEMA_VERSION
+        if self.atomic:
+            # The previous content is kept: incremental syncs and stored versions build on it.
+            self.build_path = os.path.join(self.output_path, f'.{DATABASE_FILE}.{os.getpid()}.building')
+            remove_database(self.build_path)
+            if os.path.exists(self.database_path):
+                copy_database(self.database_path, self.build_path)
+        try:
+            self.engine = create_db_engine(self.output_path, self.pragmas, os.path.basename(self.build_path))
+            self.connection = self.engine.connect()
+            self.transaction = self.connection.begin()
+        except BaseException:
+            self.discard()
+            raise
+        return self
 
-def save_unique_combinations_to_db(combinations: list[CombiUniqueModel], output_path: str) -> None:
-    with get_db_session(output_path) as session:
+    def __exit__(self, exc_type, exc, tb) -> None:
+        committed = False
+        try:
+            if exc_type is None:
+                self.transaction.commit()
+                committed = True
+                if self.total_seconds > 0:
+                    logger.info(f"Wrote {self.total_rows} rows in {self.total_seconds:.3f}s "
+                                f"({self.total_rows / self.total_seconds:,.0f} rows/s)")
+            else:
+                self.transaction.rollback()
+                logger.error(f"An error occurred while writing to the database: {exc}")
+        finally:
+            self.connection.close()
+            self.engine.dispose()
+            if not committed:
+                self.discard()
 
-        clear_content(session, CombiUniqueTable)
+        if committed and self.atomic:
+            if self.changed:
+                self.swap()
+            else:
+                self.discard()
+                logger.info(f"Nothing changed, kept '{self.database_path}' as it is")
+
+    def discard(self) -> None:
+        """Deletes the unfinished copy of an atomic build."""
+        if self.atomic:
+            remove_database(self.build_path)
+
+    def swap(self) -> None:
+        """Checks and compacts the committed copy, then renames it over `pals.db`."""
+        start = time.perf_counter()
+        try:
+            finalize_database(self.build_path)
+            swap_database(self.build_path, self.database_path)
+        except BaseException:
+            self.discard()
+            raise
+        self.swap_seconds = time.perf_counter() - start
+        size = os.path.getsize(self.database_path)
+        logger.info(f"Checked, analyzed and swapped the new database into '{self.database_path}' "
+                    f"({size / 1024 / 1024:.2f} MiB) in {self.swap_seconds:.3f}s")
+
+    def replace(self, table, rows: Iterable[tuple], columns: Sequence[str]) -> int:
+        """Replaces the content of `table` with `rows` of `columns` values. Returns the number of rows written."""
+        start = time.perf_counter()
+
+        self.connection.execute(delete(table))
+        self.connection.execute(delete(RowFingerprintTable).where(RowFingerprintTable.table_name == table.__tablename__))
+        logger.debug(f"Cleared content from table {table.__tablename__}")
+
+        count = 0
+        statement = insert_sql(table, columns)
+        rows = iter(rows)
+        while batch := list(islice(rows, self.batch_size)):
+            self.connection.exec_driver_sql(statement, batch)
+            count += len(batch)
+
+        self.changed = True
+        elapsed = time.perf_counter() - start
+        self.total_rows += count
+        self.total_seconds += elapsed
+        rate = count / elapsed if elapsed > 0 else 0
+        logger.debug(f"Saved {count} rows to {table.__tablename__} in {elapsed:.3f}s ({rate:,.0f} rows/s)")
+        return count
+
+    def sync(self, table, rows: Iterable[tuple], columns: Sequence[str], key: str | Sequence[str],
+             position: str | None = None) -> int:
+        """Applies a row-level diff of `rows` of `columns` values to `table`. Returns the number of rows written."""
+        start = time.perf_counter()
+        result = sync_table(self.connection, table, rows, columns, key, position,
+                            full=self.full, batch_size=self.batch_size)
+
+        self.changed = self.changed or result.written > 0
+        elapsed = time.perf_counter() - start
+        self.total_rows += result.written
+        self.total_seconds += elapsed
+        logger.debug(f"Synced {table.__tablename__}: {result.inserted} inserted, {result.updated} updated, "
+                     f"{result.moved} moved, {result.deleted} deleted, {result.unchanged} unchanged in {elapsed:.3f}s")
+        return result.written
+
+    def source_hashes(self, sources: dict[str, tuple[InputSource, str]]) -> dict[str, str]:
+        """Returns the `{source name: content hash}` mapping of the given `{source name: (source, export)}` files.
+
+        Compressed exports are hashed by their decompressed content, so
+        recompressing or archiving the same export does not trigger a rebuild.
+        """
+        hashes = {}
+        for name, (source, file) in sources.items():
+            location = source.describe(file)
+            if location not in self.hashes:
+                self.hashes[location] = source.hash(file)
+            hashes[name] = self.hashes[location]
+        return hashes
+
+    def is_up_to_date(self, table, sources: dict[str, tuple[InputSource, str]]) -> bool:
+        """Checks whether `table` was built from source files with the same content."""
+        if self.full:
+            return False
+        stored = load_source_hashes(self.connection, table.__tablename__)
+        return bool(stored) and stored == self.source_hashes(sources)
+
+    def mark_up_to_date(self, table, sources: dict[str, tuple[InputSource, str]]) -> None:
+        """Records the content hashes of the source files `table` was built from."""
+        store_source_hashes(self.connection, table.__tablename__, self.source_hashes(sources))
+        self.changed = True
+
+    def write_pals(self, rows: Iterable[tuple]) -> int:
+        """Writes localized `PAL_COLUMNS` rows (see `PalReader.read_rows`)."""
+        # `internal_index` is the position of the Pal in the export, so the rows are matched on their class.
+        return self.sync(PalTable, rows, PAL_COLUMNS, key='bp_class', position='internal_index')
+
+    def write_unique_combinations(self, combinations: Iterable[UniqueCombination]) -> int:
+        # Combinations are matched on their parents and genders. Their id is
+        # their position in the DataTable, which orders them but is not kept
+        # when a combination is added or removed before them.
+        rows = (
+            (idx, tribe_a, gender_a, tribe_b, gender_b, pair_key(tribe_a, tribe_b), child_id)
+            for idx, (tribe_a, gender_a, tribe_b, gender_b, child_id) in enumerate(combinations, start=1)
+        )
+        return self.sync(CombiUniqueTable, rows, COMBI_COLUMNS, key=COMBI_KEY, position='id')
+
+    def write_breeding(self, matrix: BreedingMatrix) -> int:
+        return self.replace(BreedingTable, matrix.results(), BreedingResult._fields)
+
+    def write_table(self, datatable: DataTable, rows: Iterable[tuple]) -> int:
+        """Writes the extracted rows of a registered DataTable to its table."""
+        if datatable.key is None:
+            return self.replace(datatable.table, rows, datatable.columns)
+        return self.sync(datatable.table, rows, datatable.columns, datatable.key)
+
+    def write_pal_names(self, names: dict[str, dict[str, str]]) -> int:
+        """Writes the `{locale: {pal_name_<bp_class>: name}}` tables for every Pal in the `pals` table."""
+        bp_classes = self.connection.execute(select(PalTable.bp_class)).scalars().all()
+        rows = (
+            (bp_class, locale, localized[key])
+            for locale, localized in names.items()
+            for bp_class in bp_classes
+            if (key := f'pal_name_{bp_class.lower()}') in localized
+        )
+        return self.replace(PalNameTable, rows, ('bp_class', 'locale', 'name'))
+
+    def write_version(self, label: str) -> int:
+        """Stores the current `pals` and `combi_unique` tables as version `label` (see `store_version`)."""
+        start = time.perf_counter()
+        stored = store_version(self.connection, label)
+        self.changed = True
+        elapsed = time.perf_counter() - start
+        summary = ', '.join(f'{rows} {name} ({added} new)' for name, (rows, added) in stored.items())
+        logger.info(f"Stored version '{label}' in {elapsed:.3f}s: {summary}")
+        return sum(rows for rows, _ in stored.values())
+
+def save_pals_to_db(pals: Iterable[Pal], output_path: str, pragmas: SQLitePragmas | None = None) -> None:
+    """Saves a list of Pal objects to the database."""
+    with DatabaseWriter(output_path, pragmas) as writer:
+        writer.write_pals(tuple(getattr(pal, column) for column in PAL_COLUMNS) for pal in pals)
 
-        for combi in combinations:
-            combi_table = CombiUniqueTable(**combi.model_dump())
-            session.add(combi_table)
-            logger.debug(f"Saved Combi Unique to DB: {combi.child_id} with parents {combi.parents}")
\ No newline at end of file
+def save_unique_combinations_to_db(combinations: Iterable[CombiUniqueModel], output_path: str,
+                                   pragmas: SQLitePragmas | None = None) -> None:
+    with DatabaseWriter(output_path, pragmas) as writer:
+        writer.write_unique_combinations(COMBI_PLAN.dump(combi) for combi in combinations)
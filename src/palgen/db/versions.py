@@ -0,0 +1,154 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+from sqlalchemy import Connection
+from palgen.constants import VERSIONED_TABLE_NAMES
+from palgen.models.combiunique_model import CombiUniqueTable
+from palgen.models.pal_model import PAL_COLUMNS, PalTable
+from palgen.models.version_model import RowContentTable, VersionRowTable, VersionTable
+
+def combination_key(record: dict) -> str:
+    """Identifies a unique combination by its parents (in either order) and their required genders."""
+    parents = sorted((
+        (record['parent_a_tribe'], record['parent_a_gender']),
+        (record['parent_b_tribe'], record['parent_b_gender']),
+    ))
+    return '|'.join(f'{tribe}:{gender}' for tribe, gender in parents)
+
+@dataclass(frozen=True)
+class VersionedTable:
+    """A generated table whose rows are stored with every version."""
+    table: type
+    columns: tuple[str, ...] # Stored columns. Ids assigned per build (e.g. `internal_index`) are left out.
+    key: Callable[[dict], str] # Identity of a row across versions.
+
+VERSIONED_TABLES = dict(zip(VERSIONED_TABLE_NAMES, (
+    VersionedTable(PalTable, PAL_COLUMNS[1:], lambda record: record['bp_class']),
+    VersionedTable(
+        CombiUniqueTable,
+        ('parent_a_tribe', 'parent_a_gender', 'parent_b_tribe', 'parent_b_gender', 'child_id'),
+        combination_key
+    ),
+)))
+
+@dataclass
+class TableDiff:
+    """Rows added, removed and changed in a table between two versions."""
+    added: list[tuple[str, dict]] = field(default_factory=list) # (row key, row)
+    removed: list[tuple[str, dict]] = field(default_factory=list)
+    changed: list[tuple[str, dict[str, tuple]]] = field(default_factory=list) # (row key, {column: (old, new)})
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+def version_id(connection: Connection, label: str) -> int:
+    """Returns the id of a stored version. Raises a KeyError listing the known versions if there is none."""
+    id = connection.exec_driver_sql(f'SELECT id FROM "{VersionTable.__tablename__}" WHERE label = ?', (label,)).scalar()
+    if id is None:
+        labels = connection.exec_driver_sql(f'SELECT label FROM "{VersionTable.__tablename__}" ORDER BY id').scalars().all()
+        raise KeyError(f"Unknown version '{label}'. Stored versions: {', '.join(labels) or 'none'}.")
+    return id
+
+def store_version(connection: Connection, label: str) -> dict[str, tuple[int, int]]:
+    """Stores the current content of the versioned tables as version `label`, replacing it if it exists.
+
+    Rows are stored as their content fingerprint, and every distinct content
+    is kept once in `row_contents`, so a row that is unchanged between
+    versions costs a single `version_rows` entry. Returns `{table: (rows,
+    new contents)}`.
+    """
+    created_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    try:
+        id = version_id(connection, label)
+    except KeyError:
+        id = connection.exec_driver_sql(
+            f'INSERT INTO "{VersionTable.__tablename__}" (label, created_at) VALUES (?, ?)', (label, created_at)
+        ).lastrowid
+    else:
+        connection.exec_driver_sql(f'UPDATE "{VersionTable.__tablename__}" SET created_at = ? WHERE id = ?', (created_at, id))
+        connection.exec_driver_sql(f'DELETE FROM "{VersionRowTable.__tablename__}" WHERE version_id = ?', (id,))
+
+    stored = {}
+    for name, versioned in VERSIONED_TABLES.items():
+        names = ', '.join(f'"{column}"' for column in versioned.columns)
+        contents, fingerprints = {}, {}
+        for values in connection.exec_driver_sql(f'SELECT {names} FROM "{versioned.table.__tablename__}"'):
+            record = dict(zip(versioned.columns, values))
+            data = json.dumps(record, sort_keys=True, separators=(',', ':'))
+            fingerprint = hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+            contents[fingerprint] = data
+            fingerprints[versioned.key(record)] = fingerprint
+
+        added = 0
+        if contents:
+            added = connection.exec_driver_sql(
+                f'INSERT OR IGNORE INTO "{RowContentTable.__tablename__}" (table_name, fingerprint, data) VALUES (?, ?, ?)',
+                [(name, fingerprint, data) for fingerprint, data in contents.items()]
+            ).rowcount
+            connection.exec_driver_sql(
+                f'INSERT INTO "{VersionRowTable.__tablename__}" (version_id, table_name, row_key, fingerprint) VALUES (?, ?, ?, ?)',
+                [(id, name, key, fingerprint) for key, fingerprint in fingerprints.items()]
+            )
+        stored[name] = (len(fingerprints), added)
+
+    # Contents only referenced by the rows a replaced version had.
+    connection.exec_driver_sql(
+        f'DELETE FROM "{RowContentTable.__tablename__}" WHERE NOT EXISTS ('
+        f'SELECT 1 FROM "{VersionRowTable.__tablename__}" AS v '
+        f'WHERE v.table_name = "{RowContentTable.__tablename__}".table_name '
+        f'AND v.fingerprint = "{RowContentTable.__tablename__}".fingerprint)'
+    )
+    return stored
+
+# Rows of one version whose key is missing from the other (`?` = table, version, other version).
+_MISSING_SQL = f'''
+    SELECT a.row_key, c.data
+    FROM "{VersionRowTable.__tablename__}" AS a
+    JOIN "{RowContentTable.__tablename__}" AS c ON c.table_name = a.table_name AND c.fingerprint = a.fingerprint
+    WHERE a.table_name = ? AND a.version_id = ? AND NOT EXISTS (
+        SELECT 1 FROM "{VersionRowTable.__tablename__}" AS b
+        WHERE b.version_id = ? AND b.table_name = a.table_name AND b.row_key = a.row_key
+    )
+    ORDER BY a.row_key
+'''
+
+# Rows present in both versions with a different content (`?` = table, new version, old version).
+_CHANGED_SQL = f'''
+    SELECT new.row_key, old_content.data, new_content.data
+    FROM "{VersionRowTable.__tablename__}" AS new
+    JOIN "{VersionRowTable.__tablename__}" AS old
+        ON old.version_id = ? AND old.table_name = new.table_name AND old.row_key = new.row_key
+    JOIN "{RowContentTable.__tablename__}" AS old_content
+        ON old_content.table_name = old.table_name AND old_content.fingerprint = old.fingerprint
+    JOIN "{RowContentTable.__tablename__}" AS new_content
+        ON new_content.table_name = new.table_name AND new_content.fingerprint = new.fingerprint
+    WHERE new.table_name = ? AND new.version_id = ? AND old.fingerprint != new.fingerprint
+    ORDER BY new.row_key
+'''
+
+def diff_versions(connection: Connection, old: str, new: str, tables: list[str] | None = None) -> dict[str, TableDiff]:
+    """Lists the rows added, removed and changed between two stored versions.
+
+    The versions are compared in SQLite on their row fingerprints through
+    the `version_rows` primary key, so only the rows that differ are
+    loaded (and decoded) at all.
+    """
+    old_id, new_id = version_id(connection, old), version_id(connection, new)
+    diffs = {}
+    for name in tables or VERSIONED_TABLES:
+        diff = TableDiff()
+        for key, data in connection.exec_driver_sql(_MISSING_SQL, (name, new_id, old_id)):
+            diff.added.append((key, json.loads(data)))
+        for key, data in connection.exec_driver_sql(_MISSING_SQL, (name, old_id, new_id)):
+            diff.removed.append((key, json.loads(data)))
+        for key, old_data, new_data in connection.exec_driver_sql(_CHANGED_SQL, (old_id, name, new_id)):
+            before, after = json.loads(old_data), json.loads(new_data)
+            diff.changed.append((key, {
+                column: (before.get(column), after.get(column))
+                for column in sorted(before.keys() | after.keys())
+                if before.get(column) != after.get(column)
+            }))
+        diffs[name] = diff
+    return diffs
@@ -0,0 +1,19 @@
+import sqlalchemy as sa
+from sqlalchemy import Column, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from palgen.models.base import Base
+
+class BreedingTable(Base):
+    """SQLAlchemy table for the precomputed breeding results of every parent pair."""
+    __tablename__ = 'breeding'
+    __table_args__ = (
+        Index('ix_breeding_parents', 'parent_a', 'parent_b'),
+        Index('ix_breeding_child', 'child'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    parent_a: Mapped[str] = mapped_column(sa.String, nullable=False) # Blueprint class of the first parent.
+    parent_b: Mapped[str] = mapped_column(sa.String, nullable=False) # Blueprint class of the second parent.
+    parent_a_gender: Mapped[str] = mapped_column(sa.String, nullable=False) # Required gender (EPalGenderType::None = any).
+    parent_b_gender: Mapped[str] = mapped_column(sa.String, nullable=False)
+    child: Mapped[str] = mapped_column(sa.String, nullable=False) # Blueprint class of the resulting Pal.
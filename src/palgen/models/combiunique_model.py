@@ -1,9 +1,20 @@
 import sqlalchemy as sa
-from sqlalchemy import Column, Integer, JSON
+from sqlalchemy import Column, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 from pydantic import BaseModel, Field, ConfigDict, model_validator
 from palgen.models.base import Base
 
+# Columns of a `combi_unique` row, in the order they are written.
+COMBI_COLUMNS = (
+    'id', 'parent_a_tribe', 'parent_a_gender', 'parent_b_tribe', 'parent_b_gender', 'pair_key', 'child_id',
+)
+# Columns identifying a combination between runs (its parents and their required genders).
+COMBI_KEY = ('parent_a_tribe', 'parent_a_gender', 'parent_b_tribe', 'parent_b_gender')
+
+def pair_key(tribe_a: str, tribe_b: str) -> str:
+    """Returns the canonical key of an unordered pair of parent tribes (the same for A + B and B + A)."""
+    return f'{tribe_a}|{tribe_b}' if tribe_a <= tribe_b else f'{tribe_b}|{tribe_a}'
+
 class CombiUniqueModel(BaseModel):
     """Model for Combi Unique data."""
     model_config = ConfigDict(extra="ignore")
@@ -24,14 +35,30 @@ class CombiUniqueModel(BaseModel):
                 'gender': data.get('ParentGenderB', '')
             }
 
-            data['parents'] = [parent_a, parent_b]
+            # Build a new dict instead of mutating the row that was passed in.
+            return {**data, 'parents': [parent_a, parent_b]}
 
         return data
 
 class CombiUniqueTable(Base):
     """SQLAlchemy table for Combi Unique data."""
     __tablename__ = 'combi_unique'
+    __table_args__ = (
+        # Covering index for "is (A, B) a unique pair, and what does it give".
+        Index('ix_combi_unique_pair', 'pair_key', 'child_id'),
+        # "Which unique combinations involve tribe X" (one index per side, merged by SQLite for an OR).
+        Index('ix_combi_unique_parent_a', 'parent_a_tribe', 'child_id'),
+        Index('ix_combi_unique_parent_b', 'parent_b_tribe', 'child_id'),
+        Index('ix_combi_unique_child', 'child_id'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    parents: Mapped[list[dict[str, str]]] = mapped_column(JSON, nullable=False)
-    child_id: Mapped[str] = mapped_column(sa.String, nullable=False)
\ No newline at end of file
+
+    """Parents"""
+    parent_a_tribe: Mapped[str] = mapped_column(sa.String, nullable=False) # Tribe of the first parent (e.g. EPalTribeID::PinkCat).
+    parent_a_gender: Mapped[str] = mapped_column(sa.String, nullable=False) # Required gender (EPalGenderType::None = any).
+    parent_b_tribe: Mapped[str] = mapped_column(sa.String, nullable=False)
+    parent_b_gender: Mapped[str] = mapped_column(sa.String, nullable=False)
+    pair_key: Mapped[str] = mapped_column(sa.String, nullable=False) # Order-independent key of the parent tribes (see `pair_key`).
+
+    child_id: Mapped[str] = mapped_column(sa.String, nullable=False)
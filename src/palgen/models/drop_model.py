@@ -0,0 +1,37 @@
+import sqlalchemy as sa
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
+from pydantic import BaseModel, Field, ConfigDict
+from palgen.models.base import Base
+
+class PalDrop(BaseModel):
+    """Model for a single item slot of a Pal's drop table.
+
+    `DT_PalDropItem` repeats the item fields for every slot (`ItemId1`,
+    `ItemId2`, ...); `{n}` in an alias stands for the slot number.
+    """
+    model_config = ConfigDict(extra="ignore")
+
+    character_id: str = Field(..., alias="CharacterID") # Character the drops belong to (e.g. SheepBall).
+    level: int = Field(..., alias="Level") # Minimum level of the character for this drop table.
+    item_id: str = Field(..., alias="ItemId{n}") # Dropped item (e.g. Wool).
+    rate: float = Field(..., alias="Rate{n}") # Drop chance in percent.
+    min: int = Field(..., alias="min{n}")
+    max: int = Field(..., alias="Max{n}")
+
+class PalDropTable(Base):
+    """SQLAlchemy table for Pal drops, one row per dropped item."""
+    __tablename__ = 'pal_drops'
+    __table_args__ = (
+        Index('ix_pal_drops_character', 'character_id'),
+        Index('ix_pal_drops_item', 'item_id'),
+    )
+
+    id: Mapped[str] = mapped_column(sa.String, primary_key=True) # Row name in DT_PalDropItem.
+    slot: Mapped[int] = mapped_column(sa.Integer, primary_key=True) # Item slot within the row (1-based).
+    character_id: Mapped[str] = mapped_column(sa.String, nullable=False)
+    level: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    item_id: Mapped[str] = mapped_column(sa.String, nullable=False)
+    rate: Mapped[float] = mapped_column(sa.Float, nullable=False)
+    min: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    max: Mapped[int] = mapped_column(sa.Integer, nullable=False)
@@ -0,0 +1,29 @@
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+from pydantic import BaseModel, Field, ConfigDict
+from palgen.models.base import Base
+
+class Item(BaseModel):
+    """Model for item data."""
+    model_config = ConfigDict(extra="ignore")
+
+    type_a: str = Field(..., alias="TypeA") # Main item type (e.g. EPalItemTypeA::Material).
+    type_b: str = Field(..., alias="TypeB") # Item sub-type (e.g. EPalItemTypeB::MaterialOre).
+    rank: int = Field(..., alias="Rank")
+    rarity: int = Field(..., alias="Rarity")
+    price: int = Field(..., alias="Price") # Base trade price in gold.
+    max_stack_count: int = Field(..., alias="MaxStackCount")
+    weight: float = Field(..., alias="Weight")
+
+class ItemTable(Base):
+    """SQLAlchemy table for item data."""
+    __tablename__ = 'items'
+
+    id: Mapped[str] = mapped_column(sa.String, primary_key=True) # Row name in DT_ItemDataTable (e.g. Wool).
+    type_a: Mapped[str] = mapped_column(sa.String, nullable=False)
+    type_b: Mapped[str] = mapped_column(sa.String, nullable=False)
+    rank: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    rarity: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    price: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    max_stack_count: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    weight: Mapped[float] = mapped_column(sa.Float, nullable=False)
@@ -0,0 +1,19 @@
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+from palgen.models.base import Base
+
+class SourceFileTable(Base):
+    """SQLAlchemy table recording the content hash of every source file a table was built from."""
+    __tablename__ = 'source_files'
+
+    table_name: Mapped[str] = mapped_column(sa.String, primary_key=True) # Table built from the source (e.g. pals).
+    source: Mapped[str] = mapped_column(sa.String, primary_key=True) # Source file name (e.g. DT_PalMonsterParameter.json).
+    content_hash: Mapped[str] = mapped_column(sa.String, nullable=False)
+
+class RowFingerprintTable(Base):
+    """SQLAlchemy table holding a fingerprint of every row written to a generated table."""
+    __tablename__ = 'row_fingerprints'
+
+    table_name: Mapped[str] = mapped_column(sa.String, primary_key=True)
+    row_key: Mapped[str] = mapped_column(sa.String, primary_key=True) # Primary key of the row, as text.
+    fingerprint: Mapped[str] = mapped_column(sa.String, nullable=False)
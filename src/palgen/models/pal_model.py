@@ -1,9 +1,24 @@
 from typing import Optional
 import sqlalchemy as sa
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped, mapped_column
 from pydantic import BaseModel, Field, ConfigDict
 from palgen.models.base import Base
 
+# Names of the work suitability fields, in game order.
+WORK_SUITABILITIES = (
+    'kindling', 'watering', 'planting', 'electricity', 'handiwork', 'gathering', 'lumbering',
+    'mining', 'oil_extract', 'medicine', 'cooling', 'transport', 'ranching',
+)
+
+# Fields read from `DT_PalMonsterParameter`, in the order of a batch-parsed Pal row.
+PAL_FIELDS = (
+    'bp_class', 'tribe', 'genus', 'zukan_index', 'variant', 'size', 'rarity',
+    'element1', 'element2', 'combirank', *WORK_SUITABILITIES,
+)
+# Columns of a localized Pal row, as written to the `pals` table.
+PAL_COLUMNS = ('internal_index', 'text_name', *PAL_FIELDS)
+
 class Pal(BaseModel):
     """Model for Pal data."""
     model_config = ConfigDict(extra="ignore")
@@ -50,6 +65,12 @@ class Pal(BaseModel):
 class PalTable(Base):
     """SQLAlchemy table for Pal data."""
     __tablename__ = 'pals'
+    __table_args__ = (
+        Index('ix_pals_bp_class', 'bp_class'),
+        # Covering indexes for the lookups done while breeding (tribe -> Pal, rank -> Pal).
+        Index('ix_pals_tribe', 'tribe', 'bp_class'),
+        Index('ix_pals_combirank', 'combirank', 'bp_class'),
+    )
 
     internal_index: Mapped[int] = mapped_column(primary_key=True)
     bp_class: Mapped[str] = mapped_column(sa.String, nullable=False)
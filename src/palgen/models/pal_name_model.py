@@ -0,0 +1,15 @@
+import sqlalchemy as sa
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
+from palgen.models.base import Base
+
+class PalNameTable(Base):
+    """SQLAlchemy table for the localized names of every Pal, one row per locale."""
+    __tablename__ = 'pal_names'
+    __table_args__ = (
+        Index('ix_pal_names_locale', 'locale', 'bp_class'),
+    )
+
+    bp_class: Mapped[str] = mapped_column(sa.String, primary_key=True) # Blueprint class of the Pal (e.g. LizardMan).
+    locale: Mapped[str] = mapped_column(sa.String, primary_key=True) # Locale folder name under L10N (e.g. en, ja, zh-Hans).
+    name: Mapped[str] = mapped_column(sa.String, nullable=False)
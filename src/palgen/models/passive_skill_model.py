@@ -0,0 +1,33 @@
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+from pydantic import BaseModel, Field, ConfigDict
+from palgen.models.base import Base
+
+class PassiveSkill(BaseModel):
+    """Model for passive skill data."""
+    model_config = ConfigDict(extra="ignore")
+
+    rank: int = Field(..., alias="Rank") # Rank of the passive skill (negative ranks are bad traits).
+
+    """Effects"""
+    effect_type1: str = Field(..., alias="EffectType1") # e.g. EPalPassiveSkillEffectType::ShotAttack.
+    effect_value1: float = Field(..., alias="EffectValue1") # Percentage applied by the effect (e.g. 20.0).
+    effect_type2: str = Field(..., alias="EffectType2")
+    effect_value2: float = Field(..., alias="EffectValue2")
+    effect_type3: str = Field(..., alias="EffectType3")
+    effect_value3: float = Field(..., alias="EffectValue3")
+
+class PassiveSkillTable(Base):
+    """SQLAlchemy table for passive skill data."""
+    __tablename__ = 'passive_skills'
+
+    id: Mapped[str] = mapped_column(sa.String, primary_key=True) # Row name in DT_PassiveSkill_Main (e.g. Legend).
+    rank: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+
+    """Effects"""
+    effect_type1: Mapped[str] = mapped_column(sa.String, nullable=False)
+    effect_value1: Mapped[float] = mapped_column(sa.Float, nullable=False)
+    effect_type2: Mapped[str] = mapped_column(sa.String, nullable=False)
+    effect_value2: Mapped[float] = mapped_column(sa.Float, nullable=False)
+    effect_type3: Mapped[str] = mapped_column(sa.String, nullable=False)
+    effect_value3: Mapped[float] = mapped_column(sa.Float, nullable=False)
@@ -0,0 +1,29 @@
+import sqlalchemy as sa
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
+from pydantic import BaseModel, Field, ConfigDict
+from palgen.models.base import Base
+
+class Skill(BaseModel):
+    """Model for active skill (Waza) data."""
+    model_config = ConfigDict(extra="ignore")
+
+    waza_type: str = Field(..., alias="WazaType") # Identifier of the skill (e.g. EPalWazaID::FireBall).
+    element: str = Field(..., alias="Element") # Element of the skill (e.g. EPalElementType::Fire).
+    category: str = Field(..., alias="Category") # Category of the skill (e.g. EPalWazaCategory::Shot).
+    power: int = Field(..., alias="Power")
+    cool_time: float = Field(..., alias="CoolTime") # Cooldown of the skill in seconds.
+
+class SkillTable(Base):
+    """SQLAlchemy table for active skill (Waza) data."""
+    __tablename__ = 'skills'
+    __table_args__ = (
+        Index('ix_skills_element', 'element'),
+    )
+
+    id: Mapped[str] = mapped_column(sa.String, primary_key=True) # Row name in DT_WazaDataTable.
+    waza_type: Mapped[str] = mapped_column(sa.String, nullable=False)
+    element: Mapped[str] = mapped_column(sa.String, nullable=False)
+    category: Mapped[str] = mapped_column(sa.String, nullable=False)
+    power: Mapped[int] = mapped_column(sa.Integer, nullable=False)
+    cool_time: Mapped[float] = mapped_column(sa.Float, nullable=False)
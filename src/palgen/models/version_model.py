@@ -0,0 +1,32 @@
+import sqlalchemy as sa
+from sqlalchemy import Index
+from sqlalchemy.orm import Mapped, mapped_column
+from palgen.models.base import Base
+
+class VersionTable(Base):
+    """SQLAlchemy table of the dataset versions stored with `generate --version`."""
+    __tablename__ = 'versions'
+
+    id: Mapped[int] = mapped_column(sa.Integer, primary_key=True, autoincrement=True)
+    label: Mapped[str] = mapped_column(sa.String, nullable=False, unique=True) # Label given on the command line (e.g. v0.3.1).
+    created_at: Mapped[str] = mapped_column(sa.String, nullable=False) # UTC time of the build, in ISO 8601.
+
+class RowContentTable(Base):
+    """SQLAlchemy table holding every distinct row content of the versioned tables, once."""
+    __tablename__ = 'row_contents'
+
+    table_name: Mapped[str] = mapped_column(sa.String, primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(sa.String, primary_key=True) # Hash of `data`.
+    data: Mapped[str] = mapped_column(sa.Text, nullable=False) # The row as a JSON object.
+
+class VersionRowTable(Base):
+    """SQLAlchemy table mapping the rows of every version to their content."""
+    __tablename__ = 'version_rows'
+    __table_args__ = (
+        Index('ix_version_rows_content', 'table_name', 'fingerprint'),
+    )
+
+    version_id: Mapped[int] = mapped_column(sa.Integer, primary_key=True)
+    table_name: Mapped[str] = mapped_column(sa.String, primary_key=True)
+    row_key: Mapped[str] = mapped_column(sa.String, primary_key=True) # Identity of the row across versions (e.g. bp_class).
+    fingerprint: Mapped[str] = mapped_column(sa.String, nullable=False)
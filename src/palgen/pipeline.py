@@ -0,0 +1,394 @@
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass
+from loguru import logger
+from palgen.breeding.matrix import BreedingMatrix, UniqueCombination
+from palgen.constants import PAL_INFO, PAL_NAME, UNIQUE_BREEDING
+from palgen.db.sql import DatabaseWriter, SQLitePragmas, create_db_engine
+from palgen.logger import setup_logging
+from palgen.models.breeding_model import BreedingTable
+from palgen.models.combiunique_model import CombiUniqueTable
+from palgen.models.pal_model import PalTable
+from palgen.models.pal_name_model import PalNameTable
+from palgen.readers.cache import RowCache
+from palgen.readers.localization_reader import LocalizationReader, discover_locales
+from palgen.readers.pal_reader import PalReader
+from palgen.readers.source import InputSource
+from palgen.registry import DATA_TABLES, EXTRA_TABLES
+from palgen.snapshot import SNAPSHOT_FILE, VERSION as SNAPSHOT_VERSION, snapshot_version, write_snapshot_from_connection
+
+# Stages of the generate pipeline, in the order they are written.
+# `pal_names` only runs when an L10N tree is given, and the extra
+# DataTables of the registry only when asked for.
+STAGES = ('pals', 'combi_unique', 'breeding', 'pal_names', *EXTRA_TABLES)
+
+@dataclass
+class StageStats:
+    """What a pipeline stage took. `peak_bytes` is only measured while profiling."""
+    seconds: float = 0.0
+    rows: int | None = None
+    peak_bytes: int | None = None
+
+# `[start bytes, peak bytes]` of the measurements in progress in this process,
+# innermost last. tracemalloc has a single peak counter, so nested measurements
+# hand their peak up to the enclosing one before resetting it.
+_frames = []
+
+@contextmanager
+def measure():
+    """Measures the wall-clock time, and the peak traced memory if tracemalloc is running, of a block."""
+    stats = StageStats()
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        if _frames:
+            _frames[-1][1] = max(_frames[-1][1], peak)
+        tracemalloc.reset_peak()
+        frame = [current, current]
+        _frames.append(frame)
+
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.seconds = time.perf_counter() - start
+        if tracing:
+            _frames.pop()
+            peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+            stats.peak_bytes = peak - frame[0]
+            if _frames:
+                _frames[-1][1] = max(_frames[-1][1], peak)
+
+def init_worker(log_level: str, trace_memory: bool) -> None:
+    setup_logging(log_level)
+    if trace_memory:
+        tracemalloc.start()
+
+# Parse tasks. These run in worker processes, so they have to be module-level
+# functions taking and returning picklable values. Parsed rows go through the
+# row cache when one is given.
+
+def parse_locale(locale: str, source: InputSource, cache: RowCache | None = None) -> dict:
+    reader = LocalizationReader(source, locale=locale)
+    if cache is None:
+        return reader.read()
+    return cache.get_or_parse(source.identity(PAL_NAME), f'localization {locale}', reader.read)
+
+def parse_localization(source: InputSource, cache: RowCache | None = None) -> dict:
+    return parse_locale('en', source, cache)
+
+def parse_table(name: str, source: InputSource, cache: RowCache | None = None) -> list[tuple]:
+    return DATA_TABLES[name].read(source, cache)
+
+def parse_unique_combinations(source: InputSource, cache: RowCache | None = None) -> list[UniqueCombination]:
+    return [UniqueCombination._make(row) for row in parse_table('combi_unique', source, cache)]
+
+def run_task(task, *args, close: bool = False) -> tuple[object, StageStats]:
+    """Runs a parse task and returns its result together with what it took inside the worker.
+
+    With `close` set, the sources passed to the task are closed once it is
+    done (in a worker process, they are copies only the task uses).
+    """
+    with ExitStack() as stack:
+        if close:
+            for arg in args:
+                if isinstance(arg, InputSource):
+                    stack.enter_context(arg)
+        with measure() as stats:
+            result = task(*args)
+    stats.rows = len(result)
+    return result, stats
+
+class InlineExecutor(Executor):
+    """Executor running every task immediately in the calling process (used for `--jobs 1`)."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+class StageTimer:
+    """Collects the wall-clock time of every pipeline stage.
+
+    With `profile` set, tracemalloc runs for the whole pipeline and the peak
+    memory of every stage is collected as well. Stages can report how many
+    rows they processed through the yielded `StageStats`.
+    """
+
+    def __init__(self, profile: bool = False):
+        self.profile = profile
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        with measure() as stats:
+            yield stats
+        self.record(name, stats)
+
+    def record(self, name: str, stats: StageStats) -> None:
+        total = self.stages.setdefault(name, StageStats())
+        total.seconds += stats.seconds
+        if stats.rows is not None:
+            total.rows = (total.rows or 0) + stats.rows
+        if stats.peak_bytes is not None:
+            total.peak_bytes = max(total.peak_bytes or 0, stats.peak_bytes)
+
+    def report(self) -> None:
+        if not self.stages:
+            return
+        width = max(len(name) for name in self.stages)
+        logger.info("Stage timings:")
+        for name, stats in self.stages.items():
+            line = f"  {name:<{width}}  {stats.seconds:8.3f}s"
+            if stats.rows is not None:
+                line += f"  {stats.rows:>9} rows"
+            if stats.peak_bytes is not None:
+                line += f"  peak {stats.peak_bytes / 1024 / 1024:8.2f} MiB"
+            logger.info(line)
+
+    def write_report(self, path: str, **extra) -> None:
+        """Writes the collected stage statistics as a JSON report, under `stages` next to the `extra` fields."""
+        report = {
+            **extra,
+            'stages': {
+                name: {**asdict(stats), 'rows_per_second': stats.rows / stats.seconds if stats.rows and stats.seconds else None}
+                for name, stats in self.stages.items()
+            },
+        }
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+class GeneratePipeline:
+    """Orchestrates `palgen generate`.
+
+    The independent source files are parsed concurrently in a process pool,
+    since JSON decoding and validation are CPU-bound. Their results
+    are then funnelled into a single writer stage that owns the database
+    connection. Stages whose sources are unchanged are not parsed at all,
+    and with a `RowCache` the sources that are parsed again (e.g. for
+    `full` rebuilds) are loaded pre-decoded when the file did not change.
+
+    The database is built off to the side and swapped into place once
+    checked (see `DatabaseWriter`), unless `atomic` is unset, so services
+    reading `pals.db` keep the previous build until the new one is complete.
+
+    With a `version` label, the resulting `pals` and `combi_unique` tables
+    are also stored as that version of the dataset (see `palgen diff`).
+
+    `input_path` and `l10n_path` may be directories or zip/tar archives of
+    the exports (see `InputSource`).
+
+    With `profile` set, every stage is also measured for peak memory and a
+    JSON report is written to `profile_report`. `profile_stats` additionally
+    captures cProfile stats of the main process (parse tasks running in
+    worker processes are not included, use `jobs=1` to profile them).
+    """
+
+    def __init__(self, input_path: str, output_path: str, stages: list[str] | None = None, jobs: int = 1,
+                 pragmas: SQLitePragmas | None = None, full: bool = False, log_level: str = 'INFO',
+                 l10n_path: str | None = None, snapshot: bool = False, profile: bool = False,
+                 profile_report: str | None = None, profile_stats: str | None = None, cache: RowCache | None = None,
+                 version: str | None = None, atomic: bool = True):
+        self.input_path = input_path
+        self.source = InputSource.from_path(input_path)
+        self.output_path = output_path
+        self.locales = discover_locales(l10n_path) if l10n_path else {}
+        self.stages = stages or [stage for stage in STAGES[:4] if stage != 'pal_names' or self.locales]
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self.pragmas = pragmas
+        self.full = full
+        self.log_level = log_level
+        self.snapshot = snapshot
+        self.profile = profile or profile_stats is not None
+        self.profile_report = profile_report or f'{output_path}/profile.json'
+        self.profile_stats = profile_stats
+        self.cache = cache
+        self.version = version
+        self.atomic = atomic
+        self.timer = StageTimer(self.profile)
+
+    def sources(self, stage: str) -> dict[str, tuple[InputSource, str]]:
+        """Returns the `{source name: (source, export)}` files a stage is built from."""
+        if stage == 'pal_names':
+            locale_files = {f'{locale}/{PAL_NAME}': (source, PAL_NAME) for locale, source in self.locales.items()}
+            return self.sources('pals') | locale_files
+
+        if stage in EXTRA_TABLES:
+            return {DATA_TABLES[stage].file: (self.source, DATA_TABLES[stage].file)}
+
+        files = {
+            'pals': [PAL_INFO, PAL_NAME],
+            'combi_unique': [UNIQUE_BREEDING],
+            'breeding': [PAL_INFO, PAL_NAME, UNIQUE_BREEDING],
+        }[stage]
+        return {file: (self.source, file) for file in files}
+
+    @staticmethod
+    def table(stage: str):
+        if stage in EXTRA_TABLES:
+            return DATA_TABLES[stage].table
+        return {
+            'pals': PalTable,
+            'combi_unique': CombiUniqueTable,
+            'breeding': BreedingTable,
+            'pal_names': PalNameTable,
+        }[stage]
+
+    def executor(self, tasks: int) -> Executor:
+        workers = min(self.jobs, tasks)
+        if workers <= 1:
+            return InlineExecutor()
+        return ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(self.log_level, self.profile))
+
+    def run(self) -> None:
+        profiler = cProfile.Profile() if self.profile_stats else None
+        if self.profile:
+            tracemalloc.start()
+        try:
+            if profiler:
+                profiler.enable()
+            with self.timer.stage('total'):
+                self.build()
+        finally:
+            self.close()
+            if profiler:
+                profiler.disable()
+                profiler.dump_stats(self.profile_stats)
+                logger.info(f"Wrote cProfile stats to '{self.profile_stats}'")
+            if self.profile:
+                tracemalloc.stop()
+
+        self.timer.report()
+        if self.profile:
+            self.timer.write_report(self.profile_report, jobs=self.jobs, full=self.full, selected_stages=self.stages)
+            logger.info(f"Wrote profile report to '{self.profile_report}'")
+
+    def close(self) -> None:
+        """Closes the input and localization sources (archives are reopened if the pipeline runs again)."""
+        for source in (self.source, *self.locales.values()):
+            source.close()
+
+    def build(self) -> None:
+        with DatabaseWriter(self.output_path, self.pragmas, full=self.full, atomic=self.atomic) as writer:
+            pending = {
+                stage for stage in self.stages
+                if not writer.is_up_to_date(self.table(stage), self.sources(stage))
+            }
+            for stage in self.stages:
+                if stage not in pending:
+                    logger.info(f"Sources of '{stage}' are unchanged, skipping.")
+
+            results = self.parse(pending)
+
+            if 'pals' in results:
+                with self.timer.stage('write pals') as stats:
+                    stats.rows = len(results['pals'])
+                    writer.write_pals(results['pals'])
+                    writer.mark_up_to_date(PalTable, self.sources('pals'))
+                logger.info(f"Pal database generated successfully at '{self.output_path}/pals.db'")
+
+            if 'combi_unique' in results:
+                with self.timer.stage('write combi_unique') as stats:
+                    stats.rows = len(results['combi_unique'])
+                    writer.write_unique_combinations(results['combi_unique'])
+                    writer.mark_up_to_date(CombiUniqueTable, self.sources('combi_unique'))
+                logger.info(f"Combi Unique database generated successfully at '{self.output_path}/pals.db'")
+
+            if 'breeding' in pending:
+                with self.timer.stage('breeding') as stats:
+                    # Computed from the tables written above, inside the same transaction.
+                    matrix = BreedingMatrix.from_connection(writer.connection)
+                    count = stats.rows = writer.write_breeding(matrix)
+                    writer.mark_up_to_date(BreedingTable, self.sources('breeding'))
+                logger.info(f"Computed {count} breeding results for {len(matrix)} Pals")
+
+            if 'pal_names' in results:
+                with self.timer.stage('write pal_names') as stats:
+                    count = stats.rows = writer.write_pal_names(results['pal_names'])
+                    writer.mark_up_to_date(PalNameTable, self.sources('pal_names'))
+                logger.info(f"Wrote {count} localized names for {len(results['pal_names'])} locales")
+
+            for stage in EXTRA_TABLES:
+                if stage not in results:
+                    continue
+                datatable = DATA_TABLES[stage]
+                with self.timer.stage(f'write {stage}') as stats:
+                    stats.rows = len(results[stage])
+                    writer.write_table(datatable, results[stage])
+                    writer.mark_up_to_date(datatable.table, self.sources(stage))
+                logger.info(f"Wrote {len(results[stage])} rows to '{stage}' from {datatable.file}")
+
+            if self.version:
+                with self.timer.stage('store version') as stats:
+                    stats.rows = writer.write_version(self.version)
+
+        if writer.swap_seconds is not None:
+            self.timer.record('check and swap', StageStats(writer.swap_seconds))
+
+        snapshot_path = f'{self.output_path}/{SNAPSHOT_FILE}'
+        if self.snapshot and ('pals' in results or not os.path.exists(snapshot_path)
+                              or snapshot_version(snapshot_path) != SNAPSHOT_VERSION):
+            with self.timer.stage('snapshot') as stats:
+                stats.rows = self.write_snapshot(snapshot_path)
+
+    def write_snapshot(self, path: str) -> int:
+        """Writes the committed `pals` table to the memory-mappable snapshot file."""
+        engine = create_db_engine(self.output_path)
+        try:
+            with engine.connect() as connection:
+                count = write_snapshot_from_connection(connection, path)
+        finally:
+            engine.dispose()
+        logger.info(f"Wrote snapshot of {count} Pals to '{path}'")
+        return count
+
+    def parse(self, stages: set[str]) -> dict[str, list]:
+        """Parses the sources of the given stages concurrently and returns their rows."""
+        tasks = {}
+        if 'pals' in stages:
+            tasks['localization'] = (parse_localization, self.source, self.cache)
+            tasks['pal candidates'] = (parse_table, 'pals', self.source, self.cache)
+        if 'combi_unique' in stages:
+            tasks['combi_unique'] = (parse_unique_combinations, self.source, self.cache)
+        if 'pal_names' in stages:
+            for locale, source in self.locales.items():
+                tasks[f'locale {locale}'] = (parse_locale, locale, source, self.cache)
+        for stage in EXTRA_TABLES:
+            if stage in stages:
+                tasks[stage] = (parse_table, stage, self.source, self.cache)
+        if not tasks:
+            return {}
+
+        with self.timer.stage('parse (wall)'):
+            with self.executor(len(tasks)) as executor:
+                close = not isinstance(executor, InlineExecutor)
+                futures = {name: executor.submit(run_task, *task, close=close) for name, task in tasks.items()}
+                parsed = {}
+                for name, future in futures.items():
+                    parsed[name], stats = future.result()
+                    self.timer.record(f'parse {name}', stats)
+
+        results = {}
+        if 'pals' in stages:
+            with self.timer.stage('join localization') as stats:
+                reader = PalReader(self.source, names=parsed['localization'])
+                results['pals'] = reader.read_rows(parsed['pal candidates'])
+                stats.rows = len(results['pals'])
+            logger.info(f"Read {len(results['pals'])} Pal objects from '{self.input_path}'")
+        if 'combi_unique' in stages:
+            results['combi_unique'] = parsed['combi_unique']
+            logger.info(f"Read {len(results['combi_unique'])} unique combinations from '{self.input_path}'")
+        if 'pal_names' in stages:
+            results['pal_names'] = {locale: parsed[f'locale {locale}'] for locale in self.locales}
+        for stage in EXTRA_TABLES:
+            if stage in stages:
+                results[stage] = parsed[stage]
+        return results
@@ -0,0 +1,177 @@
+from functools import lru_cache
+from typing import Iterable
+from sqlalchemy import Connection, select
+from palgen.db.schema import check_schema, open_readonly
+from palgen.models.combiunique_model import CombiUniqueTable
+from palgen.models.pal_model import WORK_SUITABILITIES, PalTable
+
+# Enum prefixes used by the game data, so filters can be written as `element='Fire'`.
+PREFIXES = {
+    'tribe': 'EPalTribeID::',
+    'element': 'EPalElementType::',
+    'genus': 'EPalGenusType::',
+    'size': 'EPalSizeType::',
+}
+
+class PalRecord:
+    """Compact, read-only record of a row of the `pals` table."""
+    __slots__ = (
+        'internal_index', 'bp_class', 'text_name', 'tribe', 'genus', 'zukan_index', 'variant',
+        'size', 'rarity', 'element1', 'element2', 'combirank', *WORK_SUITABILITIES,
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values[name])
+
+    def __repr__(self) -> str:
+        return f'PalRecord(bp_class={self.bp_class!r}, internal_index={self.internal_index})'
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class CombiRecord:
+    """Compact, read-only record of a row of the `combi_unique` table."""
+    __slots__ = ('id', 'parent_a_tribe', 'parent_a_gender', 'parent_b_tribe', 'parent_b_gender', 'child_id')
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values[name])
+
+    def __repr__(self) -> str:
+        return f'CombiRecord({self.parent_a_tribe} + {self.parent_b_tribe} -> {self.child_id})'
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+def normalize(field: str, value: str) -> str:
+    """Adds the game's enum prefix to a filter value if it was left out (e.g. Fire -> EPalElementType::Fire)."""
+    prefix = PREFIXES.get(field)
+    if prefix and '::' not in value:
+        return f'{prefix}{value}'
+    return value
+
+class PalQuery:
+    """In-memory, indexed query layer over the generated `pals` and `combi_unique` tables.
+
+    Both tables are loaded once into `__slots__` records. Secondary indexes map
+    `bp_class`, `tribe`, `genus`, `size`, either element, and every
+    work-suitability level to the set of matching Pals, so a multi-predicate
+    `filter` is answered by intersecting sets (smallest first) instead of
+    scanning rows. Results of hot queries are kept in an LRU cache.
+    """
+
+    def __init__(self, pals: Iterable[PalRecord], combinations: Iterable[CombiRecord] = (), cache_size: int = 256):
+        self.pals = {pal.internal_index: pal for pal in sorted(pals, key=lambda pal: pal.internal_index)}
+        self.combinations = list(combinations)
+        self.by_bp_class = {pal.bp_class: pal for pal in self.pals.values()}
+
+        self.indexes = {field: {} for field in ('bp_class', 'tribe', 'genus', 'size', 'element')}
+        # `work[name][level]` holds the Pals with *at least* that level.
+        self.work = {name: [] for name in WORK_SUITABILITIES}
+
+        for idx, pal in self.pals.items():
+            for field in ('bp_class', 'tribe', 'genus', 'size'):
+                self.indexes[field].setdefault(getattr(pal, field), set()).add(idx)
+            for element in {pal.element1, pal.element2}:
+                if element:
+                    self.indexes['element'].setdefault(element, set()).add(idx)
+            for name in WORK_SUITABILITIES:
+                levels = self.work[name]
+                level = getattr(pal, name)
+                while len(levels) <= level:
+                    levels.append(set())
+                for at_least in range(level + 1):
+                    levels[at_least].add(idx)
+
+        self.combis_by_tribe = {}
+        self.combis_by_child = {}
+        for combi in self.combinations:
+            for tribe in {combi.parent_a_tribe, combi.parent_b_tribe}:
+                self.combis_by_tribe.setdefault(tribe, []).append(combi)
+            self.combis_by_child.setdefault(combi.child_id, []).append(combi)
+
+        self._filter = lru_cache(maxsize=cache_size)(self._filter_uncached)
+
+    @classmethod
+    def from_connection(cls, connection: Connection, cache_size: int = 256) -> 'PalQuery':
+        """Loads the `pals` and `combi_unique` tables through an open connection."""
+        pals = connection.execute(select(*(getattr(PalTable, name) for name in PalRecord.__slots__))).mappings()
+        combinations = connection.execute(
+            select(*(getattr(CombiUniqueTable, name) for name in CombiRecord.__slots__))
+        ).mappings()
+        return cls((PalRecord(**row) for row in pals), (CombiRecord(**row) for row in combinations), cache_size)
+
+    @classmethod
+    def from_database(cls, database_path: str, cache_size: int = 256) -> 'PalQuery':
+        """Loads a generated `pals.db` file, which has to have the current schema (see `check_schema`)."""
+        engine = open_readonly(database_path)
+        try:
+            with engine.connect() as connection:
+                check_schema(connection)
+                return cls.from_connection(connection, cache_size)
+        finally:
+            engine.dispose()
+
+    def __len__(self) -> int:
+        return len(self.pals)
+
+    def get(self, bp_class: str) -> PalRecord | None:
+        """Returns the Pal with the given blueprint class."""
+        return self.by_bp_class.get(bp_class)
+
+    def filter(self, **predicates) -> tuple[PalRecord, ...]:
+        """Returns the Pals matching every predicate, ordered by internal index.
+
+        `bp_class`, `tribe`, `genus`, `size` and `element` (either element)
+        match exactly; enum prefixes may be left out (`element='Fire'`). Any
+        work suitability matches Pals with at least the given level
+        (`mining=2`, or `mining='2'`).
+        """
+        for field, value in predicates.items():
+            if field in self.work:
+                try:
+                    predicates[field] = int(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Invalid level for '{field}': {value!r}.") from None
+            elif field not in self.indexes:
+                raise ValueError(f"Unknown filter '{field}'.")
+        key = tuple(sorted((field, normalize(field, value) if isinstance(value, str) else value)
+                           for field, value in predicates.items()))
+        return self._filter(key)
+
+    def cache_info(self):
+        return self._filter.cache_info()
+
+    def _filter_uncached(self, key: tuple[tuple[str, object], ...]) -> tuple[PalRecord, ...]:
+        candidates = []
+        for field, value in key:
+            if field in self.work:
+                levels, value = self.work[field], max(value, 0)
+                candidates.append(levels[value] if value < len(levels) else set())
+            else:
+                candidates.append(self.indexes[field].get(value, set()))
+
+        if not candidates:
+            return tuple(self.pals.values())
+
+        candidates.sort(key=len)
+        matches = set(candidates[0])
+        for other in candidates[1:]:
+            if not matches:
+                break
+            matches &= other
+        return tuple(self.pals[idx] for idx in sorted(matches))
+
+    def unique_combinations(self, tribe: str | None = None, child_id: str | None = None) -> tuple[CombiRecord, ...]:
+        """Returns the unique combinations involving a parent tribe and/or producing a child."""
+        if tribe is None and child_id is None:
+            return tuple(self.combinations)
+
+        results = None
+        if tribe is not None:
+            results = self.combis_by_tribe.get(normalize('tribe', tribe), [])
+        if child_id is not None:
+            by_child = self.combis_by_child.get(child_id, [])
+            results = by_child if results is None else [combi for combi in results if combi in by_child]
+        return tuple(results)
@@ -0,0 +1,98 @@
+import hashlib
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Callable
+from loguru import logger
+from palgen.constants import DEFAULT_CACHE_SIZE
+
+# Bumped whenever the layout of cached values changes.
+CACHE_VERSION = 1
+CACHE_SUFFIX = '.rows'
+
+def default_cache_dir() -> str:
+    """Returns the per-user cache directory (`$XDG_CACHE_HOME/palgen/rows`, or `~/.cache/palgen/rows`)."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'palgen', 'rows')
+
+class RowCache:
+    """On-disk cache of parsed DataTable rows, shared by every table and run.
+
+    Entries are keyed by the identity of the source export (its absolute
+    path, size and mtime, see `InputSource.identity`) and by a tag
+    describing how its rows were parsed, so an edited export or a changed
+    declaration is simply a miss. Values are serialized with
+    `marshal`, which loads plain tuples and dicts far faster than the JSON
+    can be parsed, but is only stable within a Python version (which is part
+    of the key as well).
+
+    The cache is capped at `max_bytes`. Every hit refreshes the mtime of its
+    entry, and when a store grows the cache over the cap the least recently
+    used entries are evicted first.
+    """
+
+    def __init__(self, directory: str | None = None, max_bytes: int = DEFAULT_CACHE_SIZE):
+        self.directory = Path(directory or default_cache_dir())
+        self.max_bytes = max_bytes
+
+    def entry(self, identity: tuple, tag: str) -> Path:
+        key = repr((CACHE_VERSION, sys.version_info[:2], identity, tag))
+        return self.directory / f'{hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()}{CACHE_SUFFIX}'
+
+    def get_or_parse(self, identity: tuple, tag: str, parse: Callable[[], object]):
+        """Returns the cached value for the export with `identity`, or parses and caches it."""
+        entry = self.entry(identity, tag)
+        try:
+            with open(entry, 'rb') as file:
+                value = marshal.loads(file.read())
+        except FileNotFoundError:
+            pass
+        except (EOFError, ValueError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable cache entry '{entry.name}': {e}")
+        else:
+            try:
+                os.utime(entry)
+            except OSError:
+                pass # Evicted by another process in the meantime.
+            logger.debug(f"Loaded parsed rows of '{identity[0]}' from the cache")
+            return value
+
+        value = parse()
+        self.store(entry, value)
+        return value
+
+    def store(self, entry: Path, value) -> None:
+        data = marshal.dumps(value)
+        if len(data) > self.max_bytes:
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Written next to the entry and moved into place, so concurrent readers never see a partial file.
+        temp_path = entry.with_name(f'{entry.name}.{os.getpid()}.tmp')
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, entry)
+        self.evict()
+
+    def evict(self) -> None:
+        """Deletes the least recently used entries until the cache fits in `max_bytes`."""
+        entries = []
+        for entry in self.directory.glob(f'*{CACHE_SUFFIX}'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Evicted cache entry '{entry.name}'")
+
+    def clear(self) -> None:
+        for entry in self.directory.glob(f'*{CACHE_SUFFIX}'):
+            entry.unlink(missing_ok=True)
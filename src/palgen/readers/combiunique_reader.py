@@ -1,22 +1,41 @@
-import json
+from typing import Iterator
+from palgen.breeding.matrix import UniqueCombination
 from palgen.models.combiunique_model import CombiUniqueModel
 from palgen.constants import UNIQUE_BREEDING
+from palgen.readers.plan import COMBI_PLAN
+from palgen.readers.source import InputSource
 
 class CombiUniqueReader:
 
-    def __init__(self, file_path: str) -> None:
-        self.file_path = f'{file_path}/{UNIQUE_BREEDING}'
+    def __init__(self, file_path: str | InputSource) -> None:
+        self.source = InputSource.from_path(file_path)
+        self.file_path = self.source.describe(UNIQUE_BREEDING)
         self.combi_uniques = []
 
+    def iter_combinations(self) -> Iterator[CombiUniqueModel]:
+        """Lazily yields the unique combinations while streaming the JSON file row by row."""
+        for _, v in self.source.iter_rows(UNIQUE_BREEDING):
+            yield CombiUniqueModel(**v)
+
+    def iter_combination_rows(self) -> Iterator[UniqueCombination]:
+        """Lazily yields the unique combinations as tuples, without building a model per row."""
+        extract = COMBI_PLAN.extract
+        for _, v in self.source.iter_rows(UNIQUE_BREEDING):
+            yield UniqueCombination._make(extract(v))
+
+    def read_rows(self) -> list[UniqueCombination]:
+        try:
+            return list(self.iter_combination_rows())
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {self.file_path}")
+        except Exception as e:
+            raise Exception(f"An error occurred while reading the file: {e}")
+
     def read(self) -> list[CombiUniqueModel]:
-        with open(self.file_path, 'r', encoding='utf-8') as file:
-            try:
-                data = json.load(file)[0]['Rows']
-                for v in data.values():
-                    combination = CombiUniqueModel(**v)
-                    self.combi_uniques.append(combination)
-                return self.combi_uniques
-            except FileNotFoundError:
-                raise FileNotFoundError(f"File not found: {self.file_path}")
-            except Exception as e:
-                raise Exception(f"An error occurred while reading the file: {e}")
\ No newline at end of file
+        try:
+            self.combi_uniques = list(self.iter_combinations())
+            return self.combi_uniques
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {self.file_path}")
+        except Exception as e:
+            raise Exception(f"An error occurred while reading the file: {e}")
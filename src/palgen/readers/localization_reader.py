@@ -1,31 +1,61 @@
-import json
+from pathlib import PurePosixPath
 from loguru import logger
 from palgen.constants import PAL_NAME
+from palgen.readers.source import InputSource, export_name
 
 class LocalizationReader:
 
-    def __init__(self, file_path: str):
-        self.file_path = f'{file_path}/{PAL_NAME}'
+    def __init__(self, file_path: str | InputSource, locale: str = 'en'):
+        self.source = InputSource.from_path(file_path)
+        self.file_path = self.source.describe(PAL_NAME)
+        self.locale = locale
         self.names = {}
 
     def read(self) -> dict:
         """Reads and parses the localization data for the Pal names from specified JSON file."""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)[0]['Rows'] # Isolates data to only the pal names.
-                for k, v in data.items():
-                    if k.startswith('PAL_NAME_'):
-                        name = v.get('TextData').get('LocalizedString')
-                        # Ensure the name is not empty or a placeholder.
-                        if name != 'en_text':
-                            # Store the name with the key in lowercase for consistency.
-                            # This allows for case-insensitive lookups.
-                            self.names[k.lower()] = name
-                            logger.debug(f"Loaded localization: {k.lower()}: {name}")
+            placeholders = 0
+            for k, v in self.source.iter_rows(PAL_NAME): # Streams only the rows holding the pal names.
+                if k.startswith('PAL_NAME_'):
+                    name = v.get('TextData').get('LocalizedString')
+                    # Ensure the name is not empty or a placeholder (e.g. en_text).
+                    if name != f'{self.locale}_text':
+                        # Store the name with the key in lowercase for consistency.
+                        # This allows for case-insensitive lookups.
+                        self.names[k.lower()] = name
+                    else:
+                        placeholders += 1
+            logger.debug(f"Loaded {len(self.names)} '{self.locale}' localizations, skipped {placeholders} placeholders")
             return self.names
         except FileNotFoundError:
             logger.error(f"File not found: {self.file_path}")
             raise FileNotFoundError(f"File not found: {self.file_path}")
         except Exception as e:
             logger.error(f"An error occurred while reading the file: {e}")
-            raise Exception(f"An error occurred while reading the file: {e}")
\ No newline at end of file
+            raise Exception(f"An error occurred while reading the file: {e}")
+
+def discover_locales(l10n_path: str | InputSource) -> dict[str, InputSource]:
+    """Maps every locale under an `L10N/` tree (a directory or an archive) to the source holding its Pal name table.
+
+    Both the game layout (`L10N/<lang>/Pal/DataTable/Text/`) and a flat
+    `L10N/<lang>/` folder are supported. The returned sources open their
+    archive on their own, and have to be closed by the caller.
+    """
+    with InputSource.from_path(l10n_path) as source:
+        found = {}
+        for member in source.members():
+            path = PurePosixPath(member)
+            if len(path.parts) > 1 and export_name(path.name) == PAL_NAME:
+                # The shallowest table of a locale wins, like the first match of a directory walk.
+                directory = str(path.parent)
+                locale = path.parts[0]
+                if locale not in found or directory.count('/') < found[locale].count('/'):
+                    found[locale] = directory
+
+        locales = {}
+        for locale in source.directories():
+            if locale in found:
+                locales[locale] = source.subsource(found[locale])
+            else:
+                logger.warning(f"No {PAL_NAME} found for locale '{locale}', skipping.")
+    return locales
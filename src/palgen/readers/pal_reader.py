@@ -1,30 +1,110 @@
-import json
+from typing import Iterable, Iterator
 from loguru import logger
+from pydantic import ValidationError
 from palgen.constants import PAL_INFO
 from palgen.models.pal_model import Pal
 from palgen.readers.localization_reader import LocalizationReader
+from palgen.readers.plan import PAL_CANDIDATE_PLAN, PAL_PLAN
+from palgen.readers.source import InputSource
 
 class PalReader:
 
-    def __init__(self, file_path: str):
-        self.file_path = f'{file_path}/{PAL_INFO}'
-        self.names = LocalizationReader(file_path).read()
+    def __init__(self, file_path: str | InputSource, names: dict | None = None):
+        self.source = InputSource.from_path(file_path)
+        self.file_path = self.source.describe(PAL_INFO)
+        # The localization can be passed in when it was already parsed elsewhere (e.g. in another process).
+        self.names = LocalizationReader(self.source).read() if names is None else names
         self.pals = []
 
-    def read(self):
+    def iter_candidates(self) -> Iterator[Pal]:
+        """Lazily yields every playable (non-boss) Pal from the JSON file, before localization is applied."""
+        for _, v in self.source.iter_rows(PAL_INFO):
+            if self.is_candidate(v):
+                try:
+                    yield Pal(**v, internal_index=0)
+                except ValidationError:
+                    # Pals without a name are dropped by `iter_pals` anyway, so only a named one fails the read.
+                    if self.has_name(v):
+                        raise
+
+    @staticmethod
+    def is_candidate(row: dict) -> bool:
+        """Checks whether a `DT_PalMonsterParameter` row is a playable (non-boss) Pal."""
+        return bool(row.get('IsPal') and (not row.get('IsBoss') and not row.get('IsTowerBoss') and not row.get('isRaidBoss')))
+
+    def has_name(self, row: dict) -> bool:
+        """Checks whether a `DT_PalMonsterParameter` row has a localized name."""
+        return self.get_pal_name(str(row.get('BPClass'))) != "Unknown Pal"
+
+    def iter_pals(self, candidates: Iterable[Pal] | None = None) -> Iterator[Pal]:
+        """Lazily yields the localized Pal objects, dropping the ones without a name.
+
+        The candidates are streamed from the JSON file unless given.
+        """
+        internal_idx = 1
+        unnamed = 0
+
+        for pal in self.iter_candidates() if candidates is None else candidates:
+            name = self.get_pal_name(pal.bp_class)
+            if name != "Unknown Pal":
+                pal.internal_index = internal_idx
+                pal.text_name = name
+                internal_idx += 1
+                yield pal
+            else:
+                unnamed += 1
+
+        # Logged once instead of per row, so verbose runs are not slowed down by logging.
+        logger.debug(f"Added {internal_idx - 1} Pals, skipped {unnamed} without a localized name")
+
+    def iter_candidate_rows(self) -> Iterator[tuple | dict]:
+        """Lazily yields every playable Pal as a `PAL_FIELDS` tuple, without building a model per row.
+
+        A row failing validation is yielded as it is (see `PAL_CANDIDATE_PLAN`).
+        """
+        extract = PAL_CANDIDATE_PLAN.extract
+        for _, v in self.source.iter_rows(PAL_INFO):
+            if self.is_candidate(v):
+                yield extract(v)
+
+    def iter_pal_rows(self, candidates: Iterable[tuple | dict] | None = None) -> Iterator[tuple]:
+        """Lazily yields the localized `PAL_COLUMNS` tuples, dropping the Pals without a name.
+
+        The candidate rows are streamed from the JSON file unless given. A
+        candidate that failed validation (a row dict) is only validated again,
+        and fails the read, if the Pal has a name.
+        """
+        internal_idx = 1
+        unnamed = 0
+
+        for row in self.iter_candidate_rows() if candidates is None else candidates:
+            deferred = isinstance(row, dict)
+            name = self.get_pal_name(str(row.get('BPClass')) if deferred else row[0]) # `bp_class` is the first field.
+            if name != "Unknown Pal":
+                if deferred:
+                    row = PAL_PLAN.extract(row)
+                yield (internal_idx, name, *row)
+                internal_idx += 1
+            else:
+                unnamed += 1
+
+        logger.debug(f"Added {internal_idx - 1} Pals, skipped {unnamed} without a localized name")
+
+    def read_rows(self, candidates: Iterable[tuple] | None = None) -> list[tuple]:
+        """Reads the Pal data from the JSON file as `PAL_COLUMNS` tuples."""
+        try:
+            return list(self.iter_pal_rows(candidates))
+        except FileNotFoundError:
+            logger.error(f"File not found: {self.file_path}")
+            raise FileNotFoundError(f"File not found: {self.file_path}")
+        except Exception as e:
+            logger.error(f"An error occurred while reading the file: {e}")
+            raise Exception(f"An error occurred while reading the file: {e}")
+
+    def read(self, candidates: Iterable[Pal] | None = None) -> list[Pal]:
         """Reads and parses the Pal data from the JSON file."""
         try:
-            internal_idx = 1
-
-            with open(self.file_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)[0]['Rows'] # Isolates data to only the Pal information.
-                for k, v in data.items():
-                    if (v.get('IsPal') and (not v.get('IsBoss') and not v.get('IsTowerBoss') and not v.get('isRaidBoss'))):
-                        if self.get_pal_name(v.get('BPClass')) != "Unknown Pal":
-                            pal = Pal(**v, internal_index=internal_idx, text_name=self.get_pal_name(v.get('BPClass')))
-                            self.pals.append(pal)
-                            logger.debug(f"Added Pal: {pal.text_name} (Internal Index: {internal_idx})")
-                            internal_idx += 1
+            self.pals = list(self.iter_pals(candidates))
             return self.pals
         except FileNotFoundError:
             logger.error(f"File not found: {self.file_path}")
@@ -35,4 +115,4 @@ class PalReader:
 
     def get_pal_name(self, bp_class: str) -> str:
         """Returns the localized name of the Pal based on its blueprint class."""
-        return self.names.get(f'pal_name_{bp_class.lower()}', "Unknown Pal")
\ No newline at end of file
+        return self.names.get(f'pal_name_{bp_class.lower()}', "Unknown Pal")
@@ -0,0 +1,93 @@
+from operator import attrgetter, itemgetter
+from typing import Callable
+from pydantic import BaseModel, ValidationError
+from palgen.breeding.matrix import UniqueCombination
+from palgen.models.combiunique_model import CombiUniqueModel
+from palgen.models.pal_model import PAL_FIELDS, Pal
+
+class RowPlan:
+    """Compiled plan extracting a fixed set of values from DataTable rows into a tuple.
+
+    Rows whose values already have exactly the declared types are extracted
+    with a single `itemgetter` call and a type check, without building a
+    model or any intermediate dict. Every other row (a missing key, a value
+    that needs coercion or is invalid) is validated by the Pydantic model
+    instead, so the result and the raised errors are the same as with the
+    model alone.
+
+    Tables repeating a group of fields per slot (`ItemId1`, `ItemId2`, ...)
+    declare aliases with an `{n}` placeholder and use one plan per slot.
+    """
+
+    def __init__(self, model: type[BaseModel], aliases: tuple[str, ...], types: tuple[type, ...],
+                 dump: Callable[[BaseModel], tuple], slot: int | None = None, **defaults):
+        self.model = model
+        self.aliases = tuple(alias.format(n=slot) for alias in aliases) if slot is not None else aliases
+        # Maps the keys read from a row to the aliases the model expects (they differ for slots).
+        self.rename = dict(zip(self.aliases, aliases)) if slot is not None else None
+        self.getter = itemgetter(*self.aliases)
+        self.types = types
+        self.dump = dump
+        self.defaults = defaults # Values the model requires that are not part of the row.
+
+    @classmethod
+    def from_model(cls, model: type[BaseModel], fields: tuple[str, ...], slot: int | None = None, **defaults) -> 'RowPlan':
+        """Compiles a plan for model fields from their aliases and annotated types."""
+        model_fields = model.model_fields
+        return cls(
+            model,
+            tuple(model_fields[name].alias or name for name in fields),
+            tuple(model_fields[name].annotation for name in fields),
+            attrgetter(*fields),
+            slot,
+            **defaults
+        )
+
+    def extract(self, row: dict) -> tuple:
+        try:
+            values = self.getter(row)
+            if tuple(map(type, values)) == self.types:
+                return values
+        except KeyError:
+            pass
+        if self.rename is not None:
+            row = {self.rename[key]: row[key] for key in self.aliases if key in row}
+        return self.dump(self.model.model_validate({**row, **self.defaults}))
+
+    def signature(self) -> str:
+        """Describes what the plan extracts, so rows cached by a different plan are not reused."""
+        return repr((self.model.__qualname__, self.aliases, tuple(t.__qualname__ for t in self.types), self.defaults))
+
+class DeferredRowPlan(RowPlan):
+    """A `RowPlan` returning a row that fails validation as it is, instead of raising.
+
+    Used where rows are extracted before it is known whether they are kept
+    (e.g. Pal candidates, before their names are joined), so an invalid row
+    only fails the read if it is actually kept and extracted again.
+    """
+
+    def extract(self, row: dict) -> tuple | dict:
+        try:
+            return super().extract(row)
+        except ValidationError:
+            return row
+
+    def signature(self) -> str:
+        return f'deferred {super().signature()}'
+
+def _dump_combination(combi: CombiUniqueModel) -> tuple:
+    parent_a, parent_b = combi.parents
+    return parent_a['tribe'], parent_a['gender'], parent_b['tribe'], parent_b['gender'], combi.child_id
+
+# Playable Pals, as `PAL_FIELDS` tuples.
+PAL_PLAN = RowPlan.from_model(Pal, PAL_FIELDS, internal_index=0)
+# Pal candidates, extracted before the unnamed ones are dropped (see `PalReader.iter_pal_rows`).
+PAL_CANDIDATE_PLAN = DeferredRowPlan.from_model(Pal, PAL_FIELDS, internal_index=0)
+
+# Unique combinations, as the values of a `UniqueCombination`.
+COMBI_PLAN = RowPlan(
+    CombiUniqueModel,
+    ('ParentTribeA', 'ParentGenderA', 'ParentTribeB', 'ParentGenderB', 'ChildCharacterID'),
+    (str,) * len(UniqueCombination._fields),
+    _dump_combination
+)
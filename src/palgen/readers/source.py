@@ -0,0 +1,252 @@
+import bz2
+import gzip
+import hashlib
+import io
+import lzma
+import os
+import tarfile
+import zipfile
+from abc import ABC, abstractmethod
+from contextlib import ExitStack, contextmanager
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterator
+from palgen.readers.stream import CHUNK_SIZE, RowStream
+
+# Bytes read per chunk while hashing exports.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def _open_zstd(file: BinaryIO) -> BinaryIO:
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Reading .zst exports requires the optional 'zstandard' package (pip install zstandard).") from None
+    return zstandard.ZstdDecompressor().stream_reader(file)
+
+# Streaming decompressors for individually compressed exports, by file suffix.
+DECOMPRESSORS = {
+    '.gz': lambda file: gzip.GzipFile(fileobj=file),
+    '.bz2': bz2.BZ2File,
+    '.xz': lzma.LZMAFile,
+    '.zst': _open_zstd,
+}
+
+def export_name(file_name: str) -> str:
+    """Returns the export a file holds, without its compression suffix (`X.json.gz` -> `X.json`)."""
+    for suffix in DECOMPRESSORS:
+        if file_name.endswith(suffix):
+            return file_name[:-len(suffix)]
+    return file_name
+
+class InputSource(ABC):
+    """Where the DataTable exports are read from.
+
+    A source is a directory, a zip archive or a (possibly compressed) tar
+    archive. Every export may also be compressed on its own
+    (`DT_PalMonsterParameter.json.gz`, `.bz2`, `.xz` or `.zst`). Exports are
+    streamed and decompressed on the fly, so nothing is ever extracted to
+    disk. Sources only hold paths, so they can be passed to worker processes.
+    Archives are opened on first use, and sources are context managers
+    closing them on exit.
+    """
+
+    @staticmethod
+    def from_path(path: 'str | Path | InputSource') -> 'InputSource':
+        """Opens a directory or archive as a source (sources are returned as they are)."""
+        if isinstance(path, InputSource):
+            return path
+        path = Path(path)
+        if path.is_file():
+            if zipfile.is_zipfile(path):
+                return ZipSource(path)
+            if tarfile.is_tarfile(path):
+                return TarSource(path)
+            raise ValueError(f"'{path}' is neither a directory nor a zip or tar archive.")
+        return DirectorySource(path)
+
+    @abstractmethod
+    def members(self) -> list[str]:
+        """Returns the relative (`/`-separated) paths of every file in the source."""
+
+    def directories(self) -> list[str]:
+        """Returns the names of the top-level directories of the source."""
+        return sorted({parts[0] for parts in (PurePosixPath(member).parts for member in self.members()) if len(parts) > 1})
+
+    @abstractmethod
+    def subsource(self, directory: str) -> 'InputSource':
+        """Returns the source restricted to a directory of this one."""
+
+    @abstractmethod
+    def locate(self, name: str) -> str | None:
+        """Returns the member holding the export `name`, or None if there is none."""
+
+    @abstractmethod
+    def _open_member(self, member: str) -> BinaryIO:
+        """Opens a member of the source as it is stored (still compressed)."""
+
+    @abstractmethod
+    def identity(self, name: str) -> tuple:
+        """Returns values that change whenever the export `name` may have changed (used as cache key)."""
+
+    @abstractmethod
+    def describe(self, name: str) -> str:
+        """Returns a readable location of the export `name`, for messages."""
+
+    def exists(self, name: str) -> bool:
+        return self.locate(name) is not None
+
+    def close(self) -> None:
+        """Releases the handles held by the source. It stays usable, and reopens them when needed."""
+
+    def __enter__(self) -> 'InputSource':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    @contextmanager
+    def open(self, name: str) -> Iterator[BinaryIO]:
+        """Opens the export `name` as a decompressed binary stream."""
+        member = self.locate(name)
+        if member is None:
+            raise FileNotFoundError(f"File not found: {self.describe(name)}")
+
+        with ExitStack() as stack:
+            file = stack.enter_context(self._open_member(member))
+            decompress = DECOMPRESSORS.get(PurePosixPath(member).suffix)
+            if decompress is not None:
+                file = stack.enter_context(decompress(file))
+            yield file
+
+    def iter_rows(self, name: str, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[str, dict]]:
+        """Streams `(row_name, row_dict)` pairs from the export `name`."""
+        with self.open(name) as file:
+            yield from RowStream(io.TextIOWrapper(file, encoding='utf-8'), chunk_size).rows()
+
+    def hash(self, name: str) -> str:
+        """Returns the SHA-256 hex digest of the (decompressed) content of the export `name`."""
+        digest = hashlib.sha256()
+        with self.open(name) as file:
+            while chunk := file.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+class DirectorySource(InputSource):
+    """Exports stored as files directly in a directory."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def __repr__(self) -> str:
+        return f'DirectorySource({str(self.root)!r})'
+
+    def members(self) -> list[str]:
+        return sorted(path.relative_to(self.root).as_posix() for path in self.root.rglob('*') if path.is_file())
+
+    def directories(self) -> list[str]:
+        # Listed from the file system, so directories without any file are included as well.
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir())
+
+    def subsource(self, directory: str) -> 'InputSource':
+        return DirectorySource(self.root / directory)
+
+    def locate(self, name: str) -> str | None:
+        for suffix in ('', *DECOMPRESSORS):
+            if (self.root / f'{name}{suffix}').is_file():
+                return f'{name}{suffix}'
+        return None
+
+    def _open_member(self, member: str) -> BinaryIO:
+        return open(self.root / member, 'rb')
+
+    def identity(self, name: str) -> tuple:
+        path = self.root / (self.locate(name) or name)
+        stat = os.stat(path)
+        return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+    def describe(self, name: str) -> str:
+        return f'{self.root}/{self.locate(name) or name}'
+
+class ArchiveSource(InputSource):
+    """Exports stored anywhere inside an archive, found by their file name.
+
+    When an archive holds several files with the same name (e.g. a whole
+    FModel tree), the one closest to the root of `prefix` is used. The
+    archive is opened lazily in every process using the source.
+    """
+
+    def __init__(self, path: str | Path, prefix: str = ''):
+        self.path = Path(path)
+        self.prefix = prefix
+        self._archive = None
+        self._members = None
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({str(self.path)!r}, prefix={self.prefix!r})'
+
+    def __getstate__(self) -> dict:
+        # Open archive handles cannot be pickled, workers reopen the archive.
+        return {**self.__dict__, '_archive': None}
+
+    @abstractmethod
+    def _list(self) -> list[str]:
+        """Returns the paths of every file in the archive."""
+
+    def members(self) -> list[str]:
+        if self._members is None:
+            self._members = sorted(self._list())
+        return [member[len(self.prefix):] for member in self._members if member.startswith(self.prefix)]
+
+    def subsource(self, directory: str) -> 'InputSource':
+        source = type(self)(self.path, f'{self.prefix}{directory.strip("/")}/')
+        source._members = self._members
+        return source
+
+    def locate(self, name: str) -> str | None:
+        matches = [member for member in self.members() if export_name(PurePosixPath(member).name) == name]
+        if not matches:
+            return None
+        return self.prefix + min(matches, key=lambda member: (member.count('/'), member))
+
+    def identity(self, name: str) -> tuple:
+        stat = os.stat(self.path)
+        return f'{os.path.abspath(self.path)}/{self.locate(name) or name}', stat.st_size, stat.st_mtime_ns
+
+    def describe(self, name: str) -> str:
+        return f'{self.path}/{self.locate(name) or self.prefix + name}'
+
+    def close(self) -> None:
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+class ZipSource(ArchiveSource):
+    """Exports inside a zip archive. Members are read directly, without scanning the archive."""
+
+    def _zip(self) -> zipfile.ZipFile:
+        if self._archive is None:
+            self._archive = zipfile.ZipFile(self.path)
+        return self._archive
+
+    def _list(self) -> list[str]:
+        return [info.filename for info in self._zip().infolist() if not info.is_dir()]
+
+    def _open_member(self, member: str) -> BinaryIO:
+        return self._zip().open(member)
+
+class TarSource(ArchiveSource):
+    """Exports inside a tar archive, optionally compressed as a whole (`.tar.gz`, `.tar.bz2`, `.tar.xz`).
+
+    A compressed tarball has no index, so it is decompressed once to list
+    its members, and again up to each member that is read.
+    """
+
+    def _tar(self) -> tarfile.TarFile:
+        if self._archive is None:
+            self._archive = tarfile.open(self.path, 'r:*')
+        return self._archive
+
+    def _list(self) -> list[str]:
+        return [info.name for info in self._tar().getmembers() if info.isfile()]
+
+    def _open_member(self, member: str) -> BinaryIO:
+        return self._tar().extractfile(member)
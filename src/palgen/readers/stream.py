@@ -0,0 +1,117 @@
+import json
+from typing import Iterator, TextIO
+
+# Number of characters pulled from the file per read. Only the current
+# row (plus at most one chunk) is ever held in memory at a time.
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+
+
+class RowStream:
+    """Incremental parser for the `Rows` object of an FModel DataTable export.
+
+    FModel exports have the shape `[{"Type": ..., "Name": ..., "Rows": {...}}]`.
+    Instead of decoding the whole document with `json.load`, the top level
+    structure is walked by hand and every row is decoded on its own with
+    `json.JSONDecoder.raw_decode`, so memory stays bounded by the size of
+    a single row rather than the size of the file.
+    """
+
+    def __init__(self, file: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Reads another chunk into the buffer. Returns False at end of file."""
+        if self.eof:
+            return False
+
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        # Drop the consumed prefix so the buffer does not grow with the file.
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return
+
+    def _peek(self) -> str:
+        self._skip_whitespace()
+        if self.pos >= len(self.buffer):
+            raise ValueError('Unexpected end of file while reading DataTable export.')
+        return self.buffer[self.pos]
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos} but found '{found}'.")
+        self.pos += 1
+
+    def _decode(self):
+        """Decodes the next JSON value, reading more of the file until it is complete."""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value that ends exactly at the buffer edge might still be
+                # truncated (e.g. a number), so only trust it once more data
+                # follows it or the file has ended.
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def rows(self) -> Iterator[tuple[str, dict]]:
+        """Yields `(row_name, row_dict)` pairs from the first table's `Rows` object."""
+        self._expect('[')
+        self._expect('{')
+
+        while True:
+            key = self._decode()
+            self._expect(':')
+
+            if key != 'Rows':
+                self._decode() # Metadata such as `Type` and `Name` is small, skip it.
+            else:
+                yield from self._rows()
+                return
+
+            if self._peek() == '}':
+                raise ValueError("DataTable export does not contain a 'Rows' object.")
+            self._expect(',')
+
+    def _rows(self) -> Iterator[tuple[str, dict]]:
+        self._expect('{')
+        if self._peek() == '}':
+            return
+
+        while True:
+            name = self._decode()
+            self._expect(':')
+            yield name, self._decode()
+
+            if self._peek() == '}':
+                return
+            self._expect(',')
+
+
+def iter_rows(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[str, dict]]:
+    """Streams `(row_name, row_dict)` pairs from a DataTable JSON export."""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        yield from RowStream(file, chunk_size).rows()
@@ -0,0 +1,112 @@
+from typing import Callable, Iterator
+from pydantic import BaseModel
+from palgen.constants import EXTRA_TABLES, ITEM_INFO, PAL_DROP, PAL_INFO, PASSIVE_SKILL_INFO, SKILL_INFO, UNIQUE_BREEDING
+from palgen.models.drop_model import PalDrop, PalDropTable
+from palgen.models.item_model import Item, ItemTable
+from palgen.models.passive_skill_model import PassiveSkill, PassiveSkillTable
+from palgen.models.skill_model import Skill, SkillTable
+from palgen.readers.cache import RowCache
+from palgen.readers.pal_reader import PalReader
+from palgen.readers.plan import COMBI_PLAN, PAL_CANDIDATE_PLAN, RowPlan
+from palgen.readers.source import InputSource
+
+# Slot values meaning "no item in this slot".
+EMPTY_SLOT = (None, '', 'None')
+
+def is_skill(row: dict) -> bool:
+    """Checks whether a `DT_WazaDataTable` row describes an actual skill."""
+    return row.get('WazaType') not in (*EMPTY_SLOT, 'EPalWazaID::None')
+
+class DataTable:
+    """Declaration of a game DataTable: where its export is, which rows to keep and what they become.
+
+    Rows are extracted into tuples by a `RowPlan` compiled from `fields` of
+    `model`. With `row_name` set, the DataTable row name is prepended as the
+    `id` column. Tables repeating their fields per slot get one row per
+    non-empty slot, with the slot number as the `slot` column.
+    """
+
+    def __init__(self, name: str, file: str, model: type[BaseModel] | None = None, fields: tuple[str, ...] = (),
+                 table=None, row_filter: Callable[[dict], bool] | None = None, key: str | None = 'id',
+                 row_name: bool = True, slots: range | None = None, slot_key: str | None = None,
+                 plan: RowPlan | None = None):
+        self.name = name # Name of the generate stage, and of the table written for it.
+        self.file = file # File name of the JSON export in the input source.
+        self.fields = fields
+        self.table = table # Table written by `DatabaseWriter.write_table`, if the stage has no dedicated writer.
+        self.row_filter = row_filter
+        self.key = key # Column the rows are synced on, or None to rewrite the table on every change.
+        self.row_name = row_name
+        self.slots = slots
+        self.slot_index = fields.index(slot_key) if slot_key else 0
+
+        if plan is not None:
+            self.plans = [(None, plan)]
+        elif slots is not None:
+            self.plans = [(slot, RowPlan.from_model(model, fields, slot)) for slot in slots]
+        else:
+            self.plans = [(None, RowPlan.from_model(model, fields))]
+
+    def __repr__(self) -> str:
+        return f'DataTable({self.name!r}, {self.file!r})'
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """Columns of the extracted rows, in order."""
+        return ('id',) * self.row_name + ('slot',) * (self.slots is not None) + self.fields
+
+    def signature(self) -> str:
+        """Describes how rows are extracted, so cached rows of a different declaration are not reused."""
+        row_filter = getattr(self.row_filter, '__qualname__', None)
+        return repr((self.name, self.row_name, row_filter, [(slot, plan.signature()) for slot, plan in self.plans]))
+
+    def iter_records(self, source: InputSource) -> Iterator[tuple]:
+        """Lazily yields the extracted rows of the export in `source`."""
+        row_filter, row_name = self.row_filter, self.row_name
+        for name, row in source.iter_rows(self.file):
+            if row_filter is not None and not row_filter(row):
+                continue
+            for slot, plan in self.plans:
+                if slot is None:
+                    values = plan.extract(row)
+                    yield (name, *values) if row_name else values
+                elif row.get(plan.aliases[self.slot_index]) not in EMPTY_SLOT:
+                    yield (name, slot, *plan.extract(row)) if row_name else (slot, *plan.extract(row))
+
+    def read(self, input_path: str | InputSource, cache: RowCache | None = None) -> list[tuple]:
+        """Reads the extracted rows of the export in `input_path`, through the row cache if given."""
+        source = InputSource.from_path(input_path)
+        try:
+            if cache is None:
+                return list(self.iter_records(source))
+            return cache.get_or_parse(source.identity(self.file), self.signature(), lambda: list(self.iter_records(source)))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {source.describe(self.file)}")
+        except Exception as e:
+            raise Exception(f"An error occurred while reading the file: {e}")
+        finally:
+            if source is not input_path:
+                source.close()
+
+# Every DataTable `generate` reads. `pals` and `combi_unique` are written by
+# their own stages; the others (`EXTRA_TABLES`) are written as they are to their `table`.
+DATA_TABLES = {datatable.name: datatable for datatable in (
+    DataTable('pals', PAL_INFO, plan=PAL_CANDIDATE_PLAN, row_filter=PalReader.is_candidate, row_name=False),
+    DataTable('combi_unique', UNIQUE_BREEDING, plan=COMBI_PLAN, row_name=False),
+    DataTable(
+        'skills', SKILL_INFO, Skill, ('waza_type', 'element', 'category', 'power', 'cool_time'), SkillTable,
+        row_filter=is_skill
+    ),
+    DataTable(
+        'passive_skills', PASSIVE_SKILL_INFO, PassiveSkill,
+        ('rank', 'effect_type1', 'effect_value1', 'effect_type2', 'effect_value2', 'effect_type3', 'effect_value3'),
+        PassiveSkillTable
+    ),
+    DataTable(
+        'pal_drops', PAL_DROP, PalDrop, ('character_id', 'level', 'item_id', 'rate', 'min', 'max'), PalDropTable,
+        key=None, slots=range(1, 11), slot_key='item_id'
+    ),
+    DataTable(
+        'items', ITEM_INFO, Item, ('type_a', 'type_b', 'rank', 'rarity', 'price', 'max_stack_count', 'weight'), ItemTable
+    ),
+)}
@@ -0,0 +1,311 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qsl, quote, unquote, urlsplit
+from loguru import logger
+from palgen.models.pal_model import WORK_SUITABILITIES
+from palgen.query import normalize
+
+# Filters accepted by `GET /pals`, mapped to their SQL condition.
+EXACT_FILTERS = {
+    'bp_class': 'bp_class = ?',
+    'tribe': 'tribe = ?',
+    'genus': 'genus = ?',
+    'size': 'size = ?',
+    'element': '(element1 = ? OR element2 = ?)',
+}
+MAX_REQUEST_LINE = 8192
+
+class HTTPError(Exception):
+    """Raised by a handler to answer with an error status."""
+
+    def __init__(self, status: HTTPStatus, message: str | None = None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+class ConnectionPool:
+    """Bounded pool of read-only SQLite connections to a generated database.
+
+    Connections are opened with `mode=ro&immutable=1`, so SQLite skips all
+    locking and change detection. To still pick up a rebuilt database, the
+    file's identity (inode, size and mtime) is checked on every acquire, and
+    when it changes the pool is refilled with fresh connections and a new
+    build id.
+    """
+
+    def __init__(self, database_path: str, size: int = 4):
+        self.database_path = Path(database_path).resolve()
+        self.size = size
+        self.connections = asyncio.Queue()
+        self.identity = None
+        self.build_id = None
+        self.generation = 0
+        self.refresh()
+
+    def _open(self) -> sqlite3.Connection:
+        uri = f'file:{quote(str(self.database_path))}?mode=ro&immutable=1'
+        connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def _stat(self) -> tuple[int, int, int]:
+        stat = os.stat(self.database_path)
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def refresh(self) -> None:
+        """Replaces every idle connection if the database file was rebuilt.
+
+        Raises an OSError or `sqlite3.Error` if the file is missing or cannot
+        be opened, in which case the pool is left as it was.
+        """
+        identity = self._stat()
+        if identity == self.identity:
+            return
+
+        # Opened before anything is replaced, so a failure keeps the previous build.
+        connections = []
+        try:
+            for _ in range(self.size):
+                connections.append(self._open())
+        except BaseException:
+            for connection in connections:
+                connection.close()
+            raise
+
+        while not self.connections.empty():
+            self.connections.get_nowait()[1].close()
+        self.identity = identity
+        self.generation += 1
+        self.build_id = hashlib.blake2b(repr(identity).encode(), digest_size=8).hexdigest()
+        for connection in connections:
+            self.connections.put_nowait((self.generation, connection))
+        logger.debug(f"Opened {self.size} read-only connections to build {self.build_id}")
+
+    @asynccontextmanager
+    async def acquire(self):
+        generation, connection = await self.connections.get()
+        try:
+            yield connection
+        finally:
+            # Connections checked out before a rebuild are closed instead of
+            # returned, `refresh` already filled the pool with new ones.
+            if generation == self.generation:
+                self.connections.put_nowait((generation, connection))
+            else:
+                connection.close()
+
+    async def fetchall(self, sql: str, params: tuple = ()) -> list[dict]:
+        async with self.acquire() as connection:
+            rows = await asyncio.to_thread(lambda: connection.execute(sql, params).fetchall())
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        while not self.connections.empty():
+            self.connections.get_nowait()[1].close()
+
+class PalServer:
+    """Async HTTP/1.1 lookup service over a generated `pals.db`.
+
+    Endpoints:
+        GET /pals/<bp_class>      a single Pal
+        GET /pals?element=Fire&mining=2&limit=20
+                                  Pals matching every filter (work levels are minimums)
+        GET /breeding?parent_a=A&parent_b=B
+                                  every possible child of a pair
+        GET /health               the current build id
+
+    Every response carries an ETag derived from the database build. Bodies
+    are cached per URL for the current build, and requests revalidating with
+    a matching `If-None-Match` get a `304 Not Modified` without touching
+    SQLite. While the database file is missing or unreadable, requests get
+    a `503 Service Unavailable`.
+    """
+
+    def __init__(self, database_path: str, pool_size: int = 4, cache_size: int = 1024):
+        self.pool = ConnectionPool(database_path, pool_size)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.cache_build = None
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8000) -> None:
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        logger.info(f"Serving '{self.pool.database_path}' on http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.close()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Lines over the stream limit are not returned, `readline` raises instead.
+                    request_line = None
+                if request_line is None or len(request_line) > MAX_REQUEST_LINE:
+                    await self.respond(writer, HTTPStatus.REQUEST_URI_TOO_LONG, {'error': 'Request line too long.'}, keep_alive=False)
+                    break
+                if not request_line:
+                    break
+
+                headers = {}
+                try:
+                    while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self.respond(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                       {'error': 'Header line too long.'}, keep_alive=False)
+                    break
+
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self.respond(writer, HTTPStatus.BAD_REQUEST, {'error': 'Malformed request line.'}, keep_alive=False)
+                    break
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await self.dispatch(writer, method, target, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, writer: asyncio.StreamWriter, method: str, target: str, headers: dict, keep_alive: bool) -> None:
+        if method not in ('GET', 'HEAD'):
+            await self.respond(writer, HTTPStatus.METHOD_NOT_ALLOWED, {'error': 'Only GET is supported.'}, keep_alive)
+            return
+
+        try:
+            self.pool.refresh()
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Database '{self.pool.database_path}' is unavailable: {e}")
+            await self.respond(writer, HTTPStatus.SERVICE_UNAVAILABLE, {'error': 'Database unavailable.'}, keep_alive)
+            return
+        etag = f'"{self.pool.build_id}"'
+        if headers.get('if-none-match') == etag:
+            await self.respond(writer, HTTPStatus.NOT_MODIFIED, None, keep_alive, etag)
+            return
+
+        if self.cache_build != self.pool.build_id:
+            self.cache.clear()
+            self.cache_build = self.pool.build_id
+
+        body = self.cache.get(target)
+        if body is not None:
+            self.cache.move_to_end(target)
+            await self.respond(writer, HTTPStatus.OK, body, keep_alive, etag, head=method == 'HEAD')
+            return
+
+        try:
+            payload = await self.route(target)
+        except HTTPError as e:
+            await self.respond(writer, e.status, {'error': str(e)}, keep_alive)
+            return
+        except Exception as e:
+            logger.error(f"An error occurred while handling '{target}': {e}")
+            await self.respond(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {'error': 'Internal server error.'}, keep_alive)
+            return
+
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        # Skip caching if another request picked up a rebuild in the meantime.
+        if self.cache_build == self.pool.build_id:
+            self.cache[target] = body
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        await self.respond(writer, HTTPStatus.OK, body, keep_alive, etag, head=method == 'HEAD')
+
+    async def respond(self, writer: asyncio.StreamWriter, status: HTTPStatus, body, keep_alive: bool,
+                      etag: str | None = None, head: bool = False) -> None:
+        if body is not None and not isinstance(body, bytes):
+            body = json.dumps(body, separators=(',', ':')).encode('utf-8')
+        body = body or b''
+
+        lines = [f'HTTP/1.1 {status.value} {status.phrase}', f'Content-Length: {len(body)}']
+        if status != HTTPStatus.NOT_MODIFIED:
+            lines.append('Content-Type: application/json')
+        if etag:
+            lines.append(f'ETag: {etag}')
+            lines.append('Cache-Control: no-cache')
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if not head and status != HTTPStatus.NOT_MODIFIED:
+            writer.write(body)
+        await writer.drain()
+
+    async def route(self, target: str):
+        url = urlsplit(target)
+        path = [unquote(part) for part in url.path.strip('/').split('/') if part]
+        params = dict(parse_qsl(url.query))
+
+        if path == ['health']:
+            return {'status': 'ok', 'build': self.pool.build_id}
+        if path == ['pals']:
+            return await self.filter_pals(params)
+        if len(path) == 2 and path[0] == 'pals':
+            return await self.get_pal(path[1])
+        if path == ['breeding']:
+            return await self.breeding(params)
+        raise HTTPError(HTTPStatus.NOT_FOUND)
+
+    async def get_pal(self, bp_class: str) -> dict:
+        rows = await self.pool.fetchall('SELECT * FROM pals WHERE bp_class = ?', (bp_class,))
+        if not rows:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown Pal '{bp_class}'.")
+        return rows[0]
+
+    async def filter_pals(self, params: dict) -> list[dict]:
+        conditions, values = [], []
+        try:
+            limit = int(params.pop('limit', 1000))
+            for field, value in params.items():
+                if field in EXACT_FILTERS:
+                    value = normalize(field, value)
+                    conditions.append(EXACT_FILTERS[field])
+                    values.extend([value] * EXACT_FILTERS[field].count('?'))
+                elif field in WORK_SUITABILITIES:
+                    conditions.append(f'{field} >= ?')
+                    values.append(int(value))
+                else:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown filter '{field}'.")
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, 'Work suitability filters and limit must be integers.')
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        sql = f'SELECT * FROM pals {where} ORDER BY internal_index LIMIT ?'
+        return await self.pool.fetchall(sql, (*values, limit))
+
+    async def breeding(self, params: dict) -> list[dict]:
+        parent_a, parent_b = params.get('parent_a'), params.get('parent_b')
+        if not parent_a or not parent_b:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Both 'parent_a' and 'parent_b' are required.")
+
+        rows = await self.pool.fetchall(
+            'SELECT parent_a, parent_b, parent_a_gender, parent_b_gender, child FROM breeding '
+            'WHERE (parent_a = ? AND parent_b = ?) OR (parent_a = ? AND parent_b = ?)',
+            (parent_a, parent_b, parent_b, parent_a)
+        )
+        # Results are stored once per unordered pair, so flip them into the requested order.
+        results = []
+        for row in rows:
+            if row['parent_a'] != parent_a:
+                row = {
+                    'parent_a': row['parent_b'], 'parent_b': row['parent_a'],
+                    'parent_a_gender': row['parent_b_gender'], 'parent_b_gender': row['parent_a_gender'],
+                    'child': row['child'],
+                }
+            results.append(row)
+        if not results:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No breeding result for '{parent_a}' and '{parent_b}'.")
+        return results
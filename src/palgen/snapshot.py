@@ -0,0 +1,222 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable
+from sqlalchemy import Connection, select
+from palgen.models.pal_model import WORK_SUITABILITIES, PalTable
+
+# File layout:
+#
+#   header      MAGIC, version, row count, column count, byte order of the data
+#   directory   one fixed-size entry per column
+#   data        one array per column, each aligned to 8 bytes
+#   strings     the dictionaries of the string columns
+#
+# The header, directory and string lengths are little-endian. The column
+# arrays are in the native byte order of the host that wrote the file, as
+# recorded in the header (`<` or `>`), so they can be mapped as they are;
+# a host of the other byte order reads byteswapped copies instead.
+#
+# Integer columns are stored as-is. String columns are dictionary-encoded:
+# every row holds a code (uint16, or uint32 for dictionaries too large for
+# it) into the column's dictionary, which is stored as a sequence of
+# length-prefixed UTF-8 strings.
+
+MAGIC = b'PALSNAP\0'
+VERSION = 2
+SNAPSHOT_FILE = 'pals.snap'
+
+HEADER = struct.Struct('<8sIIIc3x')
+COLUMN = struct.Struct('<32sccxxQQI8x')
+STRING_LENGTH = struct.Struct('<I')
+
+INTEGER, DICTIONARY = b'i', b'd'
+
+# Byte order of the column arrays written by this host.
+BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+# Size in bytes of every array typecode used for a column, which the file format fixes.
+ITEM_SIZES = {'h': 2, 'H': 2, 'i': 4, 'I': 4}
+
+# (column name, kind, array typecode) of every column in the snapshot.
+COLUMNS = (
+    ('internal_index', INTEGER, 'i'),
+    ('zukan_index', INTEGER, 'i'),
+    ('combirank', INTEGER, 'i'),
+    ('rarity', INTEGER, 'h'),
+    *((name, INTEGER, 'h') for name in WORK_SUITABILITIES),
+    ('bp_class', DICTIONARY, 'I'),
+    ('tribe', DICTIONARY, 'I'),
+    ('genus', DICTIONARY, 'I'),
+    ('element1', DICTIONARY, 'I'),
+    ('element2', DICTIONARY, 'I'),
+    ('size', DICTIONARY, 'I'),
+)
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+def _check_item_size(typecode: str) -> None:
+    if typecode not in ITEM_SIZES or array(typecode).itemsize != ITEM_SIZES[typecode]:
+        raise ValueError(f"Unsupported snapshot column type '{typecode}' on this platform.")
+
+def snapshot_version(path: str) -> int | None:
+    """Returns the format version of a snapshot file, or None if it is not one."""
+    with open(path, 'rb') as file:
+        header = file.read(HEADER.size)
+    if len(header) < HEADER.size or not header.startswith(MAGIC):
+        return None
+    return HEADER.unpack(header)[1]
+
+def write_snapshot(rows: Iterable[dict], path: str) -> int:
+    """Writes Pal rows to a columnar snapshot file. Returns the number of rows written.
+
+    The file is written next to `path` and moved into place atomically, so
+    processes that already mapped the previous snapshot are not affected.
+    """
+    columns = {name: array(typecode) for name, _, typecode in COLUMNS}
+    dictionaries = {name: {} for name, kind, _ in COLUMNS if kind == DICTIONARY}
+
+    count = 0
+    for row in rows:
+        for name, kind, _ in COLUMNS:
+            value = row[name]
+            if kind == DICTIONARY:
+                value = dictionaries[name].setdefault(value or '', len(dictionaries[name]))
+            columns[name].append(value)
+        count += 1
+
+    offset = HEADER.size + COLUMN.size * len(COLUMNS)
+    directory, blobs = [], []
+
+    for name, kind, typecode in COLUMNS:
+        if kind == DICTIONARY and len(dictionaries[name]) <= 0x10000:
+            typecode = 'H'
+        _check_item_size(typecode)
+        offset = _align(offset)
+        data = array(typecode, columns[name]).tobytes()
+        blobs.append((offset, data))
+        directory.append([name, kind, typecode, offset, 0, 0])
+        offset += len(data)
+
+    for entry in directory:
+        name, kind = entry[0], entry[1]
+        if kind != DICTIONARY:
+            continue
+        strings = b''.join(
+            STRING_LENGTH.pack(len(encoded)) + encoded
+            for encoded in (value.encode('utf-8') for value in dictionaries[name])
+        )
+        offset = _align(offset)
+        blobs.append((offset, strings))
+        entry[4], entry[5] = offset, len(dictionaries[name])
+        offset += len(strings)
+
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, count, len(COLUMNS), BYTE_ORDER))
+        for name, kind, typecode, data_offset, dict_offset, dict_count in directory:
+            file.write(COLUMN.pack(name.encode('ascii'), kind, typecode.encode('ascii'), data_offset, dict_offset, dict_count))
+        for blob_offset, data in blobs:
+            file.write(b'\0' * (blob_offset - file.tell()))
+            file.write(data)
+    os.replace(temp_path, path)
+    return count
+
+def write_snapshot_from_connection(connection: Connection, path: str) -> int:
+    """Writes the `pals` table to a columnar snapshot file."""
+    columns = [getattr(PalTable, name) for name, _, _ in COLUMNS]
+    rows = connection.execute(select(*columns).order_by(PalTable.internal_index)).mappings()
+    return write_snapshot(rows, path)
+
+class PalSnapshot:
+    """Read-only, memory-mapped view of a Pal snapshot file.
+
+    Integer columns and dictionary codes are exposed as `memoryview`s over the
+    mapping itself, so no data is copied and every process mapping the same
+    file shares a single page-cached copy. Views returned by `column` must be
+    released before the snapshot is closed. A file written by a host of the
+    other byte order is read into byteswapped copies instead.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.mmap)
+
+        magic, version, self.rows, column_count, byte_order = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a Pal snapshot file.")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"Unsupported Pal snapshot version {version} (expected {VERSION}).")
+        if byte_order not in (b'<', b'>'):
+            self.close()
+            raise ValueError(f"'{path}' has an invalid byte order marker {byte_order!r}.")
+
+        self.columns = {}
+        self.dictionaries = {}
+        for idx in range(column_count):
+            name, kind, typecode, data_offset, dict_offset, dict_count = COLUMN.unpack_from(self.mmap, HEADER.size + idx * COLUMN.size)
+            name = name.rstrip(b'\0').decode('ascii')
+            typecode = typecode.decode('ascii')
+            try:
+                _check_item_size(typecode)
+            except ValueError:
+                self.close()
+                raise
+            data = self.buffer[data_offset:data_offset + self.rows * ITEM_SIZES[typecode]]
+            if byte_order == BYTE_ORDER:
+                self.columns[name] = data.cast(typecode)
+            else:
+                values = array(typecode, data.tobytes())
+                values.byteswap()
+                self.columns[name] = memoryview(values)
+                data.release()
+            if kind == DICTIONARY:
+                self.dictionaries[name] = self._read_strings(dict_offset, dict_count)
+
+    def _read_strings(self, offset: int, count: int) -> list[str]:
+        strings = []
+        for _ in range(count):
+            (length,) = STRING_LENGTH.unpack_from(self.mmap, offset)
+            offset += STRING_LENGTH.size
+            strings.append(bytes(self.buffer[offset:offset + length]).decode('utf-8'))
+            offset += length
+        return strings
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __enter__(self) -> 'PalSnapshot':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def column(self, name: str) -> memoryview:
+        """Returns the zero-copy array of a column (dictionary codes for string columns)."""
+        return self.columns[name]
+
+    def strings(self, name: str) -> list[str]:
+        """Returns the dictionary of a string column, indexed by code."""
+        return self.dictionaries[name]
+
+    def value(self, name: str, row: int):
+        """Returns a single decoded value."""
+        value = self.columns[name][row]
+        if name in self.dictionaries:
+            return self.dictionaries[name][value]
+        return value
+
+    def row(self, row: int) -> dict:
+        """Returns a decoded row as a dictionary."""
+        return {name: self.value(name, row) for name in self.columns}
+
+    def close(self) -> None:
+        for view in getattr(self, 'columns', {}).values():
+            view.release()
+        self.buffer.release()
+        self.mmap.close()
@@ -0,0 +1,310 @@
+import time
+from typing import Iterable, NamedTuple
+from sqlalchemy import Connection, create_engine, select
+from palgen.constants import MAX, MODES, SUM
+from palgen.models.pal_model import WORK_SUITABILITIES, PalTable
+
+# Search nodes visited between two checks of the time budget.
+CHECK_INTERVAL = 1024
+
+class TeamPal(NamedTuple):
+    """The subset of Pal data needed to plan a team."""
+    bp_class: str
+    text_name: str
+    levels: tuple[int, ...] # Work suitability levels, in `WORK_SUITABILITIES` order.
+
+class TeamResult(NamedTuple):
+    """Outcome of a team search."""
+    teams: tuple[tuple[str, ...], ...] # Smallest teams found (at most `limit`), as blueprint classes.
+    optimal: bool # Whether no smaller team exists. False when the time budget ran out first.
+    lower_bound: int # Size no covering team can be smaller than.
+    candidates: int # Pals searched, after dropping the ones that cannot help or are dominated.
+    nodes: int
+    seconds: float
+
+    @property
+    def size(self) -> int | None:
+        return len(self.teams[0]) if self.teams else None
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget is exhausted."""
+
+def pack(vector: tuple[int, ...], width: int) -> int:
+    """Packs a vector of small non-negative ints into one int, `width` bits per field."""
+    packed = 0
+    for shift, value in enumerate(vector):
+        packed |= value << (shift * width)
+    return packed
+
+def prune_dominated(vectors: list[tuple[int, ...]], keep: int) -> list[int]:
+    """Returns the indices of the vectors kept after dropping the ones `keep` others match or beat in every field.
+
+    A team of at most `keep` members using a dropped vector can swap it for
+    one of its dominators the team does not use yet, so the smallest team
+    size is unchanged. Vectors are packed into ints with a guard bit on top
+    of each field, so `u >= v` field by field is a single subtraction: no
+    field of `(u | guard) - v` borrows its guard bit exactly when it holds.
+    """
+    if not vectors:
+        return []
+    width = max(max(vector) for vector in vectors).bit_length() + 1
+    guard = pack((1 << (width - 1),) * len(vectors[0]), width)
+    counts = {}
+    for vector in vectors:
+        counts[vector] = counts.get(vector, 0) + 1
+
+    # A vector can only be dominated by a distinct one with a larger sum, so those are counted first.
+    kept, allowed = [], {}
+    for vector in sorted(counts, key=sum, reverse=True):
+        packed = pack(vector, width)
+        dominators = 0
+        for other, copies in kept:
+            if ((other | guard) - packed) & guard == guard:
+                dominators += copies
+                if dominators >= keep:
+                    break
+        copies = min(counts[vector], keep - dominators)
+        if copies > 0:
+            kept.append((packed, copies))
+            allowed[vector] = copies
+
+    indices = []
+    for i, vector in enumerate(vectors):
+        if allowed.get(vector):
+            allowed[vector] -= 1
+            indices.append(i)
+    return indices
+
+def greedy_team(vectors: list[tuple[int, ...]], required: tuple[int, ...]) -> tuple[int, ...] | None:
+    """Returns a covering team picked by largest remaining contribution, or None if there is none."""
+    deficit, team = required, set()
+    while any(deficit):
+        gain, pick = 0, None
+        for i, vector in enumerate(vectors):
+            value = sum(min(missing, value) for missing, value in zip(deficit, vector))
+            if value > gain and i not in team:
+                gain, pick = value, i
+        if pick is None:
+            return None
+        team.add(pick)
+        deficit = tuple(missing - value if missing > value else 0 for missing, value in zip(deficit, vectors[pick]))
+    return tuple(sorted(team))
+
+class _Search:
+    """Branch and bound over a fixed list of contribution vectors."""
+
+    def __init__(self, vectors: list[tuple[int, ...]], limit: int, deadline: float | None):
+        self.vectors = vectors
+        self.limit = limit
+        self.deadline = deadline
+        self.nodes = 0
+        self.solutions = []
+        self.all = (1 << len(vectors)) - 1
+
+        fields = range(len(vectors[0])) if vectors else range(0)
+        # Per work: the candidates contributing to it, best first, and the same as a bitset.
+        self.contributors = [
+            sorted(((vector[w], i) for i, vector in enumerate(vectors) if vector[w]), key=lambda item: (-item[0], item[1]))
+            for w in fields
+        ]
+        self.contributor_bits = [sum(1 << i for _, i in contributors) for contributors in self.contributors]
+        self.by_total = sorted(((sum(vector), i) for i, vector in enumerate(vectors)), key=lambda item: (-item[0], item[1]))
+        # Candidates with the same vector are interchangeable; only the first one left is ever branched on.
+        groups = {}
+        for i, vector in enumerate(vectors):
+            groups[vector] = groups.get(vector, 0) | 1 << i
+        self.copies = [groups[vector] for vector in vectors]
+
+    def bound(self, deficit: tuple[int, ...], available: int) -> tuple[int, int] | None:
+        """Returns a lower bound on the Pals still needed and the work to branch on, or None if infeasible.
+
+        Per work, and over all works together, the bound is the number of
+        best remaining contributors whose values first add up to the deficit.
+        """
+        needed, branch, fewest = 0, -1, None
+        for w, missing in enumerate(deficit):
+            if not missing:
+                continue
+            bits = self.contributor_bits[w] & available
+            count = 0
+            for value, i in self.contributors[w]:
+                if available >> i & 1:
+                    missing -= value
+                    count += 1
+                    if missing <= 0:
+                        break
+            else:
+                return None
+            needed = max(needed, count)
+            # Branching on the work with the fewest contributors left keeps the tree narrow.
+            left = bits.bit_count()
+            if fewest is None or left < fewest:
+                branch, fewest = w, left
+
+        missing, count = sum(deficit), 0
+        for total, i in self.by_total:
+            if available >> i & 1:
+                missing -= total
+                count += 1
+                if missing <= 0:
+                    break
+        return max(needed, count), branch
+
+    def search(self, deficit: tuple[int, ...], chosen: list[int], available: int, slots: int) -> bool:
+        """Collects the teams of at most `slots` more Pals covering `deficit`. Returns True once `limit` are found."""
+        self.nodes += 1
+        if self.deadline is not None and not self.nodes % CHECK_INTERVAL and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        if not any(deficit):
+            self.solutions.append(tuple(sorted(chosen)))
+            return len(self.solutions) >= self.limit
+        if not slots:
+            return False
+        bound = self.bound(deficit, available)
+        if bound is None or bound[0] > slots:
+            return False
+
+        # Some Pal contributing to the branch work has to be in the team. Every
+        # Pal tried (and its copies) is left out of the later branches, so no
+        # team is found twice, not even with interchangeable Pals swapped.
+        for _, i in self.contributors[bound[1]]:
+            if not available >> i & 1:
+                continue
+            vector = self.vectors[i]
+            chosen.append(i)
+            if self.search(tuple(missing - value if missing > value else 0 for missing, value in zip(deficit, vector)),
+                           chosen, available & ~(1 << i), slots - 1):
+                return True
+            chosen.pop()
+            available &= ~self.copies[i]
+        return False
+
+class TeamOptimizer:
+    """Finds the smallest teams of Pals covering a work-suitability requirement profile.
+
+    Every Pal is reduced to a vector of what it contributes to the required
+    work suitabilities, capped at the requirement (in `MAX` mode a Pal
+    contributes the full requirement or nothing), and Pals contributing
+    nothing are dropped. A Pal matched or beaten on every work by as many
+    other Pals as a team can have members is dropped as well (see
+    `prune_dominated`). This never makes the smallest team larger, but
+    alternative teams using dropped Pals, or only swapping Pals with the
+    same vector, are not listed.
+
+    The search is an iterative-deepening branch and bound. It looks for
+    teams of the lower bound's size first, then one Pal more at a time.
+    Each node branches on the uncovered work with the fewest contributors
+    left. It is pruned when even the best remaining contributor per work,
+    or the best remaining Pal overall, cannot close the gap with the slots
+    left. Candidates still available are tracked as a bitset. When the time
+    budget runs out, the best team found so far is returned with
+    `optimal=False` (a greedy team if the search found none yet).
+    """
+
+    def __init__(self, pals: Iterable[TeamPal]):
+        self.pals = list(pals)
+        self.by_bp_class = {pal.bp_class: pal for pal in self.pals}
+
+    @classmethod
+    def from_connection(cls, connection: Connection) -> 'TeamOptimizer':
+        """Loads the Pals of the generated `pals` table through an open connection."""
+        rows = connection.execute(
+            select(PalTable.bp_class, PalTable.text_name, *(getattr(PalTable, name) for name in WORK_SUITABILITIES))
+            .order_by(PalTable.internal_index)
+        )
+        return cls(TeamPal(bp_class, text_name, tuple(levels)) for bp_class, text_name, *levels in rows)
+
+    @classmethod
+    def from_database(cls, database_path: str) -> 'TeamOptimizer':
+        """Loads a generated `pals.db` file."""
+        engine = create_engine(f'sqlite:///{database_path}')
+        try:
+            with engine.connect() as connection:
+                return cls.from_connection(connection)
+        finally:
+            engine.dispose()
+
+    def coverage(self, team: Iterable[str], requirements: dict[str, int], mode: str = SUM) -> dict[str, int]:
+        """Returns the level a team reaches for every required work suitability."""
+        levels = [self.by_bp_class[bp_class].levels for bp_class in team]
+        coverage = {}
+        for name in requirements:
+            values = [pal_levels[WORK_SUITABILITIES.index(name)] for pal_levels in levels]
+            coverage[name] = sum(values) if mode == SUM else max(values, default=0)
+        return coverage
+
+    def solve(self, requirements: dict[str, int], mode: str = SUM, max_size: int = 20, limit: int = 1,
+              time_budget: float | None = None, pals: Iterable[str] | None = None, prune: bool = True) -> TeamResult:
+        """Finds up to `limit` smallest teams of at most `max_size` Pals meeting `requirements`.
+
+        `requirements` maps work suitabilities to the required level
+        (`{'mining': 4, 'kindling': 2}`). `pals` restricts the candidates
+        (e.g. to the Pals owned). An empty `teams` means no team of at most
+        `max_size` Pals can meet the requirements.
+        """
+        start = time.perf_counter()
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode '{mode}', expected one of {', '.join(MODES)}.")
+        unknown = [name for name in requirements if name not in WORK_SUITABILITIES]
+        if unknown:
+            raise ValueError(f"Unknown work suitability: {', '.join(unknown)}. Expected {', '.join(WORK_SUITABILITIES)}.")
+
+        if pals is None:
+            pool = self.pals
+        else:
+            missing = [bp_class for bp_class in pals if bp_class not in self.by_bp_class]
+            if missing:
+                raise KeyError(f"Unknown Pal(s): {', '.join(missing)}.")
+            pool = [self.by_bp_class[bp_class] for bp_class in dict.fromkeys(pals)]
+
+        works = [WORK_SUITABILITIES.index(name) for name, level in requirements.items() if level > 0]
+        required = tuple(requirements[WORK_SUITABILITIES[w]] for w in works)
+        if not works:
+            return TeamResult(((),), True, 0, 0, 0, time.perf_counter() - start)
+
+        candidates, vectors = [], []
+        for pal in pool:
+            if mode == SUM:
+                vector = tuple(min(pal.levels[w], level) for w, level in zip(works, required))
+            else:
+                vector = tuple(level if pal.levels[w] >= level else 0 for w, level in zip(works, required))
+            if any(vector):
+                candidates.append(pal.bp_class)
+                vectors.append(vector)
+
+        greedy = greedy_team(vectors, required)
+        if greedy is None:
+            return TeamResult((), True, max_size + 1, len(vectors), 0, time.perf_counter() - start)
+        greedy = tuple(candidates[i] for i in greedy)
+
+        if prune:
+            # In `MAX` mode a Pal next to its dominator adds nothing, so one dominator is enough.
+            kept = prune_dominated(vectors, min(len(greedy), max_size) if mode == SUM else 1)
+            candidates, vectors = [candidates[i] for i in kept], [vectors[i] for i in kept]
+
+        search = _Search(vectors, limit, start + time_budget if time_budget is not None else None)
+
+        def result(teams: Iterable[tuple[str, ...]], optimal: bool, lower_bound: int) -> TeamResult:
+            return TeamResult(tuple(teams), optimal, lower_bound, len(vectors), search.nodes, time.perf_counter() - start)
+
+        def found() -> list[tuple[str, ...]]:
+            return [tuple(candidates[i] for i in team) for team in search.solutions]
+
+        bound = search.bound(required, search.all)
+        if bound is None:
+            # Only possible after pruning for a `max_size` below the greedy team size.
+            return result((), True, max_size + 1)
+        lower_bound = bound[0]
+        try:
+            for size in range(max(lower_bound, 1), min(len(greedy), max_size) + 1):
+                search.search(required, [], search.all, size)
+                if search.solutions:
+                    return result(found(), True, size)
+                lower_bound = size + 1
+        except SearchTimeout:
+            if search.solutions:
+                # Every smaller size was exhausted, so these are optimal (just fewer than `limit`).
+                return result(found(), True, lower_bound)
+            return result([greedy] if len(greedy) <= max_size else [], False, lower_bound)
+        return result((), True, lower_bound)